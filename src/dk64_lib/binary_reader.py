@@ -1,3 +1,134 @@
+import struct
+
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+if TYPE_CHECKING:
+    import numpy
+
+
+_U16 = struct.Struct(">H")
+_I16 = struct.Struct(">h")
+_U32 = struct.Struct(">I")
+
+# struct format codes and the big-endian NumPy types they decode as
+_NUMPY_TYPES = {
+    "B": "u1",
+    "b": "i1",
+    "H": ">u2",
+    "h": ">i2",
+    "I": ">u4",
+    "i": ">i4",
+}
+
+
+def _validate_range(data_length: int, offset: int, size: int) -> None:
+    if offset < 0:
+        raise ValueError("offset must be non-negative")
+    if size < 0:
+        raise ValueError("size must be non-negative")
+    if offset + size > data_length:
+        raise ValueError("read exceeds buffer length")
+
+
+class RecordLayout:
+    def __init__(self, fields: Sequence[tuple[str, str]]):
+        """A big-endian fixed size record, compiled once into a struct.Struct
+
+        Args:
+            fields (Sequence[tuple[str, str]]): (name, struct format code) pairs in
+                record order, e.g. ("x", "h") or ("mips_instruction", "4s")
+        """
+        self.fields = tuple(fields)
+        self.names = tuple(name for name, _ in self.fields)
+        self.struct = struct.Struct(">" + "".join(code for _, code in self.fields))
+        self.size = self.struct.size
+        self._dtype = None
+
+    def __repr__(self) -> str:
+        return f"RecordLayout({self.struct.format!r}, {self.size=})"
+
+    def unpack(self, data: bytes | memoryview, offset: int = 0) -> tuple:
+        """Unpack one record
+
+        Args:
+            data (bytes | memoryview): Buffer holding the record
+            offset (int, optional): Where the record starts. Defaults to 0.
+
+        Raises:
+            ValueError: Raised when the record does not fit in the buffer
+
+        Returns:
+            tuple: The record's field values
+        """
+        _validate_range(len(data), offset, self.size)
+        return self.struct.unpack_from(data, offset)
+
+    def iter_unpack(
+        self, data: bytes | memoryview, count: int, offset: int = 0
+    ) -> Iterator[tuple]:
+        """Unpack consecutive records, checking the bounds of the whole run once
+
+        Args:
+            data (bytes | memoryview): Buffer holding the records
+            count (int): Number of records
+            offset (int, optional): Where the first record starts. Defaults to 0.
+
+        Raises:
+            ValueError: Raised when the records do not fit in the buffer
+
+        Returns:
+            Iterator[tuple]: Each record's field values
+        """
+        table_size = self.size * count
+        _validate_range(len(data), offset, table_size)
+        return self.struct.iter_unpack(memoryview(data)[offset : offset + table_size])
+
+    def unpack_all(self, data: bytes | memoryview) -> Iterator[tuple]:
+        """Unpack a buffer made up entirely of records
+
+        Raises:
+            ValueError: Raised when the buffer ends part way through a record
+        """
+        if len(data) % self.size:
+            raise ValueError("read exceeds buffer length")
+        return self.struct.iter_unpack(data)
+
+    @property
+    def dtype(self) -> "numpy.dtype":
+        """The record as a NumPy structured dtype"""
+        if self._dtype is None:
+            import numpy
+
+            self._dtype = numpy.dtype(
+                [
+                    (name, _NUMPY_TYPES.get(code, f"S{code[:-1] or 1}"))
+                    for name, code in self.fields
+                ]
+            )
+        return self._dtype
+
+    def unpack_array(
+        self, data: bytes | memoryview, count: int, offset: int = 0
+    ) -> "numpy.ndarray":
+        """Decode consecutive records into a NumPy structured array without copying
+
+        Args:
+            data (bytes | memoryview): Buffer holding the records
+            count (int): Number of records
+            offset (int, optional): Where the first record starts. Defaults to 0.
+
+        Raises:
+            ValueError: Raised when the records do not fit in the buffer
+
+        Returns:
+            numpy.ndarray: A read-only structured array with one field per record field
+        """
+        import numpy
+
+        _validate_range(len(data), offset, self.size * count)
+        return numpy.frombuffer(data, dtype=self.dtype, count=count, offset=offset)
+
+
 class BinaryReader:
     """Read big-endian values from an immutable byte buffer."""
 
@@ -16,21 +147,24 @@ class BinaryReader:
         return self._data[offset : offset + size]
 
     def read_u8(self, offset: int) -> int:
-        return self.read_at(offset, 1)[0]
+        self._validate_range(offset, 1)
+        return self._data[offset]
 
     def read_u16(self, offset: int) -> int:
-        return int.from_bytes(self.read_at(offset, 2), "big")
+        self._validate_range(offset, 2)
+        return _U16.unpack_from(self._data, offset)[0]
 
     def read_i16(self, offset: int) -> int:
-        return int.from_bytes(self.read_at(offset, 2), "big", signed=True)
+        self._validate_range(offset, 2)
+        return _I16.unpack_from(self._data, offset)[0]
 
     def read_u32(self, offset: int) -> int:
-        return int.from_bytes(self.read_at(offset, 4), "big")
+        self._validate_range(offset, 4)
+        return _U32.unpack_from(self._data, offset)[0]
+
+    def read_record(self, layout: RecordLayout, offset: int = 0) -> tuple:
+        """Read one record of a RecordLayout"""
+        return layout.unpack(self._data, offset)
 
     def _validate_range(self, offset: int, size: int) -> None:
-        if offset < 0:
-            raise ValueError("offset must be non-negative")
-        if size < 0:
-            raise ValueError("size must be non-negative")
-        if offset + size > len(self._data):
-            raise ValueError("read exceeds buffer length")
+        _validate_range(len(self._data), offset, size)
@@ -22,4 +22,5 @@ from dk64_lib.data_types.table_stubs import (
     TriggerData,
     UnknownTable19Data,
     UncompressedFileSizeData,
+    WallCollisionData,
 )
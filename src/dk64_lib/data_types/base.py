@@ -2,17 +2,22 @@ from abc import ABC, abstractmethod
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from dk64_lib.rom import Rom
+    from dk64_lib.rom import Rom, TableEntry
 
 class BaseData(ABC):
-    def __init__(self, raw_data: bytes, offset: int, size: int, was_compressed: bool, rom: 'Rom', data_type: str = None, *args, **kwargs):
-        self.raw_data = raw_data
+    def __init__(self, raw_data: bytes, offset: int, size: int, was_compressed: bool, rom: 'Rom', data_type: str = None, *args, entry: 'TableEntry' = None, **kwargs):
+        self._raw_data = raw_data
+        self.entry = entry
         self.offset = offset
         self.size = size
         self.was_compressed = was_compressed
         self.rom = rom
         self.data_type = data_type
         self.__post_init__(*args, **kwargs)
+        # Entries that know where they live in the ROM reload their payload on
+        # demand through the ROM's bounded payload cache instead of pinning it
+        if entry is not None and rom is not None:
+            self._raw_data = None
 
     def __len__(self):
         return self.size
@@ -20,6 +25,13 @@ class BaseData(ABC):
     def __repr__(self):
         return f"{self.data_type=}, {self.offset=}, {self.size=}"
 
+    @property
+    def raw_data(self) -> bytes:
+        """The entry's decompressed data"""
+        if self._raw_data is not None:
+            return self._raw_data
+        return self.rom.load_entry_data(self.entry)
+
     @abstractmethod
     def __post_init__(self, *args, **kwargs):
         ...
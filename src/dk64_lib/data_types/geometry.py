@@ -1,8 +1,8 @@
 import re
 import pathlib
 
-from numpy import array as numpy_array
-from collada import Collada, source, material, geometry, scene
+from functools import cached_property
+from typing import TYPE_CHECKING, Sequence
 
 from dk64_lib.binary_reader import BinaryReader
 from dk64_lib.data_types.base import BaseData
@@ -12,23 +12,35 @@ from dk64_lib.f3dex2.display_list import (
     DisplayListExpansion,
     create_display_lists,
 )
-from dk64_lib.f3dex2.texture_export import (
-    TextureAnimationFrames,
-    TexturedDaeExport,
-    TexturedDaeExporter,
-    TexturedGlbExport,
-    TexturedGltfExport,
-    TexturedGltfExporter,
-    TexturedObjExport,
-    TexturedObjExporter,
-    save_textured_dae_export,
-    save_textured_glb_export,
-    save_textured_gltf_export,
-    save_textured_obj_export,
-)
+from dk64_lib.f3dex2.triangle import Triangle
+
+if TYPE_CHECKING:
+    from collada import Collada
+
+    from dk64_lib.f3dex2.mesh_arrays import MeshArrays
+    from dk64_lib.f3dex2.spatial_index import SpatialIndex
+    from dk64_lib.f3dex2.texture_export import (
+        DaeDocument,
+        DecodedGeometry,
+        DecodedMesh,
+        TextureAnimationFrames,
+        TexturedDaeExport,
+        TexturedGlbExport,
+        TexturedGltfExport,
+        TexturedGltfExporter,
+        TexturedObjExport,
+    )
+
+DEFAULT_TILE_SIZE = 2000
 
 POINTER_PATTERN = re.compile(b'\x00[\x00-\xFF]\x08\x00\x00\x00\x00\x00')
 
+
+def _lod_filename(filename: str, level: int) -> str:
+    path = pathlib.PurePath(filename)
+    return str(path.with_name(f"{path.stem}_lod{level}{path.suffix}"))
+
+
 class GeometryData(BaseData):
     def __post_init__(self):
         self.data_type = "Geometry"
@@ -72,7 +84,7 @@ class GeometryData(BaseData):
             return self.raw_data[1]
         return None
 
-    @property
+    @cached_property
     def dl_expansions(self) -> list[DisplayListExpansion]:
         """Returns a list of the display list expansion data
 
@@ -81,19 +93,15 @@ class GeometryData(BaseData):
         """
         if self.is_pointer:
             return list()
-        ret_list = list()
         reader = BinaryReader(self.raw_data)
         expansion_count = reader.read_u32(self.dl_expansion_start)
         expansion_start = self.dl_expansion_start + 4
-        for expansion_num in range(expansion_count):
-            offset = expansion_start + expansion_num * 0x10
-            ret_list.append(
-                DisplayListExpansion.from_bytes(reader.read_at(offset, 0x10))
-            )
-
-        return ret_list
+        return DisplayListExpansion.from_table(
+            reader.slice(expansion_start, len(reader) - expansion_start),
+            expansion_count,
+        )
 
-    @property
+    @cached_property
     def vertex_chunk_data(self) -> list[DisplayListChunkData]:
         """Returns a list of display list chunk data found in the geometry file
 
@@ -102,19 +110,17 @@ class GeometryData(BaseData):
         """
         if self.is_pointer:
             return list()
-        ret_list = list()
-        for chunk_num in range(int(self.vert_chunk_length / 52)):
-            chunk_start = self.vert_chunk_start + 52 * chunk_num
-            chunk_end = self.vert_chunk_start + 52 * (chunk_num + 1)
-            ret_list.append(
-                DisplayListChunkData.from_bytes(self.raw_data[chunk_start:chunk_end])
-            )
-        return ret_list
+        return DisplayListChunkData.from_table(
+            memoryview(self.raw_data)[self.vert_chunk_start :],
+            int(self.vert_chunk_length / 52),
+        )
 
-    @property
+    @cached_property
     def display_lists(self) -> list[DisplayList]:
         """Generate and return a list of display lists inside of the geometry data
 
+        The display lists are parsed once and kept until clear_parse_cache is called.
+
         Returns:
             list[DisplayList]: A list of display lists
         """
@@ -134,6 +140,104 @@ class GeometryData(BaseData):
             expansions=self.dl_expansions,
         )
 
+    @cached_property
+    def display_list_index(self) -> dict[int, DisplayList]:
+        """Maps display list offsets to display lists
+
+        Top-level display lists take precedence, other offsets map to the
+        first branch found at them.
+
+        Returns:
+            dict[int, DisplayList]: Display lists keyed by offset
+        """
+        index = {dl.offset: dl for dl in self.display_lists}
+        display_lists = list(self.display_lists)
+        for display_list in display_lists:
+            for branch in display_list.branches:
+                if branch.offset not in index:
+                    index[branch.offset] = branch
+                    display_lists.append(branch)
+        return index
+
+    @cached_property
+    def decoded_mesh(self) -> "DecodedMesh":
+        """The geometry's mesh groups, decoded once for every textured export
+
+        When the ROM has a mesh cache the mesh is loaded from it, and only
+        decoded from the display lists (then persisted) on a miss.
+
+        Returns:
+            DecodedMesh: The decoded mesh groups
+        """
+        mesh_cache = getattr(self.rom, "mesh_cache", None)
+        if mesh_cache is None or self.is_pointer:
+            return self.decoded_geometry.mesh
+        return mesh_cache.get(self.offset, lambda: self.decoded_geometry.mesh)
+
+    @cached_property
+    def decoded_geometry(self) -> "DecodedGeometry":
+        """The geometry's mesh groups and mesh arrays from a single walk of its display lists
+
+        decoded_mesh, to_arrays and spatial_index all read from it, so the
+        display lists are only interpreted once per map.
+
+        Returns:
+            DecodedGeometry: The decoded mesh and arrays
+        """
+        from dk64_lib.f3dex2.texture_export import DecodedGeometry
+
+        return DecodedGeometry.from_display_lists(self.display_lists)
+
+    @cached_property
+    def spatial_index(self) -> "SpatialIndex":
+        """A grid over the map's triangles for ray, nearest, box and height queries
+
+        Triangle ids in query results index ``to_arrays().triangles``.
+
+        Returns:
+            SpatialIndex: The spatial index
+        """
+        from dk64_lib.f3dex2.spatial_index import SpatialIndex
+
+        return SpatialIndex.from_mesh_arrays(self.to_arrays())
+
+    def get_display_list(self, offset: int) -> DisplayList | None:
+        """Returns the display list at an offset, if there is one"""
+        return self.display_list_index.get(offset)
+
+    def clear_parse_cache(self):
+        """Drop the parsed display lists, decoded geometry, spatial index, chunk data and expansions to free memory
+
+        They are parsed again the next time they are accessed. A decoded mesh
+        loaded from the mesh cache is closed, releasing its memory-mapped file.
+        """
+        decoded_mesh = self.__dict__.pop("decoded_mesh", None)
+        if decoded_mesh is not None:
+            decoded_mesh.close()
+        for name in (
+            "decoded_geometry",
+            "spatial_index",
+            "display_lists",
+            "display_list_index",
+            "vertex_chunk_data",
+            "dl_expansions",
+        ):
+            self.__dict__.pop(name, None)
+
+    def to_arrays(self) -> "MeshArrays":
+        """Returns the map's mesh as contiguous NumPy arrays
+
+        Vertices are grouped the way the exporters group them: positions,
+        colours and UVs per vertex, plus global triangle indices with the
+        texture and display list offset of each triangle. The arrays come
+        from decoded_geometry, so they are read-only and shared between calls
+        until clear_parse_cache is called.
+
+        Returns:
+            MeshArrays: The mesh arrays, empty for pointer geometry
+        """
+        return self.decoded_geometry.arrays
+
     def create_obj(self) -> str:
         """Creates an obj file out of the geometry data
 
@@ -152,9 +256,7 @@ class GeometryData(BaseData):
 
             obj_data += f"# Display List {dl_num}, Offset: {dl.offset}\n\n"
 
-            for group_num, (verticies, triangles) in enumerate(
-                zip(dl.verticies, dl.triangles), 1
-            ):
+            for group_num, (verticies, triangles) in enumerate(dl.vertex_groups(), 1):
 
                 obj_data += f"# Vertex Group {group_num}\n\n"
 
@@ -181,12 +283,19 @@ class GeometryData(BaseData):
         self,
         mtl_filename: str = "geometry.mtl",
         texture_folder: str = "textures",
-    ) -> TexturedObjExport:
-        """Creates OBJ, MTL, and texture image data for this geometry."""
+        optimize_meshes: bool = False,
+    ) -> "TexturedObjExport":
+        """Creates OBJ, MTL, and texture image data for this geometry.
+
+        Pass optimize_meshes to merge mesh groups per material, drop unused
+        and duplicate vertices and reorder triangles for the vertex cache.
+        """
+        from dk64_lib.f3dex2.texture_export import TexturedObjExporter
+
         texture_data = self.rom.get_geometry_texture_data() if self.rom else tuple()
-        exporter = TexturedObjExporter(texture_data)
+        exporter = TexturedObjExporter(texture_data, optimize_meshes=optimize_meshes)
         return exporter.export(
-            self.display_lists,
+            self.decoded_mesh,
             mtl_filename=mtl_filename,
             texture_folder=texture_folder,
         )
@@ -194,14 +303,17 @@ class GeometryData(BaseData):
     def create_textured_dae(
         self,
         texture_folder: str = "textures",
-        animated_texture_frames: TextureAnimationFrames | None = None,
+        animated_texture_frames: "TextureAnimationFrames | None" = None,
         animation_frame_duration: int = 4,
-    ) -> TexturedDaeExport:
+        optimize_meshes: bool = False,
+    ) -> "TexturedDaeExport":
         """Creates DAE and texture image data for this geometry."""
+        from dk64_lib.f3dex2.texture_export import TexturedDaeExporter
+
         texture_data = self.rom.get_geometry_texture_data() if self.rom else tuple()
-        exporter = TexturedDaeExporter(texture_data)
+        exporter = TexturedDaeExporter(texture_data, optimize_meshes=optimize_meshes)
         return exporter.export(
-            self.display_lists,
+            self.decoded_mesh,
             texture_folder=texture_folder,
             animated_texture_frames=animated_texture_frames,
             animation_frame_duration=animation_frame_duration,
@@ -212,27 +324,55 @@ class GeometryData(BaseData):
         binary_filename: str = "geometry.bin",
         texture_folder: str = "textures",
         include_textures: bool = True,
-    ) -> TexturedGltfExport:
-        """Creates glTF, binary, and texture image data for this geometry."""
-        texture_data = self.rom.get_geometry_texture_data() if self.rom else tuple()
-        exporter = TexturedGltfExporter(texture_data)
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        lod_ratios: Sequence[float] = (),
+        alpha_mask: bool = False,
+    ) -> "TexturedGltfExport":
+        """Creates glTF, binary, and texture image data for this geometry.
+
+        Pass quantize to store vertex attributes as integers with
+        KHR_mesh_quantization, which makes the binary buffer much smaller.
+        Each of lod_ratios adds a simplified level of detail, linked with
+        MSFT_lod, that keeps that fraction of the triangles. With alpha_mask,
+        textures whose pixels are only fully opaque or fully transparent use
+        alphaMode MASK instead of BLEND.
+        """
+        exporter = self._textured_gltf_exporter(optimize_meshes)
         return exporter.export(
-            self.display_lists,
+            self.decoded_mesh,
             binary_filename=binary_filename,
             texture_folder=texture_folder,
             include_textures=include_textures,
+            quantize=quantize,
+            lod_ratios=lod_ratios,
+            alpha_mask=alpha_mask,
         )
 
     def create_textured_glb(
         self,
         include_textures: bool = True,
-    ) -> TexturedGlbExport:
-        """Creates binary glTF data for this geometry."""
-        texture_data = self.rom.get_geometry_texture_data() if self.rom else tuple()
-        exporter = TexturedGltfExporter(texture_data)
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        lod_ratios: Sequence[float] = (),
+        alpha_mask: bool = False,
+    ) -> "TexturedGlbExport":
+        """Creates binary glTF data for this geometry.
+
+        Pass quantize to store vertex attributes as integers with
+        KHR_mesh_quantization, which makes the file much smaller. Each of
+        lod_ratios adds a simplified level of detail, linked with MSFT_lod,
+        that keeps that fraction of the triangles. With alpha_mask, textures
+        whose pixels are only fully opaque or fully transparent use alphaMode
+        MASK instead of BLEND.
+        """
+        exporter = self._textured_gltf_exporter(optimize_meshes)
         return exporter.export_glb(
-            self.display_lists,
+            self.decoded_mesh,
             include_textures=include_textures,
+            quantize=quantize,
+            lod_ratios=lod_ratios,
+            alpha_mask=alpha_mask,
         )
 
     def save_to_obj(
@@ -241,6 +381,7 @@ class GeometryData(BaseData):
         folderpath: str = ".",
         include_textures: bool = True,
         texture_folder: str = "textures",
+        optimize_meshes: bool = False,
     ) -> list[pathlib.Path]:
         """Save geometry data to obj format
 
@@ -251,9 +392,13 @@ class GeometryData(BaseData):
                 texture files alongside the OBJ. Defaults to True.
             texture_folder (str, optional): Folder for exported texture images
                 when include_textures is True. Defaults to "textures".
+            optimize_meshes (bool, optional): Optimise textured mesh groups before
+                writing them. Defaults to False.
         """
         if include_textures:
-            return self.save_to_textured_obj(filename, folderpath, texture_folder)
+            return self.save_to_textured_obj(
+                filename, folderpath, texture_folder, optimize_meshes
+            )
 
         filepath = pathlib.Path(folderpath, filename)
         filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -265,12 +410,16 @@ class GeometryData(BaseData):
         filename: str,
         folderpath: str = ".",
         texture_folder: str = "textures",
+        optimize_meshes: bool = False,
     ) -> list[pathlib.Path]:
         """Save OBJ, MTL, and texture PNG files for this geometry."""
+        from dk64_lib.f3dex2.texture_export import save_textured_obj_export
+
         mtl_filename = pathlib.Path(filename).with_suffix(".mtl").name
         export = self.create_textured_obj(
             mtl_filename=mtl_filename,
             texture_folder=texture_folder,
+            optimize_meshes=optimize_meshes,
         )
         return save_textured_obj_export(export, filename, folderpath)
 
@@ -278,9 +427,10 @@ class GeometryData(BaseData):
         self,
         include_textures: bool = True,
         texture_folder: str = "textures",
-        animated_texture_frames: TextureAnimationFrames | None = None,
+        animated_texture_frames: "TextureAnimationFrames | None" = None,
         animation_frame_duration: int = 4,
-    ) -> Collada:
+        optimize_meshes: bool = False,
+    ) -> "Collada":
         """Creates a dae file out of the geometry data
 
         Returns:
@@ -291,77 +441,42 @@ class GeometryData(BaseData):
                 texture_folder,
                 animated_texture_frames=animated_texture_frames,
                 animation_frame_duration=animation_frame_duration,
+                optimize_meshes=optimize_meshes,
             ).dae
-        return self._create_geometry_only_dae()
-
-    def _create_geometry_only_dae(self) -> Collada:
-        """Creates a DAE file with geometry and vertex colors only."""
-        mesh = Collada()
-        
-        vertex_data = list()
-        vertex_colour_data = list()
-        triangle_data = list()
-        tri_offset = 0
-        
+        return self._geometry_only_dae_document().to_collada()
+
+    def _geometry_only_dae_document(self) -> "DaeDocument":
+        """Creates a DAE document with geometry and vertex colors only."""
+        from dk64_lib.f3dex2.texture_export import DaeDocument
+
+        vertices = list()
+        triangles = list()
+
         for dl in self.display_lists:
             if dl.is_branched:
                 continue
 
-            for verticies, triangles in zip(dl.verticies, dl.triangles):
+            for verticies, dl_triangles in dl.vertex_groups():
+                # The triangle offset is used to globally identify the vertex due to
+                # Display Lists reading them with local positions
+                tri_offset = len(vertices)
+                vertices.extend(verticies)
+                triangles.extend(
+                    Triangle(tri.v1 + tri_offset, tri.v2 + tri_offset, tri.v3 + tri_offset)
+                    for tri in dl_triangles
+                )
 
-                # Write vertecies to file
-                for vertex in verticies:
-                    vertex_data.extend((vertex.x, vertex.y, vertex.z))
-                    vertex_colour_data.extend((vertex.xr / 255, vertex.yg / 255, vertex.zb / 255, vertex.alpha / 255))
+        return DaeDocument.from_vertex_colors(vertices, triangles)
 
-                # # Write triangles/faces to file
-                for tri in triangles:
-                    triangle_data.extend((tri.v1 + tri_offset, tri.v2 + tri_offset, tri.v3 + tri_offset))
-
-                # # The triangle offset is used to globally identify the vertex due to
-                # # Display Lists reading them with local positions
-                tri_offset += len(verticies)
-        
-        # Create the vertices and vertex colours
-        src_vertices = source.FloatSource("geo-vertices", numpy_array(vertex_data), ('X', 'Y', 'Z'))
-        src_vertices_colour = source.FloatSource('vertex-colours', numpy_array(vertex_colour_data), ('R', 'G', 'B', 'A'))
-        
-        # The input list is used to define the vertices and colours 
-        input_list = source.InputList()
-        input_list.addInput(0, 'VERTEX', "#geo-vertices")
-        input_list.addInput(0, 'COLOR', '#vertex-colours')
-
-        # Create a geometry with the data points
-        geom = geometry.Geometry(mesh, "geometry0", "map", [src_vertices, src_vertices_colour])
-        mesh.geometries.append(geom)
-
-        # Create a triangle set and append it to the geometry
-        triset = geom.createTriangleSet(numpy_array(triangle_data), input_list, "vertex-material")
-        geom.primitives.append(triset)
-        
-        # Create the phong effect and material using the vertex colours
-        effect = material.Effect('vertex-effect', [], 'phong', diffuse=src_vertices_colour)
-        mat = material.Material('vertex-material', 'vertex-material', effect)
-        mesh.effects.append(effect)
-        mesh.materials.append(mat)
-        
-        # Create and add the scene
-        geomnode = scene.GeometryNode(geom, [])
-        node = scene.Node("node0", children=[geomnode])
-        myscene = scene.Scene("myscene", [node])
-        mesh.scenes.append(myscene)
-        mesh.scene = myscene
-        
-        return mesh
-        
     def save_to_dae(
         self,
         filename: str,
         folderpath: str = ".",
         include_textures: bool = True,
         texture_folder: str = "textures",
-        animated_texture_frames: TextureAnimationFrames | None = None,
+        animated_texture_frames: "TextureAnimationFrames | None" = None,
         animation_frame_duration: int = 4,
+        optimize_meshes: bool = False,
     ) -> list[pathlib.Path]:
         """Save geometry data to dae format
 
@@ -372,18 +487,23 @@ class GeometryData(BaseData):
                 texture files alongside the DAE. Defaults to True.
             texture_folder (str, optional): Folder for exported texture images
                 when include_textures is True. Defaults to "textures".
+            optimize_meshes (bool, optional): Optimise textured mesh groups before
+                writing them. Defaults to False.
         """
         if include_textures:
+            from dk64_lib.f3dex2.texture_export import save_textured_dae_export
+
             export = self.create_textured_dae(
                 texture_folder=texture_folder,
                 animated_texture_frames=animated_texture_frames,
                 animation_frame_duration=animation_frame_duration,
+                optimize_meshes=optimize_meshes,
             )
             return save_textured_dae_export(export, filename, folderpath)
 
         filepath = pathlib.Path(folderpath, filename)
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        self._create_geometry_only_dae().write(filepath)
+        self._geometry_only_dae_document().write(filepath)
         return [filepath]
 
     def save_to_gltf(
@@ -392,22 +512,145 @@ class GeometryData(BaseData):
         folderpath: str = ".",
         include_textures: bool = True,
         texture_folder: str = "textures",
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        lod_ratios: Sequence[float] = (),
+        lod_files: bool = False,
+        alpha_mask: bool = False,
     ) -> list[pathlib.Path]:
-        """Save geometry data to glTF format."""
+        """Save geometry data to glTF format.
+
+        Each of lod_ratios adds a simplified level of detail keeping that
+        fraction of the triangles. They are linked with MSFT_lod, or written
+        as separate ``<name>_lod<N>.gltf`` files when lod_files is set. With
+        alpha_mask, binary alpha textures use alphaMode MASK.
+        """
+        from dk64_lib.f3dex2.texture_export import save_textured_gltf_export
+
         binary_filename = pathlib.Path(filename).with_suffix(".bin").name
         export = self.create_textured_gltf(
             binary_filename=binary_filename,
             texture_folder=texture_folder,
             include_textures=include_textures,
+            quantize=quantize,
+            optimize_meshes=optimize_meshes,
+            lod_ratios=() if lod_files else lod_ratios,
+            alpha_mask=alpha_mask,
         )
-        return save_textured_gltf_export(export, filename, folderpath)
+        written_paths = save_textured_gltf_export(export, filename, folderpath)
+        if not lod_files:
+            return written_paths
+
+        # The levels are built from already merged groups
+        exporter = self._textured_gltf_exporter()
+        for level, lod_mesh in enumerate(
+            self._lod_meshes(lod_ratios, include_textures, optimize_meshes), 1
+        ):
+            lod_filename = _lod_filename(filename, level)
+            lod_export = exporter.export(
+                lod_mesh,
+                binary_filename=pathlib.Path(lod_filename).with_suffix(".bin").name,
+                texture_folder=texture_folder,
+                include_textures=include_textures,
+                quantize=quantize,
+                alpha_mask=alpha_mask,
+            )
+            # Levels share the full detail export's texture images
+            written_paths.extend(
+                path
+                for path in save_textured_gltf_export(lod_export, lod_filename, folderpath)
+                if path not in written_paths
+            )
+        return written_paths
 
     def save_to_glb(
         self,
         filename: str,
         folderpath: str = ".",
         include_textures: bool = True,
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        lod_ratios: Sequence[float] = (),
+        lod_files: bool = False,
+        alpha_mask: bool = False,
     ) -> list[pathlib.Path]:
-        """Save geometry data to binary glTF format."""
-        export = self.create_textured_glb(include_textures=include_textures)
-        return save_textured_glb_export(export, filename, folderpath)
+        """Save geometry data to binary glTF format.
+
+        Each of lod_ratios adds a simplified level of detail keeping that
+        fraction of the triangles. They are linked with MSFT_lod, or written
+        as separate ``<name>_lod<N>.glb`` files when lod_files is set. With
+        alpha_mask, binary alpha textures use alphaMode MASK.
+        """
+        from dk64_lib.f3dex2.texture_export import save_textured_glb_export
+
+        export = self.create_textured_glb(
+            include_textures=include_textures,
+            quantize=quantize,
+            optimize_meshes=optimize_meshes,
+            lod_ratios=() if lod_files else lod_ratios,
+            alpha_mask=alpha_mask,
+        )
+        written_paths = save_textured_glb_export(export, filename, folderpath)
+        if not lod_files:
+            return written_paths
+
+        # The levels are built from already merged groups
+        exporter = self._textured_gltf_exporter()
+        for level, lod_mesh in enumerate(
+            self._lod_meshes(lod_ratios, include_textures, optimize_meshes), 1
+        ):
+            lod_export = exporter.export_glb(
+                lod_mesh,
+                include_textures=include_textures,
+                quantize=quantize,
+                alpha_mask=alpha_mask,
+            )
+            written_paths.extend(
+                save_textured_glb_export(lod_export, _lod_filename(filename, level), folderpath)
+            )
+        return written_paths
+
+    def save_to_tiled_glb(
+        self,
+        filename: str,
+        folderpath: str = ".",
+        tile_size: int = DEFAULT_TILE_SIZE,
+        include_textures: bool = True,
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        alpha_mask: bool = False,
+    ) -> list[pathlib.Path]:
+        """Save geometry data as a grid of binary glTF tiles.
+
+        Triangles are split on the X/Z plane by centroid into square tiles
+        tile_size units wide. filename names the JSON manifest listing each
+        tile's file and bounds, the tiles are written to a folder named
+        after it, e.g. ``map.json`` and ``map/tile_0_0.glb``. With
+        alpha_mask, binary alpha textures use alphaMode MASK.
+        """
+        from dk64_lib.f3dex2.texture_export import save_textured_glb_tile_stream
+
+        tiles = self._textured_gltf_exporter(optimize_meshes).iter_glb_tiles(
+            self.decoded_mesh,
+            tile_size,
+            include_textures=include_textures,
+            quantize=quantize,
+            alpha_mask=alpha_mask,
+        )
+        return save_textured_glb_tile_stream(tiles, tile_size, filename, folderpath)
+
+    def _lod_meshes(
+        self,
+        lod_ratios: Sequence[float],
+        include_textures: bool,
+        optimize_meshes: bool,
+    ) -> "tuple[DecodedMesh, ...]":
+        return self._textured_gltf_exporter(optimize_meshes).lod_meshes(
+            self.decoded_mesh, lod_ratios, include_textures=include_textures
+        )
+
+    def _textured_gltf_exporter(self, optimize_meshes: bool = False) -> "TexturedGltfExporter":
+        from dk64_lib.f3dex2.texture_export import TexturedGltfExporter
+
+        texture_data = self.rom.get_geometry_texture_data() if self.rom else tuple()
+        return TexturedGltfExporter(texture_data, optimize_meshes=optimize_meshes)
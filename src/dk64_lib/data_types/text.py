@@ -1,11 +1,14 @@
-from io import FileIO
+import struct
+
 from typing import Union
-from dataclasses import dataclass
-from tempfile import TemporaryFile
+from dataclasses import dataclass, field
 
 from dk64_lib.data_types.base import BaseData
 from dk64_lib.constants import RELEASE_SPRITES, KIOSK_SPRITES
-from dk64_lib.file_io import get_bytes, get_char, get_long, get_short
+
+
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
 
 
 @dataclass(frozen=True, slots=True)
@@ -29,6 +32,23 @@ class _Text:
     def __repr__(self):
         return self.text or ""
 
+    def resolve(self, data: bytes, text_start: int) -> "_Text":
+        """Return a copy of this text with its string decoded from the table data
+
+        Args:
+            data (bytes): The text table's raw data
+            text_start (int): Where the text data begins
+        """
+        if self.text is not None:
+            return self
+        item_offset = self.start + text_start + 2
+        return _Text(
+            start=self.start,
+            size=self.size,
+            data_type=self.data_type,
+            text=data[item_offset : item_offset + self.size].decode(),
+        )
+
 
 @dataclass(frozen=True, slots=True)
 class _TextLineFragment:
@@ -38,15 +58,44 @@ class _TextLineFragment:
     offset: int
     text: tuple[Union["_Text", "_Sprite"], ...]
 
+    def resolve(self, data: bytes, text_start: int) -> "_TextLineFragment":
+        return _TextLineFragment(
+            block_start=self.block_start,
+            section2count=self.section2count,
+            section3count=self.section3count,
+            offset=self.offset,
+            text=tuple(
+                item.resolve(data, text_start) if isinstance(item, _Text) else item
+                for item in self.text
+            ),
+        )
+
 
 @dataclass(frozen=True, slots=True)
 class _TextLine:
     arr: bytes
-    sentence_fragments: tuple["_TextLineFragment", ...]
+    _fragments: tuple["_TextLineFragment", ...] = field(repr=False)
     section1count: int
     section2count: int
     section3count: int
     data_start: str
+    _data: bytes = field(default=b"", repr=False, compare=False)
+    _text_start: int = field(default=0, repr=False, compare=False)
+    _resolved_fragments: tuple["_TextLineFragment", ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def sentence_fragments(self) -> tuple["_TextLineFragment", ...]:
+        """The line's fragments, with their strings decoded on first access"""
+        fragments = self._resolved_fragments
+        if fragments is None:
+            fragments = tuple(
+                fragment.resolve(self._data, self._text_start)
+                for fragment in self._fragments
+            )
+            object.__setattr__(self, "_resolved_fragments", fragments)
+        return fragments
 
     @property
     def text(self):
@@ -67,20 +116,14 @@ class TextData(BaseData):
         self._SPRITE_LIST = (
             RELEASE_SPRITES if self.release_or_kiosk == "release" else KIOSK_SPRITES
         )
-        self._data = list()
-
-        # Use a temporary file to allow us to seek throughout it
-        with TemporaryFile() as data_file:
-            data_file.write(self.raw_data)
-            data_file.seek(0)
-            self._parse_data(data_file)
+        self._parse_data(self.raw_data)
 
     def __repr__(self):
         return f"TextDataTable({self.offset=}, {self.size=}, # of lines={len(self.text_lines)})"
 
     def _generate_text(
         self,
-        fh: FileIO,
+        data: bytes,
         sec3ct: int,
         data_start: int,
         block_start: int,
@@ -90,31 +133,34 @@ class TextData(BaseData):
     ) -> tuple[Union["_Text", "_Sprite"], ...]:
         """Object method - Generates a list of Texts and Sprites, used to form the various sentences in the game
 
+        Text entries only record where their string lives; the string itself is
+        decoded when the owning line's text is first read.
+
         Returns:
             list[Union['TextData._Text', 'TextData._Sprite']]: The text and sprite information pulled from the game
         """
         ret_list = list()
-        for pos in range(sec3ct):
-            data_block = block_start + 2 + offset + (bit_shift * pos) - 1
+        first_block = data_start + block_start + 1 + offset
+        for data_block in range(first_block, first_block + bit_shift * sec3ct, bit_shift):
             if is_text:
-                text_start = get_short(fh, data_start + data_block + 3)
-                text_size = get_short(fh, data_start + data_block + 5)
-                data_object = _Text(start=text_start, size=text_size)
+                data_object = _Text(
+                    start=_U16.unpack_from(data, data_block + 3)[0],
+                    size=_U16.unpack_from(data, data_block + 5)[0],
+                )
             else:
-                sprite_pos = get_short(fh, data_start + data_block)
-                sprite_data = get_long(fh, data_start + data_block)
+                sprite_data = _U32.unpack_from(data, data_block)[0]
                 sprite_index = (sprite_data >> 8) & 0xFF
                 sprite = self._SPRITE_LIST.get(
                     str(sprite_index), f"unk{hex(sprite_index)}"
                 )
                 data_object = _Sprite(
-                    position=sprite_pos, data=sprite_data, sprite=sprite
+                    position=sprite_data >> 16, data=sprite_data, sprite=sprite
                 )
             ret_list.append(data_object)
         return tuple(ret_list)
 
     def _generate_blocks(
-        self, fh: FileIO, section_count: int, data_start: int
+        self, data: bytes, section_count: int, data_start: int
     ) -> tuple[int, tuple["_TextLineFragment", ...]]:
         """Object method - Generates a list of Blocks, each containing a line of text and sprites
 
@@ -125,16 +171,16 @@ class TextData(BaseData):
         ret_list = list()
         block_start = 1
         for _ in range(section_count):
-            sec2ct = get_char(fh, data_start + block_start)
+            sec2ct = data[data_start + block_start]
             offset = 4 if (sec2ct & 4) != 0 else 0
-            sec3ct = get_char(fh, data_start + block_start + offset + 1)
+            sec3ct = data[data_start + block_start + offset + 1]
 
             bit_shift, is_text = 8, True
             if (sec2ct & 1) == 0 and (sec2ct & 2) != 0:
                 bit_shift, is_text = 4, False
 
             text_blocks = self._generate_text(
-                fh, sec3ct, data_start, block_start, offset, bit_shift, is_text
+                data, sec3ct, data_start, block_start, offset, bit_shift, is_text
             )
 
             ret_list.append(
@@ -150,47 +196,45 @@ class TextData(BaseData):
 
         return block_start, tuple(ret_list)
 
-    def _generate_block_data(self, fh: FileIO) -> tuple[int, tuple["_TextLine", ...]]:
-        """Object method - Generates a list of BlockData objects containing the various blocks of text
+    def _generate_block_data(
+        self, data: bytes
+    ) -> tuple[int, tuple[tuple[bytes, tuple["_TextLineFragment", ...], int, int, int, str], ...]]:
+        """Object method - Walks the line headers of a text table
 
         Returns:
-            tuple[int, list['TextData.BlockData']]: The text data start along with the
-                                                    list of blocks containing said data
+            tuple[int, tuple]: The text data start along with each line's raw
+                               header bytes, fragments, section counts and start
         """
         ret_list = list()
 
-        data_count = get_char(fh)
+        data_count = data[0]
         data_start = 0x01
 
-        # For each block of data, get the necessary information and create a BlockData object for it
+        # For each block of data, get the necessary information for its line
         for _ in range(data_count):
-            fh.seek(data_start)
-
-            sec_1_count = get_char(fh)
+            sec_1_count = data[data_start]
 
             # ! As far as I can tell, these two variables are totally unused and can likely be removed
             # ! from here and every dataclass that interacts with them
-            sec_2_count = get_char(fh)
-            sec_3_count = get_char(fh)
+            sec_2_count = data[data_start + 1]
+            sec_3_count = data[data_start + 2]
 
-            fh.seek(data_start + 5)
-            block_start, block_list = self._generate_blocks(fh, sec_1_count, data_start)
+            block_start, block_list = self._generate_blocks(data, sec_1_count, data_start)
 
-            fh.seek(data_start)
             info = (
                 b""
                 if block_start < data_start
-                else get_bytes(fh, block_start - data_start)
+                else data[data_start:block_start]
             )
 
             ret_list.append(
-                _TextLine(
-                    arr=info,
-                    sentence_fragments=block_list,
-                    section1count=sec_1_count,
-                    section2count=sec_2_count,
-                    section3count=sec_3_count,
-                    data_start=hex(data_start),
+                (
+                    info,
+                    block_list,
+                    sec_1_count,
+                    sec_2_count,
+                    sec_3_count,
+                    hex(data_start),
                 )
             )
 
@@ -199,88 +243,23 @@ class TextData(BaseData):
 
         return data_start, tuple(ret_list)
 
-    def _parse_text_item(
-        self, fh: FileIO, data_start: int, item: Union["_Text", "_Sprite"]
-    ) -> Union["_Text", "_Sprite"]:
-        if isinstance(item, _Text):
-            item_offset = item.start + data_start + 2
-            return _Text(
-                start=item.start,
-                size=item.size,
-                data_type=item.data_type,
-                text=get_bytes(fh, item.size, item_offset).decode(),
-            )
-        return item
-
-    def _parse_text(
-        self,
-        fh: FileIO,
-        data_start: int,
-        text_list: tuple[Union["_Text", "_Sprite"], ...],
-    ) -> tuple[Union["_Text", "_Sprite"], ...]:
-        """Object method - Parse the texts
-
-        Args:
-            fh (FileIO): The temporary file handler
-            data_start (int): Where the text data begins
-            block_data_list (list[TextData.BlockData]): List of texts and sprites
-        """
-        parsed_items = tuple(
-            self._parse_text_item(fh, data_start, item) for item in text_list
-        )
-        self._data.extend(parsed_items)
-        return parsed_items
-
-    def _parse_blocks(
-        self, fh: FileIO, data_start: int, block_list: tuple["_TextLineFragment", ...]
-    ) -> tuple["_TextLineFragment", ...]:
-        """Object method - Parse the blocks
-
-        Args:
-            fh (FileIO): The temporary file handler
-            data_start (int): Where the text data begins
-            block_data_list (list[TextData.BlockData]): List of blocks
-        """
-        return tuple(
-            _TextLineFragment(
-                block_start=block.block_start,
-                section2count=block.section2count,
-                section3count=block.section3count,
-                offset=block.offset,
-                text=self._parse_text(fh, data_start, block.text),
-            )
-            for block in block_list
-        )
-
-    def _parse_block_data(
-        self, fh: FileIO, data_start: int, block_data_list: tuple["_TextLine", ...]
-    ) -> tuple["_TextLine", ...]:
-        """Object method - Parse the block data
+    def _parse_data(self, data: bytes):
+        """Object method - Walks the table and creates its lines
 
         Args:
-            fh (FileIO): The temporary file handler
-            data_start (int): Where the text data begins
-            block_data_list (list[TextData.BlockData]): List of block datas
+            data (bytes): The text table's raw data
         """
-        return tuple(
+        data_start, block_data_list = self._generate_block_data(data)
+        self.text_lines = tuple(
             _TextLine(
-                arr=block_data.arr,
-                sentence_fragments=self._parse_blocks(
-                    fh, data_start, block_data.sentence_fragments
-                ),
-                section1count=block_data.section1count,
-                section2count=block_data.section2count,
-                section3count=block_data.section3count,
-                data_start=block_data.data_start,
+                arr,
+                block_list,
+                sec_1_count,
+                sec_2_count,
+                sec_3_count,
+                line_start,
+                _data=data,
+                _text_start=data_start,
             )
-            for block_data in block_data_list
+            for arr, block_list, sec_1_count, sec_2_count, sec_3_count, line_start in block_data_list
         )
-
-    def _parse_data(self, fh: FileIO):
-        """Object method - Runs the methods to generate and parse the block data
-
-        Args:
-            fh (FileIO): The temporary file handler
-        """
-        data_start, block_data_list = self._generate_block_data(fh)
-        self.text_lines = self._parse_block_data(fh, data_start, block_data_list)
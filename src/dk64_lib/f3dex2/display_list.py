@@ -1,16 +1,49 @@
 from dataclasses import dataclass
+from functools import cached_property
 from tempfile import TemporaryFile
 
 from dk64_lib.f3dex2.vertex import Vertex
 from dk64_lib.f3dex2.triangle import Triangle
 
-from dk64_lib.binary_reader import BinaryReader
+from dk64_lib.binary_reader import RecordLayout
 from dk64_lib.f3dex2 import commands
 from dk64_lib.f3dex2.commands import get_command, DL_Command
+from dk64_lib.f3dex2.interpreter import DisplayListHandler, DisplayListInterpreter
+from dk64_lib.f3dex2.texture_state import _TextureState
 
 from dk64_lib.file_io import get_bytes
 
 
+_EXPANSION_LAYOUT = RecordLayout(
+    (
+        ("unknown_1", "I"),
+        ("unknown_2", "I"),
+        ("display_list_offset", "I"),
+        ("unknown_4", "I"),
+    )
+)
+_CHUNK_DATA_LAYOUT = RecordLayout(
+    (
+        ("r", "B"),
+        ("g", "B"),
+        ("b", "B"),
+        ("unknown_char", "B"),
+        ("mips_instruction", "4s"),
+        ("unknown_flag", "I"),
+        ("dl_1_start", "I"),
+        ("dl_1_size", "I"),
+        ("dl_2_start", "I"),
+        ("dl_2_size", "I"),
+        ("dl_3_start", "I"),
+        ("dl_3_size", "I"),
+        ("dl_4_start", "I"),
+        ("dl_4_size", "I"),
+        ("vertex_start", "I"),
+        ("vertex_size", "I"),
+    )
+)
+
+
 @dataclass(frozen=True, slots=True)
 class DisplayListExpansion:
     """
@@ -28,13 +61,20 @@ class DisplayListExpansion:
 
     @classmethod
     def from_bytes(cls, raw_data: bytes) -> "DisplayListExpansion":
-        reader = BinaryReader(raw_data)
-        return cls(
-            unknown_1=reader.read_u32(0),
-            unknown_2=reader.read_u32(4),
-            display_list_offset=reader.read_u32(8),
-            unknown_4=reader.read_u32(12),
-        )
+        return cls(*_EXPANSION_LAYOUT.unpack(raw_data))
+
+    @classmethod
+    def from_table(cls, raw_data: bytes, count: int) -> list["DisplayListExpansion"]:
+        """Decode a run of consecutive 16 byte expansion records
+
+        Args:
+            raw_data (bytes): Data starting at the first record
+            count (int): Number of records to decode
+
+        Returns:
+            list[DisplayListExpansion]: The decoded expansions
+        """
+        return [cls(*fields) for fields in _EXPANSION_LAYOUT.iter_unpack(raw_data, count)]
 
 
 @dataclass(frozen=True, slots=True)
@@ -58,25 +98,20 @@ class DisplayListChunkData:
 
     @classmethod
     def from_bytes(cls, raw_data: bytes) -> "DisplayListChunkData":
-        reader = BinaryReader(raw_data)
-        return cls(
-            r=reader.read_u8(0),
-            g=reader.read_u8(1),
-            b=reader.read_u8(2),
-            unknown_char=reader.read_u8(3),
-            mips_instruction=reader.read_at(4, 4),
-            unknown_flag=reader.read_u32(8),
-            dl_1_start=reader.read_u32(12),
-            dl_1_size=reader.read_u32(16),
-            dl_2_start=reader.read_u32(20),
-            dl_2_size=reader.read_u32(24),
-            dl_3_start=reader.read_u32(28),
-            dl_3_size=reader.read_u32(32),
-            dl_4_start=reader.read_u32(36),
-            dl_4_size=reader.read_u32(40),
-            vertex_start=reader.read_u32(44),
-            vertex_size=reader.read_u32(48),
-        )
+        return cls(*_CHUNK_DATA_LAYOUT.unpack(raw_data))
+
+    @classmethod
+    def from_table(cls, raw_data: bytes, count: int) -> list["DisplayListChunkData"]:
+        """Decode a run of consecutive 52 byte chunk records
+
+        Args:
+            raw_data (bytes): Data starting at the first record
+            count (int): Number of records to decode
+
+        Returns:
+            list[DisplayListChunkData]: The decoded chunk data
+        """
+        return [cls(*fields) for fields in _CHUNK_DATA_LAYOUT.iter_unpack(raw_data, count)]
 
     @property
     def vertex_start_size(self) -> dict[int, tuple[int, int]]:
@@ -88,6 +123,20 @@ class DisplayListChunkData:
         }
 
 
+@dataclass(frozen=True, slots=True)
+class FlattenedCommand:
+    """A command in a display list's branch-inlined command stream
+
+    display_list is the list the command belongs to, which carries the vertex
+    data and vertex pointer the command reads from. depth is 0 for the
+    top-level list's own commands and grows by one per G_DL branch entered.
+    """
+
+    command: DL_Command
+    display_list: "DisplayList"
+    depth: int
+
+
 class DisplayList:
     def __init__(
         self,
@@ -116,6 +165,8 @@ class DisplayList:
         self.vertex_pointer = vertex_pointer
         self.offset = offset
         self.is_branched = branched
+        self._branch_index: dict[int, "DisplayList"] | None = None
+        self._indexed_branch_count = 0
 
     def __repr__(self):
         if self.branches:
@@ -125,7 +176,7 @@ class DisplayList:
     def __eq__(self, obj):
         if isinstance(obj, int):
             return self.offset == obj
-        return self == obj
+        return NotImplemented
 
     @property
     def raw_vertex_data(self):
@@ -182,37 +233,9 @@ class DisplayList:
         Returns:
             list[list[commands.G_TRI1]]: A 2d list of triangle data
         """
-        ret_list = list()
-        tri_list = list()
-        for cmd in self.commands:
-
-            # Read vertex buffer and create new triangle list
-            if cmd.opcode == b"\x01":
-                tri_list = list()
-                ret_list.append(tri_list)
-                continue
-
-            # Read triangle data and add it to the triangle list
-            if cmd.opcode == b"\x05":
-                tri = Triangle.from_tri1(cmd)
-                tri_list.append(tri)
-                continue
-
-            # Read dual triangle data and add it to the triangle list
-            if cmd.opcode == b"\x06":
-                tri1, tri2 = Triangle.from_tri2(cmd)
-                tri_list.append(tri1)
-                tri_list.append(tri2)
-                continue
-
-            if cmd.opcode == b"\xDE":
-                branched_dl = self.get_branch_by_offset(
-                    int.from_bytes(cmd.address, "big")
-                )
-                ret_list.extend(branched_dl.triangles)
-                continue
-
-        return ret_list
+        collector = _TriangleGroupCollector()
+        self._walk(collector)
+        return collector.groups
 
     @property
     def verticies(self) -> list[list[Vertex]]:
@@ -221,54 +244,25 @@ class DisplayList:
         Returns:
             list[list[Vertex]]: A 2d list of vertex data
         """
-        ret_list = list()
-        vert_list = list()
-
-        for cmd in self.commands:
+        collector = _VertexGroupCollector()
+        self._walk(collector)
+        return collector.groups
 
-            if cmd.opcode == b"\x01":
-                vertex_buffer_start = self.vertex_pointer + int.from_bytes(
-                    cmd.address, "big"
-                )
-                vertex_buffer_end = vertex_buffer_start + cmd.vertex_count * 16
-                vertex_data = self._raw_vertex_data[
-                    vertex_buffer_start:vertex_buffer_end
-                ]
-
-                if vertex_buffer_end > len(self._raw_vertex_data):
-                    vertex_buffer_start = int.from_bytes(cmd.address, "big")
-                    vertex_buffer_end = vertex_buffer_start + cmd.vertex_count * 16
-                    vertex_data = self._raw_vertex_data[
-                        vertex_buffer_start:vertex_buffer_end
-                    ]
-
-                # Vertex data is 16 bytes long
-                vert_start = 0
-                vert_end = vert_start + 16
-
-                for _ in range(cmd.vertex_count):
-                    # Read the raw data and create a Vertex object out of it
-                    vert_list.append(Vertex.from_bytes(vertex_data[vert_start:vert_end]))
-
-                    # Move the vertex start and end 16 bytes ahead
-                    vert_start = vert_end
-                    vert_end = vert_start + 16
-
-                # Append the vert list and reset
-                ret_list.append(vert_list)
-                vert_list = list()
-                continue
+    def vertex_groups(self) -> list[tuple[list[Vertex], list[Triangle]]]:
+        """Returns verticies and triangles together, walking the display list once
 
-            if cmd.opcode == b"\xDE":
-                branched_dl = self.get_branch_by_offset(
-                    int.from_bytes(cmd.address, "big")
-                )
-                ret_list.extend(branched_dl.verticies)
-                continue
+        Returns:
+            list[tuple[list[Vertex], list[Triangle]]]: The vertex and triangle data of each vertex group
+        """
+        vertex_collector = _VertexGroupCollector()
+        triangle_collector = _TriangleGroupCollector()
+        self._walk(vertex_collector, triangle_collector)
+        return list(zip(vertex_collector.groups, triangle_collector.groups))
 
-        return ret_list
+    def _walk(self, *handlers: DisplayListHandler):
+        DisplayListInterpreter(handlers).run_display_list(self, _TextureState())
 
-    @property
+    @cached_property
     def commands(self) -> list[DL_Command]:
         """Returns the F3DEX2 commands in the display list
 
@@ -283,10 +277,108 @@ class DisplayList:
                 ret_list.append(command)
         return ret_list
 
-    def get_branch_by_offset(self, offset):
-        if offset in self.branches:
-            return self.branches[self.branches.index(offset)]
-        return None
+    @cached_property
+    def flattened_commands(self) -> tuple[FlattenedCommand, ...]:
+        """Returns the display list's commands with every G_DL branch inlined
+
+        Each G_DL command is followed by the flattened commands of the branch it
+        calls, one level deeper.
+
+        Returns:
+            tuple[FlattenedCommand, ...]: The branch-inlined command stream
+        """
+        ret_list = list()
+        for command in self.commands:
+            ret_list.append(FlattenedCommand(command, self, 0))
+            if command.opcode != b"\xDE":
+                continue
+            branch = self.get_branch_by_offset(int.from_bytes(command.address, "big"))
+            if branch is None:
+                continue
+            ret_list.extend(
+                FlattenedCommand(
+                    flattened.command, flattened.display_list, flattened.depth + 1
+                )
+                for flattened in branch.flattened_commands
+            )
+        return tuple(ret_list)
+
+    def get_branch_by_offset(self, offset: int) -> "DisplayList | None":
+        """Returns the branch starting at a display list offset
+
+        Args:
+            offset (int): Offset of the branch in the display list data
+
+        Returns:
+            DisplayList | None: The first branch at that offset, if any
+        """
+        # The index is rebuilt if branches were added after it was built
+        if self._branch_index is None or self._indexed_branch_count != len(self.branches):
+            self._branch_index = dict()
+            for branch in self.branches:
+                self._branch_index.setdefault(branch.offset, branch)
+            self._indexed_branch_count = len(self.branches)
+        return self._branch_index.get(offset)
+
+
+class _TriangleGroupCollector(DisplayListHandler):
+    """Collects triangles per vertex load, branches included where they are called
+
+    Triangles drawn before a display list's first vertex load are dropped,
+    and a caller's triangles after a branch still join its current group.
+    """
+
+    opcodes = frozenset((b"\x01", b"\x05", b"\x06"))
+
+    def __init__(self):
+        self.groups: list[list[Triangle]] = list()
+        self._frames: list[list[Triangle]] = list()
+
+    def enter_display_list(self, display_list: DisplayList, state: _TextureState) -> None:
+        self._frames.append(list())
+
+    def exit_display_list(self, display_list: DisplayList, state: _TextureState) -> None:
+        self._frames.pop()
+
+    def handle_command(
+        self, command: DL_Command, display_list: DisplayList, state: _TextureState
+    ) -> None:
+        if command.opcode == b"\x01":
+            self._frames[-1] = list()
+            self.groups.append(self._frames[-1])
+        elif command.opcode == b"\x05":
+            self._frames[-1].append(Triangle.from_tri1(command))
+        else:
+            self._frames[-1].extend(Triangle.from_tri2(command))
+
+
+class _VertexGroupCollector(DisplayListHandler):
+    """Collects the verticies of each vertex load, branches included where they are called"""
+
+    opcodes = frozenset((b"\x01",))
+
+    def __init__(self):
+        self.groups: list[list[Vertex]] = list()
+
+    def handle_command(
+        self, command: commands.G_VTX, display_list: DisplayList, state: _TextureState
+    ) -> None:
+        raw_vertex_data = display_list.raw_vertex_data
+        vertex_buffer_start = display_list.vertex_pointer + int.from_bytes(
+            command.address, "big"
+        )
+        vertex_buffer_end = vertex_buffer_start + command.vertex_count * 16
+        if vertex_buffer_end > len(raw_vertex_data):
+            vertex_buffer_start = int.from_bytes(command.address, "big")
+            vertex_buffer_end = vertex_buffer_start + command.vertex_count * 16
+
+        # Vertex data is 16 bytes long
+        self.groups.append(
+            Vertex.from_table(
+                raw_vertex_data[vertex_buffer_start:vertex_buffer_end],
+                command.vertex_count,
+            )
+        )
 
 
 def create_display_lists(
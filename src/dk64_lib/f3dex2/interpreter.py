@@ -0,0 +1,94 @@
+from typing import TYPE_CHECKING, ClassVar, Iterable
+
+from dk64_lib.f3dex2.commands import DL_COMMANDS, DL_Command
+from dk64_lib.f3dex2.texture_state import _TextureState
+
+if TYPE_CHECKING:
+    from dk64_lib.f3dex2.display_list import DisplayList
+
+
+_G_DL = b"\xDE"
+
+
+class DisplayListHandler:
+    """Receives the commands of a display list walk from a DisplayListInterpreter
+
+    opcodes lists the command opcodes handle_command is called for, None
+    means every command. The texture state passed to each hook already
+    reflects the command being handled.
+    """
+
+    opcodes: ClassVar[frozenset[bytes] | None] = frozenset()
+
+    def enter_display_list(self, display_list: "DisplayList", state: _TextureState) -> None:
+        """Called before the first command of a display list or branch"""
+
+    def exit_display_list(self, display_list: "DisplayList", state: _TextureState) -> None:
+        """Called after the last command of a display list or branch"""
+
+    def handle_command(
+        self,
+        command: DL_Command,
+        display_list: "DisplayList",
+        state: _TextureState,
+    ) -> None:
+        """Called for each command whose opcode is in opcodes"""
+
+
+class DisplayListInterpreter:
+    def __init__(self, handlers: Iterable[DisplayListHandler]):
+        """Walks display lists once, tracking texture state and driving handlers
+
+        Commands are dispatched through a table indexed by opcode, so each
+        handler only sees the commands it registered for. G_DL branches are
+        walked in place with a copy-on-write clone of the caller's state.
+
+        Args:
+            handlers (Iterable[DisplayListHandler]): Handlers to drive, called in order
+        """
+        self.handlers = tuple(handlers)
+        self._dispatch = {
+            opcode: tuple(
+                handler.handle_command
+                for handler in self.handlers
+                if handler.opcodes is None or opcode in handler.opcodes
+            )
+            for opcode in DL_COMMANDS
+        }
+
+    def run(self, display_lists: Iterable["DisplayList"]) -> None:
+        """Walk every top-level display list, each with a fresh texture state
+
+        Args:
+            display_lists (Iterable[DisplayList]): Display lists of a geometry
+        """
+        for display_list in display_lists:
+            if display_list.is_branched:
+                continue
+            self.run_display_list(display_list, _TextureState())
+
+    def run_display_list(self, display_list: "DisplayList", state: _TextureState) -> None:
+        """Walk one display list and the branches it calls
+
+        Args:
+            display_list (DisplayList): The display list to walk
+            state (_TextureState): Texture state the display list starts from
+        """
+        for handler in self.handlers:
+            handler.enter_display_list(display_list, state)
+
+        dispatch = self._dispatch
+        for command in display_list.commands:
+            opcode = command.opcode
+            state.apply(command)
+            for handle_command in dispatch[opcode]:
+                handle_command(command, display_list, state)
+            if opcode == _G_DL:
+                branch = display_list.get_branch_by_offset(
+                    int.from_bytes(command.address, "big")
+                )
+                if branch is not None:
+                    self.run_display_list(branch, state.clone())
+
+        for handler in self.handlers:
+            handler.exit_display_list(display_list, state)
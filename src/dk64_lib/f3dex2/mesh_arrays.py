@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+import numpy
+
+from dk64_lib.f3dex2 import commands
+from dk64_lib.f3dex2.interpreter import DisplayListHandler, DisplayListInterpreter
+from dk64_lib.f3dex2.texture_state import _TextureKey, _TextureState
+from dk64_lib.f3dex2.vertex import VERTEX_LAYOUT
+
+if TYPE_CHECKING:
+    from dk64_lib.f3dex2.display_list import DisplayList
+
+
+@dataclass(frozen=True, slots=True)
+class MeshArrays:
+    """A whole map's mesh as contiguous NumPy arrays
+
+    Vertices are laid out mesh group by mesh group, the same way the OBJ,
+    DAE and glTF exporters lay them out, so every vertex belongs to exactly
+    one group and one texture.
+
+    Attributes:
+        positions: (N, 3) float32 vertex positions
+        colors: (N, 4) uint8 RGBA vertex colours
+        uvs_raw: (N, 2) int16 texture coordinates in the ROM's s10.5 format
+        uvs: (N, 2) float32 texture coordinates normalised by the group's
+            texture size, glTF orientation, zero for untextured vertices
+        triangles: (M, 3) uint32 indices into the vertex arrays
+        triangle_texture_ids: (M,) int32 index into textures, -1 when untextured
+        triangle_display_list_offsets: (M,) uint32 offset of the display list
+            each triangle was drawn by
+        textures: The textures triangle_texture_ids refer to
+    """
+
+    positions: numpy.ndarray
+    colors: numpy.ndarray
+    uvs_raw: numpy.ndarray
+    uvs: numpy.ndarray
+    triangles: numpy.ndarray
+    triangle_texture_ids: numpy.ndarray
+    triangle_display_list_offsets: numpy.ndarray
+    textures: tuple[_TextureKey, ...]
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.positions)
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.triangles)
+
+
+class _MeshArrayFrame:
+    __slots__ = ("vertices", "indices", "texture")
+
+    def __init__(self):
+        self.vertices: numpy.ndarray | None = None
+        self.indices: list[int] = []
+        self.texture: _TextureKey | None = None
+
+
+class _MeshArrayCollector(DisplayListHandler):
+    """Mesh grouping as in the exporters, keeping vertex buffers as record arrays"""
+
+    opcodes = frozenset((b"\x01", b"\x05", b"\x06"))
+
+    def __init__(self):
+        self.vertex_blocks: list[numpy.ndarray] = []
+        self.index_blocks: list[numpy.ndarray] = []
+        self.group_textures: list[_TextureKey | None] = []
+        self.group_offsets: list[int] = []
+        self._frames: list[_MeshArrayFrame] = []
+
+    def enter_display_list(self, display_list: "DisplayList", state: _TextureState) -> None:
+        self._frames.append(_MeshArrayFrame())
+
+    def exit_display_list(self, display_list: "DisplayList", state: _TextureState) -> None:
+        self._flush(self._frames.pop(), display_list)
+
+    def handle_command(
+        self,
+        command: commands.DL_Command,
+        display_list: "DisplayList",
+        state: _TextureState,
+    ) -> None:
+        frame = self._frames[-1]
+        if command.opcode == b"\x01":
+            self._flush(frame, display_list)
+            frame.vertices = _vertex_records(display_list, command)
+            frame.indices = []
+            frame.texture = state.active_texture
+            return
+
+        active_texture = state.active_texture
+        if frame.indices and active_texture != frame.texture:
+            self._flush(frame, display_list)
+            frame.indices = []
+        frame.texture = active_texture
+        if command.opcode == b"\x05":
+            frame.indices.extend((command.v1, command.v2, command.v3))
+        else:
+            frame.indices.extend(
+                (command.v1, command.v2, command.v3, command.v4, command.v5, command.v6)
+            )
+
+    def to_arrays(self) -> MeshArrays:
+        """The collected groups as contiguous mesh arrays"""
+        textures = tuple(
+            texture for texture in dict.fromkeys(self.group_textures) if texture
+        )
+        texture_ids = {texture: texture_id for texture_id, texture in enumerate(textures)}
+
+        if self.vertex_blocks:
+            records = numpy.concatenate(self.vertex_blocks)
+        else:
+            records = numpy.zeros(0, dtype=VERTEX_LAYOUT.dtype)
+
+        group_vertex_counts = numpy.array(
+            [len(block) for block in self.vertex_blocks], dtype=numpy.int64
+        )
+        group_triangle_counts = numpy.array(
+            [len(block) // 3 for block in self.index_blocks], dtype=numpy.int64
+        )
+        group_vertex_starts = numpy.cumsum(group_vertex_counts) - group_vertex_counts
+
+        if self.index_blocks:
+            triangles = numpy.concatenate(self.index_blocks).reshape(-1, 3)
+            triangles += numpy.repeat(group_vertex_starts, group_triangle_counts).astype(
+                numpy.uint32
+            )[:, None]
+        else:
+            triangles = numpy.zeros((0, 3), dtype=numpy.uint32)
+
+        group_texture_ids = numpy.array(
+            [texture_ids.get(texture, -1) for texture in self.group_textures],
+            dtype=numpy.int32,
+        )
+        triangle_texture_ids = numpy.repeat(group_texture_ids, group_triangle_counts)
+        triangle_display_list_offsets = numpy.repeat(
+            numpy.array(self.group_offsets, dtype=numpy.uint32), group_triangle_counts
+        )
+
+        positions = numpy.stack((records["x"], records["y"], records["z"]), axis=1).astype(
+            numpy.float32
+        )
+        colors = numpy.stack(
+            (records["xr"], records["yg"], records["zb"], records["alpha"]), axis=1
+        ).astype(numpy.uint8)
+        uvs_raw = numpy.stack(
+            (records["texture_cord_u"], records["texture_cord_v"]), axis=1
+        ).astype(numpy.int16)
+
+        return MeshArrays(
+            positions=positions,
+            colors=colors,
+            uvs_raw=uvs_raw,
+            uvs=_normalised_uvs(uvs_raw, self.group_textures, group_vertex_counts),
+            triangles=triangles,
+            triangle_texture_ids=triangle_texture_ids,
+            triangle_display_list_offsets=triangle_display_list_offsets,
+            textures=textures,
+        )
+
+    def _flush(self, frame: _MeshArrayFrame, display_list: "DisplayList") -> None:
+        if frame.vertices is None or not len(frame.vertices) or not frame.indices:
+            return
+        self.vertex_blocks.append(frame.vertices)
+        self.index_blocks.append(numpy.array(frame.indices, dtype=numpy.uint32))
+        self.group_textures.append(frame.texture)
+        self.group_offsets.append(display_list.offset)
+
+
+def _vertex_records(display_list: "DisplayList", command: commands.G_VTX) -> numpy.ndarray:
+    """The vertex buffer a G_VTX command loads, as a zero-copy record array"""
+    raw_vertex_data = display_list.raw_vertex_data
+    vertex_address = int.from_bytes(command.address, "big")
+    vertex_buffer_start = display_list.vertex_pointer + vertex_address
+    vertex_buffer_end = vertex_buffer_start + command.vertex_count * 16
+    if vertex_buffer_end > len(raw_vertex_data):
+        vertex_buffer_start = vertex_address
+        vertex_buffer_end = vertex_buffer_start + command.vertex_count * 16
+    vertex_buffer_end = min(vertex_buffer_end, len(raw_vertex_data))
+
+    buffer_size = max(0, vertex_buffer_end - vertex_buffer_start)
+    if buffer_size % VERTEX_LAYOUT.size:
+        raise ValueError("read exceeds buffer length")
+    return VERTEX_LAYOUT.unpack_array(
+        raw_vertex_data, buffer_size // VERTEX_LAYOUT.size, vertex_buffer_start
+    )
+
+
+def mesh_arrays(display_lists: Iterable["DisplayList"]) -> MeshArrays:
+    """Build contiguous mesh arrays straight from a geometry's display lists
+
+    Args:
+        display_lists (Iterable[DisplayList]): The geometry's display lists
+
+    Returns:
+        MeshArrays: The mesh as NumPy arrays
+    """
+    collector = _MeshArrayCollector()
+    DisplayListInterpreter((collector,)).run(display_lists)
+    return collector.to_arrays()
+
+
+def _normalised_uvs(
+    uvs_raw: numpy.ndarray,
+    group_textures: list[_TextureKey | None],
+    group_vertex_counts: numpy.ndarray,
+) -> numpy.ndarray:
+    """Scale s10.5 texture coordinates by each group's texture size"""
+    if not group_textures:
+        return numpy.zeros((0, 2), dtype=numpy.float32)
+    # (width, height, clamp_s, clamp_t, textured) per group
+    group_parameters = numpy.array(
+        [
+            (1.0, 1.0, 0.0, 0.0, 0.0)
+            if texture is None
+            else (texture.width, texture.height, texture.clamp_s, texture.clamp_t, 1.0)
+            for texture in group_textures
+        ],
+        dtype=numpy.float64,
+    )
+    vertex_parameters = numpy.repeat(group_parameters, group_vertex_counts, axis=0)
+
+    uvs = uvs_raw / 32 / vertex_parameters[:, 0:2]
+    uvs = numpy.where(vertex_parameters[:, 2:4] > 0, numpy.clip(uvs, 0.0, 1.0), uvs)
+    uvs *= vertex_parameters[:, 4:5]
+    return uvs.astype(numpy.float32)
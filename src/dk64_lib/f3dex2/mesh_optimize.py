@@ -0,0 +1,171 @@
+from typing import Hashable, Iterable, Sequence
+
+
+DEFAULT_VERTEX_CACHE_SIZE = 32
+
+# Scoring constants from Tom Forsyth's "Linear-Speed Vertex Cache Optimisation"
+_CACHE_DECAY_POWER = 1.5
+_LAST_TRIANGLE_SCORE = 0.75
+_VALENCE_BOOST_SCALE = 2.0
+_VALENCE_BOOST_POWER = 0.5
+
+_Face = tuple[int, int, int]
+
+
+def weld_vertices(
+    vertex_keys: Sequence[Hashable],
+    triangles: Iterable[_Face],
+) -> tuple[list[int], list[_Face]]:
+    """Drop unreferenced vertices and merge vertices with equal keys
+
+    Kept vertices are numbered in the order the triangles first use them.
+    Triangles whose corners weld into the same vertex are dropped, as are
+    triangles indexing past the end of vertex_keys.
+
+    Args:
+        vertex_keys (Sequence[Hashable]): What makes each vertex distinct
+        triangles (Iterable[tuple[int, int, int]]): Triangles indexing vertex_keys
+
+    Returns:
+        tuple[list[int], list[tuple[int, int, int]]]: The index into vertex_keys
+            of each kept vertex, and the triangles indexing the kept vertices
+    """
+    vertex_count = len(vertex_keys)
+    kept_vertices: list[int] = []
+    welded_indices: dict[Hashable, int] = {}
+    welded_triangles: list[_Face] = []
+
+    for triangle in triangles:
+        if not all(0 <= index < vertex_count for index in triangle):
+            continue
+        keys = [vertex_keys[index] for index in triangle]
+        if keys[0] == keys[1] or keys[1] == keys[2] or keys[0] == keys[2]:
+            continue
+        face = []
+        for index, key in zip(triangle, keys):
+            new_index = welded_indices.get(key)
+            if new_index is None:
+                new_index = welded_indices[key] = len(kept_vertices)
+                kept_vertices.append(index)
+            face.append(new_index)
+        welded_triangles.append((face[0], face[1], face[2]))
+    return kept_vertices, welded_triangles
+
+
+def optimize_vertex_cache(
+    triangles: Sequence[_Face],
+    vertex_count: int,
+    cache_size: int = DEFAULT_VERTEX_CACHE_SIZE,
+) -> list[_Face]:
+    """Reorder triangles so consecutive triangles reuse recently drawn vertices
+
+    Uses Tom Forsyth's greedy vertex cache optimisation. Triangles keep
+    their winding, only the order they are drawn in changes.
+
+    Args:
+        triangles (Sequence[tuple[int, int, int]]): Triangles to reorder
+        vertex_count (int): Number of vertices the triangles index
+        cache_size (int, optional): Simulated post-transform cache size. Defaults to 32.
+
+    Returns:
+        list[tuple[int, int, int]]: The same triangles in cache friendly order
+    """
+    vertex_triangles: list[list[int]] = [[] for _ in range(vertex_count)]
+    for triangle_index, triangle in enumerate(triangles):
+        for index in triangle:
+            vertex_triangles[index].append(triangle_index)
+
+    remaining = [len(adjacent) for adjacent in vertex_triangles]
+    cache_positions = [-1] * vertex_count
+    vertex_scores = [
+        _vertex_score(-1, remaining[index], cache_size) for index in range(vertex_count)
+    ]
+    triangle_scores = [
+        sum(vertex_scores[index] for index in triangle) for triangle in triangles
+    ]
+    emitted = [False] * len(triangles)
+
+    ordered: list[_Face] = []
+    cache: list[int] = []
+    best_triangle = max(
+        range(len(triangles)), key=triangle_scores.__getitem__, default=-1
+    )
+    scan_position = 0
+    while best_triangle >= 0:
+        triangle = triangles[best_triangle]
+        emitted[best_triangle] = True
+        ordered.append(triangle)
+        for index in triangle:
+            remaining[index] -= 1
+            vertex_triangles[index].remove(best_triangle)
+
+        # Drawn vertices move to the front of the cache, pushing others out
+        touched = set(cache)
+        cache = list(triangle) + [index for index in cache if index not in triangle]
+        touched.update(triangle)
+        for position, index in enumerate(cache):
+            cache_positions[index] = position if position < cache_size else -1
+        cache = cache[:cache_size]
+
+        best_triangle = -1
+        best_score = -1.0
+        for index in touched:
+            vertex_scores[index] = _vertex_score(
+                cache_positions[index], remaining[index], cache_size
+            )
+        for index in touched:
+            for triangle_index in vertex_triangles[index]:
+                score = triangle_scores[triangle_index] = sum(
+                    vertex_scores[corner] for corner in triangles[triangle_index]
+                )
+                if score > best_score:
+                    best_score = score
+                    best_triangle = triangle_index
+
+        if best_triangle < 0:
+            # Nothing left around the cache, continue with the next undrawn triangle
+            while scan_position < len(triangles) and emitted[scan_position]:
+                scan_position += 1
+            if scan_position < len(triangles):
+                best_triangle = scan_position
+    return ordered
+
+
+def average_cache_miss_ratio(
+    triangles: Sequence[_Face],
+    cache_size: int = DEFAULT_VERTEX_CACHE_SIZE,
+) -> float:
+    """Simulated vertex transforms per triangle with a FIFO post-transform cache
+
+    Args:
+        triangles (Sequence[tuple[int, int, int]]): Triangles in draw order
+        cache_size (int, optional): Simulated cache size. Defaults to 32.
+
+    Returns:
+        float: Cache misses per triangle, 0.5 is ideal and 3.0 is the worst case
+    """
+    if not triangles:
+        return 0.0
+    cache: list[int] = []
+    misses = 0
+    for triangle in triangles:
+        for index in triangle:
+            if index not in cache:
+                misses += 1
+                cache.append(index)
+                if len(cache) > cache_size:
+                    cache.pop(0)
+    return misses / len(triangles)
+
+
+def _vertex_score(cache_position: int, remaining_triangles: int, cache_size: int) -> float:
+    if remaining_triangles == 0:
+        return -1.0
+    score = 0.0
+    if cache_position >= 0:
+        if cache_position < 3:
+            score = _LAST_TRIANGLE_SCORE
+        else:
+            scaler = 1.0 / (cache_size - 3)
+            score = (1.0 - (cache_position - 3) * scaler) ** _CACHE_DECAY_POWER
+    return score + _VALENCE_BOOST_SCALE * remaining_triangles ** -_VALENCE_BOOST_POWER
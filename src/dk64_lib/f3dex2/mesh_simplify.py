@@ -0,0 +1,212 @@
+import heapq
+import math
+
+from typing import Collection, Sequence
+
+
+_Face = tuple[int, int, int]
+_Position = tuple[float, float, float]
+
+# Collapses that turn a triangle further than this from its old facing are rejected
+_MIN_NORMAL_DOT = 0.2
+
+
+def simplify_triangles(
+    positions: Sequence[_Position],
+    triangles: Sequence[_Face],
+    target_triangle_count: int,
+    locked_vertices: Collection[int] = (),
+) -> list[_Face]:
+    """Reduce a triangle mesh with quadric error metric half-edge collapses
+
+    Each collapse moves a vertex onto one of its neighbours, so no new
+    vertices are created and every kept vertex keeps its colour and UV.
+    Vertices on open or non-manifold edges never move, which keeps mesh
+    borders and the seams between differently textured or coloured
+    vertices in place. Collapses that would flip a triangle are skipped,
+    so the result can stay above the target.
+
+    Args:
+        positions (Sequence[tuple[float, float, float]]): Vertex positions
+        triangles (Sequence[tuple[int, int, int]]): Triangles indexing positions
+        target_triangle_count (int): Stop once this many triangles remain
+        locked_vertices (Collection[int], optional): Extra vertices that must not move. Defaults to ().
+
+    Returns:
+        list[tuple[int, int, int]]: The remaining triangles in their original
+            order, indexing the original positions
+    """
+    faces = [list(triangle) for triangle in triangles]
+    alive = [True] * len(faces)
+    alive_count = len(faces)
+    if alive_count <= target_triangle_count:
+        return [tuple(face) for face in faces]
+
+    vertex_faces: list[set[int]] = [set() for _ in positions]
+    quadrics = [[0.0] * 10 for _ in positions]
+    edge_uses: dict[tuple[int, int], int] = {}
+    for face_index, face in enumerate(faces):
+        for corner in face:
+            vertex_faces[corner].add(face_index)
+        plane = _plane_quadric(*(positions[corner] for corner in face))
+        for corner in face:
+            _add_quadric(quadrics[corner], plane)
+        for start, end in ((face[0], face[1]), (face[1], face[2]), (face[2], face[0])):
+            edge = (start, end) if start < end else (end, start)
+            edge_uses[edge] = edge_uses.get(edge, 0) + 1
+
+    locked = set(locked_vertices)
+    for (start, end), uses in edge_uses.items():
+        if uses != 2:
+            locked.update((start, end))
+
+    versions = [0] * len(positions)
+    heap: list[tuple[float, int, int, int, int]] = []
+
+    def push_collapses(vertex: int) -> None:
+        for neighbour in _neighbours(faces, vertex_faces, vertex):
+            for source, target in ((vertex, neighbour), (neighbour, vertex)):
+                if source in locked:
+                    continue
+                quadric = [a + b for a, b in zip(quadrics[source], quadrics[target])]
+                heapq.heappush(
+                    heap,
+                    (
+                        _quadric_error(quadric, positions[target]),
+                        versions[source],
+                        versions[target],
+                        source,
+                        target,
+                    ),
+                )
+
+    for vertex in range(len(positions)):
+        if vertex_faces[vertex] and vertex not in locked:
+            push_collapses(vertex)
+
+    while heap and alive_count > target_triangle_count:
+        _, source_version, target_version, source, target = heapq.heappop(heap)
+        if versions[source] != source_version or versions[target] != target_version:
+            continue
+        if not vertex_faces[source] or not _can_collapse(
+            positions, faces, vertex_faces, source, target
+        ):
+            continue
+
+        for face_index in tuple(vertex_faces[source]):
+            face = faces[face_index]
+            if target in face:
+                alive[face_index] = False
+                alive_count -= 1
+                for corner in face:
+                    vertex_faces[corner].discard(face_index)
+            else:
+                face[face.index(source)] = target
+                vertex_faces[target].add(face_index)
+        vertex_faces[source].clear()
+        _add_quadric(quadrics[target], quadrics[source])
+        versions[source] += 1
+        versions[target] += 1
+        push_collapses(target)
+
+    return [tuple(face) for face_index, face in enumerate(faces) if alive[face_index]]
+
+
+def _neighbours(
+    faces: list[list[int]], vertex_faces: list[set[int]], vertex: int
+) -> set[int]:
+    neighbours = {corner for face_index in vertex_faces[vertex] for corner in faces[face_index]}
+    neighbours.discard(vertex)
+    return neighbours
+
+
+def _can_collapse(
+    positions: Sequence[_Position],
+    faces: list[list[int]],
+    vertex_faces: list[set[int]],
+    source: int,
+    target: int,
+) -> bool:
+    # Link condition: the only neighbours the two share are the corners of
+    # the triangles on the collapsed edge, otherwise the surface pinches
+    shared_neighbours = _neighbours(faces, vertex_faces, source) & _neighbours(
+        faces, vertex_faces, target
+    )
+    edge_corners = {
+        corner
+        for face_index in vertex_faces[source] & vertex_faces[target]
+        for corner in faces[face_index]
+    } - {source, target}
+    if shared_neighbours != edge_corners:
+        return False
+
+    for face_index in vertex_faces[source]:
+        face = faces[face_index]
+        if target in face:
+            continue
+        old_normal = _normal(*(positions[corner] for corner in face))
+        new_normal = _normal(
+            *(positions[target if corner == source else corner] for corner in face)
+        )
+        old_length = math.sqrt(_dot(old_normal, old_normal))
+        new_length = math.sqrt(_dot(new_normal, new_normal))
+        if new_length == 0:
+            return False
+        if old_length and _dot(old_normal, new_normal) < _MIN_NORMAL_DOT * old_length * new_length:
+            return False
+    return True
+
+
+def _normal(p0: _Position, p1: _Position, p2: _Position) -> _Position:
+    ax, ay, az = p1[0] - p0[0], p1[1] - p0[1], p1[2] - p0[2]
+    bx, by, bz = p2[0] - p0[0], p2[1] - p0[1], p2[2] - p0[2]
+    return ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+
+
+def _dot(a: _Position, b: _Position) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _plane_quadric(p0: _Position, p1: _Position, p2: _Position) -> list[float]:
+    """The triangle's plane as an area weighted quadric, packed upper triangle"""
+    normal = _normal(p0, p1, p2)
+    length = math.sqrt(_dot(normal, normal))
+    if length == 0:
+        return [0.0] * 10
+    a, b, c = (component / length for component in normal)
+    d = -(a * p0[0] + b * p0[1] + c * p0[2])
+    weight = length / 2
+    return [
+        weight * a * a,
+        weight * a * b,
+        weight * a * c,
+        weight * a * d,
+        weight * b * b,
+        weight * b * c,
+        weight * b * d,
+        weight * c * c,
+        weight * c * d,
+        weight * d * d,
+    ]
+
+
+def _add_quadric(quadric: list[float], other: list[float]) -> None:
+    for index, value in enumerate(other):
+        quadric[index] += value
+
+
+def _quadric_error(quadric: list[float], position: _Position) -> float:
+    x, y, z = position
+    q = quadric
+    return (
+        q[0] * x * x
+        + 2 * q[1] * x * y
+        + 2 * q[2] * x * z
+        + 2 * q[3] * x
+        + q[4] * y * y
+        + 2 * q[5] * y * z
+        + 2 * q[6] * y
+        + q[7] * z * z
+        + 2 * q[8] * z
+        + q[9]
+    )
@@ -0,0 +1,426 @@
+import itertools
+import math
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+import numpy
+
+if TYPE_CHECKING:
+    from dk64_lib.f3dex2.mesh_arrays import MeshArrays
+
+
+# Average number of triangles per grid cell when no cell size is given
+_TRIANGLES_PER_CELL = 4
+# Barycentric slack so points on shared edges hit one of the triangles
+_EDGE_EPSILON = 1e-9
+# Triangles tested at once by nearest, closest bounding boxes first
+_NEAREST_BATCH_SIZE = 64
+# Grid cells a ray's triangles are gathered from before testing them together
+_RAY_BATCH_CELLS = 16
+
+_Point = Sequence[float]
+
+
+@dataclass(frozen=True, slots=True)
+class TriangleHit:
+    """A triangle found by a spatial query
+
+    Attributes:
+        triangle: Index of the triangle in the mesh's triangle array
+        distance: Distance from the query origin to point
+        point: The point on the triangle the distance was measured to
+    """
+
+    triangle: int
+    distance: float
+    point: tuple[float, float, float]
+
+
+class SpatialIndex:
+    """A uniform grid over a mesh's triangles on the X/Z plane
+
+    Maps are mostly wide and flat with Y up, so each grid cell is a column
+    holding every triangle whose bounding box reaches into it. Queries only
+    test the triangles in the cells they pass through, all at once with
+    NumPy.
+    """
+
+    def __init__(
+        self,
+        positions: numpy.ndarray,
+        triangles: numpy.ndarray,
+        cell_size: float | None = None,
+    ):
+        """Build the grid
+
+        Args:
+            positions (numpy.ndarray): (N, 3) vertex positions
+            triangles (numpy.ndarray): (M, 3) indices into positions, triangles
+                indexing past the end are left out of the grid
+            cell_size (float | None, optional): Width of a grid cell. Defaults
+                to a size giving a few triangles per cell.
+        """
+        positions = numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 3)
+        triangles = numpy.asarray(triangles, dtype=numpy.int64).reshape(-1, 3)
+        valid = numpy.all((triangles >= 0) & (triangles < len(positions)), axis=1)
+        corners = numpy.zeros((len(triangles), 3, 3), dtype=numpy.float64)
+        corners[valid] = positions[triangles[valid]]
+        self.corners = corners
+        self.triangle_min = corners.min(axis=1)
+        self.triangle_max = corners.max(axis=1)
+
+        valid_ids = numpy.flatnonzero(valid)
+        if len(valid_ids):
+            self.grid_min = self.triangle_min[valid_ids][:, [0, 2]].min(axis=0)
+            grid_max = self.triangle_max[valid_ids][:, [0, 2]].max(axis=0)
+        else:
+            self.grid_min = numpy.zeros(2)
+            grid_max = numpy.zeros(2)
+        extent = grid_max - self.grid_min
+        if cell_size is None:
+            area = max(float(extent[0] * extent[1]), 1.0)
+            cell_size = math.sqrt(area * _TRIANGLES_PER_CELL / max(len(valid_ids), 1))
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = max(float(cell_size), float(extent.max()) / 1024, 1e-6)
+        self.grid_shape = (numpy.floor(extent / self.cell_size).astype(numpy.int64) + 1)
+
+        # Register each triangle in every cell its bounding box overlaps
+        first_cell = self._cell_coordinates(self.triangle_min[valid_ids][:, [0, 2]])
+        last_cell = self._cell_coordinates(self.triangle_max[valid_ids][:, [0, 2]])
+        spans = last_cell - first_cell + 1
+        counts = spans[:, 0] * spans[:, 1]
+        owners = numpy.repeat(numpy.arange(len(valid_ids)), counts)
+        steps = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        cell_x = first_cell[owners, 0] + steps % spans[owners, 0]
+        cell_z = first_cell[owners, 1] + steps // spans[owners, 0]
+        cell_ids = cell_z * self.grid_shape[0] + cell_x
+
+        order = numpy.argsort(cell_ids, kind="stable")
+        self.cell_triangles = valid_ids[owners[order]]
+        self.cell_starts = numpy.searchsorted(
+            cell_ids[order], numpy.arange(self.grid_shape[0] * self.grid_shape[1] + 1)
+        )
+
+    @classmethod
+    def from_mesh_arrays(
+        cls, arrays: "MeshArrays", cell_size: float | None = None
+    ) -> "SpatialIndex":
+        """Build the grid over a map's mesh arrays
+
+        Args:
+            arrays (MeshArrays): The map's mesh
+            cell_size (float | None, optional): Width of a grid cell. Defaults to automatic.
+
+        Returns:
+            SpatialIndex: The index, triangle ids refer to arrays.triangles
+        """
+        return cls(arrays.positions, arrays.triangles, cell_size)
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.corners)
+
+    def raycast(
+        self,
+        origin: _Point,
+        direction: _Point,
+        max_distance: float = math.inf,
+    ) -> TriangleHit | None:
+        """Find the first triangle a ray hits, from either side
+
+        Args:
+            origin (Sequence[float]): Where the ray starts
+            direction (Sequence[float]): Which way it points, any length
+            max_distance (float, optional): Ignore hits further away. Defaults to no limit.
+
+        Returns:
+            TriangleHit | None: The nearest hit, or None if the ray hits nothing
+        """
+        origin = numpy.asarray(origin, dtype=numpy.float64)
+        direction = numpy.asarray(direction, dtype=numpy.float64)
+        length = float(numpy.linalg.norm(direction))
+        if length == 0:
+            raise ValueError("direction must not be zero")
+        direction = direction / length
+
+        best_triangle = -1
+        best_distance = max_distance
+        cell_ids: list[int] = []
+        cells = self._ray_cells(origin, direction, max_distance)
+        for cell_id, cell_enter, cell_exit in itertools.chain(cells, ((-1, math.inf, math.inf),)):
+            # Cells are tested a batch at a time, until a hit is closer than the next cell
+            last_cell = cell_id < 0 or cell_enter > best_distance
+            if cell_ids and (last_cell or len(cell_ids) == _RAY_BATCH_CELLS):
+                candidates = self._cells_candidates(numpy.array(cell_ids))
+                cell_ids = []
+                if len(candidates):
+                    distances = _ray_triangle_distances(origin, direction, self.corners[candidates])
+                    closest = int(numpy.argmin(distances))
+                    if math.isfinite(distances[closest]) and distances[closest] <= best_distance:
+                        best_triangle = int(candidates[closest])
+                        best_distance = float(distances[closest])
+            if last_cell or cell_enter > best_distance:
+                break
+            cell_ids.append(cell_id)
+
+        if best_triangle < 0:
+            return None
+        point = origin + direction * best_distance
+        return TriangleHit(best_triangle, best_distance, _point_tuple(point))
+
+    def nearest(self, point: _Point, max_distance: float = math.inf) -> TriangleHit | None:
+        """Find the triangle closest to a point
+
+        Args:
+            point (Sequence[float]): The query point
+            max_distance (float, optional): Ignore triangles further away. Defaults to no limit.
+
+        Returns:
+            TriangleHit | None: The closest triangle and the closest point on
+                it, or None if there is none within max_distance
+        """
+        point = numpy.asarray(point, dtype=numpy.float64)
+        point_xz = point[[0, 2]]
+        seen = numpy.zeros(self.triangle_count, dtype=bool)
+        best_triangle = -1
+        best_distance = math.inf
+        best_point = None
+
+        # Grow a square around the point until it holds a triangle, then search
+        # once more out to that triangle's distance for anything closer
+        radius = min(self.cell_size, max_distance)
+        while True:
+            candidates = self._box_candidates(point_xz - radius, point_xz + radius)
+            candidates = candidates[~seen[candidates]]
+            seen[candidates] = True
+            # Test the closest bounding boxes first, until none is closer than the best
+            box_distances = numpy.linalg.norm(
+                point
+                - numpy.clip(point, self.triangle_min[candidates], self.triangle_max[candidates]),
+                axis=1,
+            )
+            order = numpy.argsort(box_distances)
+            for batch_start in range(0, len(order), _NEAREST_BATCH_SIZE):
+                batch = order[batch_start : batch_start + _NEAREST_BATCH_SIZE]
+                if box_distances[batch[0]] >= best_distance:
+                    break
+                closest_points = _closest_points_on_triangles(
+                    point, self.corners[candidates[batch]]
+                )
+                distances = numpy.linalg.norm(closest_points - point, axis=1)
+                closest = int(numpy.argmin(distances))
+                if distances[closest] < best_distance:
+                    best_triangle = int(candidates[batch[closest]])
+                    best_distance = float(distances[closest])
+                    best_point = closest_points[closest]
+
+            covers_grid = numpy.all(point_xz - radius <= self.grid_min) and numpy.all(
+                point_xz + radius >= self.grid_min + self.grid_shape * self.cell_size
+            )
+            if best_distance <= radius or radius >= max_distance or covers_grid:
+                break
+            radius = min(best_distance if best_triangle >= 0 else radius * 2, max_distance)
+
+        if best_triangle < 0 or best_distance > max_distance:
+            return None
+        return TriangleHit(best_triangle, best_distance, _point_tuple(best_point))
+
+    def overlapping(self, minimum: _Point, maximum: _Point) -> numpy.ndarray:
+        """Find the triangles whose bounding boxes overlap a box
+
+        Args:
+            minimum (Sequence[float]): Lowest corner of the box
+            maximum (Sequence[float]): Highest corner of the box
+
+        Returns:
+            numpy.ndarray: Sorted indices of the overlapping triangles
+        """
+        minimum = numpy.asarray(minimum, dtype=numpy.float64)
+        maximum = numpy.asarray(maximum, dtype=numpy.float64)
+        candidates = self._box_candidates(minimum[[0, 2]], maximum[[0, 2]])
+        overlaps = numpy.all(
+            (self.triangle_min[candidates] <= maximum)
+            & (self.triangle_max[candidates] >= minimum),
+            axis=1,
+        )
+        return candidates[overlaps]
+
+    def height_at(self, x: float, z: float, below: float | None = None) -> float | None:
+        """Find the height of the highest surface above or below a point
+
+        Args:
+            x (float): X position
+            z (float): Z position
+            below (float | None, optional): Only surfaces at or below this height,
+                e.g. the floor under an actor. Defaults to any height.
+
+        Returns:
+            float | None: The surface height, or None if nothing is there
+        """
+        cell = self._cell_coordinates(numpy.array((x, z), dtype=numpy.float64))
+        candidates = self._cell_candidates(cell[1] * self.grid_shape[0] + cell[0])
+        if not len(candidates):
+            return None
+
+        corners = self.corners[candidates]
+        edge_1 = corners[:, 1, [0, 2]] - corners[:, 0, [0, 2]]
+        edge_2 = corners[:, 2, [0, 2]] - corners[:, 0, [0, 2]]
+        offset = numpy.array((x, z)) - corners[:, 0, [0, 2]]
+        determinant = edge_1[:, 0] * edge_2[:, 1] - edge_1[:, 1] * edge_2[:, 0]
+        flat = determinant != 0
+        safe_determinant = numpy.where(flat, determinant, 1.0)
+        u = (offset[:, 0] * edge_2[:, 1] - offset[:, 1] * edge_2[:, 0]) / safe_determinant
+        v = (edge_1[:, 0] * offset[:, 1] - edge_1[:, 1] * offset[:, 0]) / safe_determinant
+        inside = flat & (u >= -_EDGE_EPSILON) & (v >= -_EDGE_EPSILON) & (u + v <= 1 + _EDGE_EPSILON)
+        heights = corners[:, 0, 1] + u * (corners[:, 1, 1] - corners[:, 0, 1]) + v * (
+            corners[:, 2, 1] - corners[:, 0, 1]
+        )
+        if below is not None:
+            inside &= heights <= below
+        if not inside.any():
+            return None
+        return float(heights[inside].max())
+
+    def _cell_coordinates(self, xz: numpy.ndarray) -> numpy.ndarray:
+        cells = numpy.floor((xz - self.grid_min) / self.cell_size).astype(numpy.int64)
+        return numpy.clip(cells, 0, self.grid_shape - 1)
+
+    def _cell_candidates(self, cell_id: int) -> numpy.ndarray:
+        return self.cell_triangles[self.cell_starts[cell_id] : self.cell_starts[cell_id + 1]]
+
+    def _box_candidates(
+        self, minimum_xz: numpy.ndarray, maximum_xz: numpy.ndarray
+    ) -> numpy.ndarray:
+        """The triangles registered in every cell a square on the X/Z plane touches"""
+        if numpy.any(minimum_xz > maximum_xz):
+            return numpy.zeros(0, dtype=numpy.int64)
+        first_cell = self._cell_coordinates(minimum_xz)
+        last_cell = self._cell_coordinates(maximum_xz)
+        cell_x = numpy.arange(first_cell[0], last_cell[0] + 1)
+        cell_z = numpy.arange(first_cell[1], last_cell[1] + 1)
+        return self._cells_candidates(
+            (cell_z[:, None] * self.grid_shape[0] + cell_x[None, :]).ravel()
+        )
+
+    def _cells_candidates(self, cell_ids: numpy.ndarray) -> numpy.ndarray:
+        starts = self.cell_starts[cell_ids]
+        counts = self.cell_starts[cell_ids + 1] - starts
+        entries = numpy.arange(counts.sum()) + numpy.repeat(
+            starts - (numpy.cumsum(counts) - counts), counts
+        )
+        return numpy.unique(self.cell_triangles[entries])
+
+    def _ray_cells(self, origin: numpy.ndarray, direction: numpy.ndarray, max_distance: float):
+        """Walk the cells a ray crosses, with the distances it enters and leaves them"""
+        grid_min = (float(self.grid_min[0]), float(self.grid_min[1]))
+        grid_shape = (int(self.grid_shape[0]), int(self.grid_shape[1]))
+        origin_xz = (float(origin[0]), float(origin[2]))
+        direction_xz = (float(direction[0]), float(direction[2]))
+
+        # Clip the ray to the grid's footprint
+        enter, leave = 0.0, max_distance
+        for axis in range(2):
+            grid_max = grid_min[axis] + grid_shape[axis] * self.cell_size
+            if direction_xz[axis] == 0:
+                if not grid_min[axis] <= origin_xz[axis] <= grid_max:
+                    return
+                continue
+            near = (grid_min[axis] - origin_xz[axis]) / direction_xz[axis]
+            far = (grid_max - origin_xz[axis]) / direction_xz[axis]
+            enter = max(enter, min(near, far))
+            leave = min(leave, max(near, far))
+        if enter > leave:
+            return
+
+        cell = [
+            int(coordinate)
+            for coordinate in self._cell_coordinates(
+                numpy.array(origin_xz) + numpy.array(direction_xz) * enter
+            )
+        ]
+        step = [0, 0]
+        next_boundary = [math.inf, math.inf]
+        boundary_step = [math.inf, math.inf]
+        for axis in range(2):
+            if direction_xz[axis]:
+                step[axis] = 1 if direction_xz[axis] > 0 else -1
+                boundary = grid_min[axis] + (cell[axis] + (step[axis] > 0)) * self.cell_size
+                next_boundary[axis] = (boundary - origin_xz[axis]) / direction_xz[axis]
+                boundary_step[axis] = self.cell_size / abs(direction_xz[axis])
+
+        while True:
+            axis = 0 if next_boundary[0] <= next_boundary[1] else 1
+            cell_exit = min(next_boundary[axis], leave)
+            yield cell[1] * grid_shape[0] + cell[0], enter, cell_exit
+            if cell_exit >= leave:
+                return
+            cell[axis] += step[axis]
+            if not 0 <= cell[axis] < grid_shape[axis]:
+                return
+            enter = cell_exit
+            next_boundary[axis] += boundary_step[axis]
+
+
+def _ray_triangle_distances(
+    origin: numpy.ndarray, direction: numpy.ndarray, corners: numpy.ndarray
+) -> numpy.ndarray:
+    """Moller-Trumbore intersection distances, infinite where the ray misses"""
+    edge_1 = corners[:, 1] - corners[:, 0]
+    edge_2 = corners[:, 2] - corners[:, 0]
+    p = numpy.cross(direction, edge_2)
+    determinant = numpy.einsum("ij,ij->i", edge_1, p)
+    hit = numpy.abs(determinant) > 1e-12
+    inverse = numpy.where(hit, 1.0 / numpy.where(hit, determinant, 1.0), 0.0)
+    offset = origin - corners[:, 0]
+    u = numpy.einsum("ij,ij->i", offset, p) * inverse
+    q = numpy.cross(offset, edge_1)
+    v = (q @ direction) * inverse
+    distances = numpy.einsum("ij,ij->i", edge_2, q) * inverse
+    hit &= (u >= -_EDGE_EPSILON) & (v >= -_EDGE_EPSILON) & (u + v <= 1 + _EDGE_EPSILON)
+    hit &= distances >= 0
+    return numpy.where(hit, distances, math.inf)
+
+
+def _closest_points_on_triangles(point: numpy.ndarray, corners: numpy.ndarray) -> numpy.ndarray:
+    """The closest point to point on each triangle
+
+    That is the point's projection onto the triangle's plane when it lands
+    inside the triangle, otherwise the closest point on one of its edges.
+    """
+    edge_1 = corners[:, 1] - corners[:, 0]
+    edge_2 = corners[:, 2] - corners[:, 0]
+    normal = numpy.cross(edge_1, edge_2)
+    normal_length_squared = numpy.einsum("ij,ij->i", normal, normal)
+    flat = normal_length_squared > 0
+    safe_length_squared = numpy.where(flat, normal_length_squared, 1.0)
+    offset = point - corners[:, 0]
+    projected = point - normal * (
+        numpy.einsum("ij,ij->i", offset, normal) / safe_length_squared
+    )[:, None]
+
+    projected_offset = projected - corners[:, 0]
+    u = numpy.einsum("ij,ij->i", numpy.cross(projected_offset, edge_2), normal)
+    v = numpy.einsum("ij,ij->i", numpy.cross(edge_1, projected_offset), normal)
+    u /= safe_length_squared
+    v /= safe_length_squared
+    inside = flat & (u >= 0) & (v >= 0) & (u + v <= 1)
+
+    candidates = [numpy.where(inside[:, None], projected, math.inf)]
+    for start, end in ((0, 1), (1, 2), (2, 0)):
+        segment = corners[:, end] - corners[:, start]
+        segment_length_squared = numpy.einsum("ij,ij->i", segment, segment)
+        t = numpy.einsum("ij,ij->i", point - corners[:, start], segment) / numpy.where(
+            segment_length_squared > 0, segment_length_squared, 1.0
+        )
+        candidates.append(corners[:, start] + segment * numpy.clip(t, 0.0, 1.0)[:, None])
+
+    candidates = numpy.stack(candidates, axis=1)
+    distances = numpy.linalg.norm(candidates - point, axis=2)
+    distances[~numpy.isfinite(distances)] = math.inf
+    return candidates[numpy.arange(len(corners)), numpy.argmin(distances, axis=1)]
+
+
+def _point_tuple(point: numpy.ndarray) -> tuple[float, float, float]:
+    return float(point[0]), float(point[1]), float(point[2])
@@ -0,0 +1,286 @@
+import os
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+from dk64_lib.f3dex2.texture_export import (
+    TexturedObjExporter,
+    TextureImageFile,
+    decode_texture,
+    rgba_to_png,
+)
+from dk64_lib.f3dex2.texture_state import _TextureKey
+
+
+# Jobs handed to a worker at a time, textures are small so batching them keeps
+# the pool's pickling overhead down
+_CHUNK_SIZE = 16
+# Textures decoded ahead of the consumer by the streaming methods
+DEFAULT_MAX_BUFFERED = 64
+
+_Job = TypeVar("_Job")
+_Result = TypeVar("_Result")
+
+# (start, length) of each raw texture in the shared block, None for missing entries
+_Span = tuple[int, int] | None
+
+
+@dataclass(frozen=True, slots=True)
+class TextureImageJob:
+    """A raw texture decoded with explicit metadata and written as a single PNG
+
+    Attributes:
+        filename: Path of the PNG, relative to the export folder
+        raw_index: Index of the texture's bytes in the batch's raw textures
+        fmt: F3DEX2 image format
+        size: F3DEX2 texel size
+        width: Width in pixels
+        height: Height in pixels
+    """
+
+    filename: str
+    raw_index: int
+    fmt: int
+    size: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True, slots=True)
+class _RawTexture:
+    raw_data: bytes | None
+
+
+class _SharedRawTexture:
+    """A raw texture read out of a shared memory block"""
+
+    __slots__ = ("_memory", "_start", "_length")
+
+    def __init__(self, memory: SharedMemory, start: int, length: int):
+        self._memory = memory
+        self._start = start
+        self._length = length
+
+    @property
+    def raw_data(self) -> bytes:
+        return bytes(self._memory.buf[self._start : self._start + self._length])
+
+
+class TextureBatch:
+    def __init__(
+        self,
+        raw_textures: Sequence[bytes | None],
+        processes: int | None = None,
+    ):
+        """Decode and PNG encode textures across a process pool
+
+        The raw textures are copied once into a shared memory block that
+        every worker attaches to, so only texture metadata is sent to the
+        workers and only PNG files come back. Results keep the order of the
+        jobs they were made from.
+
+        Args:
+            raw_textures (Sequence[bytes | None]): Raw texture bytes, indexed
+                like the geometry texture table for texture keys
+            processes (int | None, optional): Worker processes. Defaults to
+                None (one per CPU), 1 decodes in this process.
+        """
+        self._raw_textures = tuple(raw_textures)
+        self._processes = processes
+        self._memory: SharedMemory | None = None
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "TextureBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def texture_images(
+        self,
+        textures: Iterable[_TextureKey],
+        texture_folder: str,
+    ) -> tuple[TextureImageFile, ...]:
+        """Create the PNG files TexturedObjExporter writes for texture keys
+
+        Args:
+            textures (Iterable[_TextureKey]): Textures to decode
+            texture_folder (str): Folder the PNG files are placed in
+
+        Returns:
+            tuple[TextureImageFile, ...]: Every level and alpha mask of each texture, in order
+        """
+        return tuple(self.iter_texture_images(textures, texture_folder))
+
+    def iter_texture_images(
+        self,
+        textures: Iterable[_TextureKey],
+        texture_folder: str,
+        max_buffered: int = DEFAULT_MAX_BUFFERED,
+    ) -> Iterator[TextureImageFile]:
+        """Yield the PNG files TexturedObjExporter writes for texture keys
+
+        Args:
+            textures (Iterable[_TextureKey]): Textures to decode
+            texture_folder (str): Folder the PNG files are placed in
+            max_buffered (int, optional): Textures decoded ahead of the
+                consumer. Defaults to DEFAULT_MAX_BUFFERED.
+
+        Yields:
+            TextureImageFile: Every level and alpha mask of each texture, in order
+        """
+        jobs = ((texture, texture_folder) for texture in textures)
+        return chain.from_iterable(self._imap(_texture_key_images, jobs, max_buffered))
+
+    def images(self, jobs: Iterable[TextureImageJob]) -> tuple[TextureImageFile, ...]:
+        """Create one PNG file per job
+
+        Args:
+            jobs (Iterable[TextureImageJob]): Textures to decode
+
+        Returns:
+            tuple[TextureImageFile, ...]: The PNG files, in job order
+        """
+        return tuple(self.iter_images(jobs))
+
+    def iter_images(
+        self,
+        jobs: Iterable[TextureImageJob],
+        max_buffered: int = DEFAULT_MAX_BUFFERED,
+    ) -> Iterator[TextureImageFile]:
+        """Yield one PNG file per job
+
+        Args:
+            jobs (Iterable[TextureImageJob]): Textures to decode
+            max_buffered (int, optional): Images encoded ahead of the
+                consumer. Defaults to DEFAULT_MAX_BUFFERED.
+
+        Yields:
+            TextureImageFile: The PNG files, in job order
+        """
+        return self._imap(_texture_job_image, jobs, max_buffered)
+
+    def close(self) -> None:
+        """Shut the worker pool down and release the shared memory block"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def _imap(
+        self,
+        function: "Callable[[TexturedObjExporter, _Job], _Result]",
+        jobs: Iterable[_Job],
+        max_buffered: int,
+    ) -> Iterator[_Result]:
+        if max_buffered < 1:
+            raise ValueError("max_buffered must be at least 1")
+        if self._processes == 1:
+            exporter = TexturedObjExporter(map(_RawTexture, self._raw_textures))
+            return (function(exporter, job) for job in jobs)
+        return self._imap_pool(function, jobs, max_buffered)
+
+    def _imap_pool(
+        self,
+        function: "Callable[[TexturedObjExporter, _Job], _Result]",
+        jobs: Iterable[_Job],
+        max_buffered: int,
+    ) -> Iterator[_Result]:
+        # Only a window of chunks is submitted at a time, so at most
+        # max_buffered results wait on the consumer
+        executor = self._pool()
+        workers = self._processes or os.cpu_count() or 1
+        chunk_size = max(1, min(_CHUNK_SIZE, max_buffered // workers))
+        max_pending = max(1, max_buffered // chunk_size)
+        jobs = iter(jobs)
+        pending: deque[Future] = deque()
+        try:
+            while chunk := list(islice(jobs, chunk_size)):
+                pending.append(executor.submit(_run_jobs, function, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            memory, spans = _share_raw_textures(self._raw_textures)
+            self._memory = memory
+            # The workers read the shared copy, so ours can be freed
+            self._raw_textures = ()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._processes,
+                initializer=_attach_raw_textures,
+                initargs=(memory.name, spans),
+            )
+        return self._executor
+
+
+def _share_raw_textures(
+    raw_textures: Sequence[bytes | None],
+) -> tuple[SharedMemory, tuple[_Span, ...]]:
+    spans = list()
+    start = 0
+    for raw_texture in raw_textures:
+        if raw_texture is None:
+            spans.append(None)
+            continue
+        spans.append((start, len(raw_texture)))
+        start += len(raw_texture)
+
+    # A shared memory block cannot be empty
+    memory = SharedMemory(create=True, size=max(1, start))
+    for raw_texture, span in zip(raw_textures, spans):
+        if span:
+            memory.buf[span[0] : span[0] + span[1]] = raw_texture
+    return memory, tuple(spans)
+
+
+# Set in each worker by _attach_raw_textures
+_worker_memory: SharedMemory | None = None
+_worker_exporter = TexturedObjExporter(())
+
+
+def _attach_raw_textures(memory_name: str, spans: tuple[_Span, ...]) -> None:
+    global _worker_memory, _worker_exporter
+    _worker_memory = SharedMemory(name=memory_name)
+    _worker_exporter = TexturedObjExporter(
+        _SharedRawTexture(_worker_memory, *span) if span else _RawTexture(None)
+        for span in spans
+    )
+
+
+def _run_jobs(
+    function: "Callable[[TexturedObjExporter, _Job], _Result]",
+    jobs: list[_Job],
+) -> list[_Result]:
+    return [function(_worker_exporter, job) for job in jobs]
+
+
+def _texture_key_images(
+    exporter: TexturedObjExporter,
+    job: tuple[_TextureKey, str],
+) -> tuple[TextureImageFile, ...]:
+    texture, texture_folder = job
+    return exporter._texture_key_images(texture, texture_folder)
+
+
+def _texture_job_image(exporter: TexturedObjExporter, job: TextureImageJob) -> TextureImageFile:
+    rgba = decode_texture(
+        exporter._raw_texture(job.raw_index),
+        fmt=job.fmt,
+        size=job.size,
+        width=job.width,
+        height=job.height,
+    )
+    return TextureImageFile(job.filename, rgba_to_png(job.width, job.height, rgba))
@@ -0,0 +1,197 @@
+import math
+
+from dataclasses import dataclass
+
+import numpy
+
+
+# Cost added to each (fmt, size) pair tried for unlabelled textures. Almost
+# all DK64 textures are RGBA16 and RGBA32 is rare. Colour indexed formats are
+# left out, without their palette they only decode as noise
+_FORMAT_PENALTIES = {
+    (0, 2): 0.0,
+    (0, 3): 0.2,
+    (3, 0): 0.1,
+    (3, 1): 0.1,
+    (3, 2): 0.1,
+    (4, 0): 0.1,
+    (4, 1): 0.1,
+}
+_BITS_PER_TEXEL = {0: 4, 1: 8, 2: 16, 3: 32}
+# Weight of the alpha channel's entropy, textures rarely mix many alpha values
+_ALPHA_ENTROPY_WEIGHT = 0.25
+# Added per doubling of the aspect ratio away from square
+_ASPECT_PENALTY = 0.05
+_MAX_ASPECT = 8
+_WIDTH_STEP = 8
+_MAX_WIDTH = 256
+_MIN_TEXELS = 16
+# A prior guess is kept unless another candidate costs at least this much less
+_PRIOR_MARGIN = 0.2
+# Entry sizes of 16 and 256 colour RGBA16 palettes
+_PALETTE_SIZES = {0x20: (16, 1), 0x200: (16, 16)}
+# Stops flat textures dividing by zero, they all score 0
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class TextureGuess:
+    """The most likely layout of a raw texture without display list metadata
+
+    Attributes:
+        fmt: F3DEX2 image format
+        size: F3DEX2 texel size
+        width: Width in pixels
+        height: Height in pixels
+        cost: How rough the texture looks decoded this way, lower is likelier
+    """
+
+    fmt: int
+    size: int
+    width: int
+    height: int
+    cost: float
+
+
+@dataclass(frozen=True, slots=True)
+class _FormatSignal:
+    fmt: int
+    size: int
+    intensity: numpy.ndarray
+    spread: float
+    cost: float
+
+
+def classify_texture(
+    raw_data: bytes,
+    prior: tuple[int, int] | None = None,
+) -> TextureGuess | None:
+    """Guess the format, texel size and dimensions of a raw texture
+
+    Each candidate format is split into its colour channels. Formats whose
+    channels change least between neighbouring texels, relative to each
+    channel's spread, score best, with the entropy of the alpha channel as a
+    penalty. Widths of the two best formats are then scored by how much each
+    texel differs from the one a row below, which is smallest at the real
+    width. RGBA16 entries the size of a 16 or 256 colour palette are laid
+    out as rows of 16 colours.
+
+    Args:
+        raw_data (bytes): Decompressed texture table entry
+        prior (tuple[int, int] | None, optional): RGBA16 (width, height) known
+            for entries of this size, kept unless clearly beaten. Defaults to None.
+
+    Returns:
+        TextureGuess | None: The best candidate, or None when no layout fits the data
+    """
+    signals = [
+        signal
+        for fmt, size in _FORMAT_PENALTIES
+        if (signal := _format_signal(raw_data, fmt, size)) is not None
+    ]
+    prior_guess = None
+    rgba16 = next((signal for signal in signals if (signal.fmt, signal.size) == (0, 2)), None)
+    if prior is not None and rgba16 is not None:
+        # Some priors cover a few texels more than the entry holds, decoding pads them
+        prior_guess = _guess(rgba16, *prior)
+
+    best = None
+    signals.sort(key=lambda signal: signal.cost)
+    palette = _PALETTE_SIZES.get(len(raw_data))
+    if palette and signals and (signals[0].fmt, signals[0].size) == (0, 2):
+        # RGBA16 colours the size of a palette are laid out as rows of 16
+        best = _guess(signals[0], *palette)
+    else:
+        for signal in signals[:2]:
+            for width in _candidate_widths(len(signal.intensity)):
+                guess = _guess(signal, width, len(signal.intensity) // width)
+                if best is None or guess.cost < best.cost:
+                    best = guess
+
+    if prior_guess is not None and (
+        best is None or best.cost > prior_guess.cost - _PRIOR_MARGIN
+    ):
+        return prior_guess
+    return best
+
+
+def _format_signal(raw_data: bytes, fmt: int, size: int) -> _FormatSignal | None:
+    bits = len(raw_data) * 8
+    if bits % _BITS_PER_TEXEL[size] or bits // _BITS_PER_TEXEL[size] < _MIN_TEXELS:
+        return None
+
+    data = numpy.frombuffer(raw_data, dtype=numpy.uint8)
+    alpha = None
+    if fmt == 0 and size == 2:
+        words = data.view(">u2")
+        channels = numpy.stack(((words >> 11) & 0x1F, (words >> 6) & 0x1F, (words >> 1) & 0x1F))
+        alpha = words & 0x1
+    elif fmt == 0:
+        texels = data.reshape(-1, 4)
+        channels = texels[:, :3].T
+        alpha = texels[:, 3]
+    elif size == 0:
+        nibbles = numpy.stack((data >> 4, data & 0xF), axis=1).ravel()
+        channels = (nibbles >> 1 if fmt == 3 else nibbles)[None]
+        alpha = nibbles & 0x1 if fmt == 3 else None
+    elif size == 1:
+        channels = (data >> 4 if fmt == 3 else data)[None]
+        alpha = data & 0xF if fmt == 3 else None
+    else:
+        texels = data.reshape(-1, 2)
+        channels = texels[:, :1].T
+        alpha = texels[:, 1]
+
+    # Every channel of the right format is smooth, a wrong format splits
+    # texels across channels and leaves some of them noisy
+    # Sums over texel counts, ndarray.mean is several times slower on arrays this small
+    channels = channels.astype(numpy.float32)
+    texels = channels.shape[1]
+    centred = channels - channels.sum(axis=1, keepdims=True) / texels
+    channel_spread = numpy.abs(centred).sum(axis=1) / texels + _EPSILON
+    steps = numpy.abs(channels[:, 1:] - channels[:, :-1]).sum(axis=1) / (texels - 1)
+    cost = float((steps / channel_spread).sum()) / len(channels)
+    cost += _FORMAT_PENALTIES[fmt, size]
+    if alpha is not None:
+        cost += _ALPHA_ENTROPY_WEIGHT * _normalised_entropy(alpha)
+
+    intensity = channels.sum(axis=0)
+    spread = float(numpy.abs(centred.sum(axis=0)).sum()) / texels + _EPSILON
+    return _FormatSignal(fmt, size, intensity, spread, cost)
+
+
+def _normalised_entropy(values: numpy.ndarray) -> float:
+    counts = numpy.bincount(values.ravel())
+    counts = counts[counts > 0]
+    if len(counts) < 2:
+        return 0.0
+    probabilities = counts / counts.sum()
+    return float(-(probabilities * numpy.log2(probabilities)).sum()) / math.log2(
+        len(counts)
+    )
+
+
+def _candidate_widths(texel_count: int) -> list[int]:
+    return [
+        width
+        for width in range(_WIDTH_STEP, _MAX_WIDTH + 1, _WIDTH_STEP)
+        if texel_count % width == 0
+        and width <= texel_count // width * _MAX_ASPECT
+        and texel_count // width <= width * _MAX_ASPECT
+    ]
+
+
+def _guess(signal: _FormatSignal, width: int, height: int) -> TextureGuess:
+    intensity = signal.intensity[: width * height]
+    if height > 1:
+        vertical = float(numpy.abs(intensity[width:] - intensity[:-width]).sum()) / (
+            len(intensity) - width
+        )
+    else:
+        vertical = signal.spread
+    cost = (
+        signal.cost
+        + vertical / signal.spread
+        + _ASPECT_PENALTY * abs(math.log2(width / height))
+    )
+    return TextureGuess(signal.fmt, signal.size, width, height, cost)
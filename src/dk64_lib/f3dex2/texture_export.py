@@ -1,22 +1,66 @@
 import binascii
+import datetime
+import hashlib
+import io
 import json
 import math
+import os
 import pathlib
+import shutil
 import struct
+import tempfile
 import zlib
 
-from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import chain, groupby
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from xml.sax.saxutils import escape as xml_escape
 
-from collada import Collada
-from collada import geometry as collada_geometry
-from collada import material as collada_material
-from collada import scene, source
-from collada.common import E, tag
 from dk64_lib.f3dex2 import commands
+from dk64_lib.f3dex2.interpreter import DisplayListHandler, DisplayListInterpreter
+from dk64_lib.f3dex2.mesh_arrays import MeshArrays, _MeshArrayCollector
+from dk64_lib.f3dex2.mesh_optimize import optimize_vertex_cache, weld_vertices
+from dk64_lib.f3dex2.mesh_simplify import simplify_triangles
+from dk64_lib.f3dex2.texture_state import _TextureKey, _TextureState
 from dk64_lib.f3dex2.triangle import Triangle
-from dk64_lib.f3dex2.vertex import Vertex
+from dk64_lib.f3dex2.vertex import VERTEX_LAYOUT, Vertex
+from numpy import append as numpy_append
+from numpy import arange as numpy_arange
 from numpy import array as numpy_array
+from numpy import clip as numpy_clip
+from numpy import concatenate as numpy_concatenate
+from numpy import cumsum as numpy_cumsum
+from numpy import dtype as numpy_dtype
+from numpy import frombuffer as numpy_frombuffer
+from numpy import fromiter as numpy_fromiter
+from numpy import int64 as numpy_int64
+from numpy import isin as numpy_isin
+from numpy import maximum as numpy_maximum
+from numpy import minimum as numpy_minimum
+from numpy import ndarray
+from numpy import repeat as numpy_repeat
+from numpy import split as numpy_split
+from numpy import stack as numpy_stack
+from numpy import uint8 as numpy_uint8
+from numpy import uint32 as numpy_uint32
+from numpy import unique as numpy_unique
+from numpy import void as numpy_void
+from numpy import where as numpy_where
+
+# pycollada is only needed to parse DAE output back, see DaeDocument.to_collada
+if TYPE_CHECKING:
+    from mmap import mmap
+
+    from collada import Collada
 
 
 @dataclass(frozen=True, slots=True)
@@ -47,9 +91,23 @@ class TexturedObjExport:
 
 @dataclass(frozen=True, slots=True)
 class TexturedDaeExport:
-    dae: Collada
+    document: "DaeDocument"
     images: tuple[TextureImageFile, ...]
     support_files: tuple[TexturedDaeSupportFile, ...] = tuple()
+    _dae: "Collada | None" = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def dae(self) -> "Collada":
+        """The document as a pycollada object, parsed from the streamed output on first access
+
+        Once parsed, save_textured_dae_export writes this object instead of
+        the streamed document, so edits made through it are kept.
+        """
+        dae = self._dae
+        if dae is None:
+            dae = self.document.to_collada()
+            object.__setattr__(self, "_dae", dae)
+        return dae
 
 
 @dataclass(frozen=True, slots=True)
@@ -62,56 +120,111 @@ class TexturedGltfExport:
 
 @dataclass(frozen=True, slots=True)
 class TexturedGlbExport:
-    data: bytes
+    """Binary glTF whose BIN chunk is spooled to a temporary file
 
+    The buffer is only copied out when the export is written, so holding
+    an export costs little memory beyond its glTF JSON. Close the export, or
+    use it as a context manager, to release the temporary file.
+    """
 
-@dataclass(frozen=True, slots=True)
-class _ImageSource:
-    index: int
-    fmt: int
-    size: int
+    gltf: dict[str, object]
+    binary: "_GltfBinaryBuilder"
 
+    def write(self, target: "str | os.PathLike[str] | BinaryIO") -> None:
+        """Write the GLB to a file path or binary file object
 
-@dataclass(frozen=True, slots=True)
-class _TileDescriptor:
-    fmt: int
-    size: int
-    line: int
-    tmem: int
-    palette: int
-    clamp_s: bool
-    clamp_t: bool
+        Args:
+            target (str | os.PathLike[str] | BinaryIO): Where to write the GLB
+        """
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as file:
+                self.write(file)
+            return
+
+        json_chunk = _pad_bytes(_gltf_json(self.gltf).encode("utf-8"), b" ")
+        bin_length = self.binary.padded_length
+        target.write(
+            struct.pack("<III", 0x46546C67, 2, 12 + 8 + len(json_chunk) + 8 + bin_length)
+        )
+        target.write(struct.pack("<I4s", len(json_chunk), b"JSON"))
+        target.write(json_chunk)
+        target.write(struct.pack("<I4s", bin_length, b"BIN\x00"))
+        self.binary.write(target)
+
+    @property
+    def data(self) -> bytes:
+        """The whole GLB file in memory"""
+        buffer = io.BytesIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    def close(self) -> None:
+        """Release the spooled binary buffer, the export cannot be written afterwards"""
+        self.binary.close()
+
+    def __enter__(self) -> "TexturedGlbExport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 @dataclass(frozen=True, slots=True)
-class _TextureKey:
-    image_index: int
-    palette_index: int | None
-    fmt: int
-    size: int
-    width: int
-    height: int
-    clamp_s: bool = False
-    clamp_t: bool = False
+class TexturedGlbTile:
+    column: int
+    row: int
+    bounds_min: tuple[int, int, int]
+    bounds_max: tuple[int, int, int]
+    triangle_count: int
+    export: TexturedGlbExport
 
     @property
-    def material_name(self) -> str:
-        palette = "none" if self.palette_index is None else str(self.palette_index)
-        name = (
-            f"tex_{self.image_index}_pal_{palette}_"
-            f"f{self.fmt}_s{self.size}_{self.width}x{self.height}"
-        )
-        if self.clamp_s and self.clamp_t:
-            return f"{name}_clamp_st"
-        if self.clamp_s:
-            return f"{name}_clamp_s"
-        if self.clamp_t:
-            return f"{name}_clamp_t"
-        return name
+    def filename(self) -> str:
+        return f"tile_{self.column}_{self.row}.glb"
+
+    def manifest_entry(self, tile_folder: str) -> dict[str, object]:
+        """The tile's file, grid cell and bounds as listed in a tile manifest"""
+        return {
+            "uri": pathlib.PurePosixPath(tile_folder, self.filename).as_posix(),
+            "column": self.column,
+            "row": self.row,
+            "min": list(self.bounds_min),
+            "max": list(self.bounds_max),
+            "triangle_count": self.triangle_count,
+        }
 
-    @property
-    def image_filename(self) -> str:
-        return f"{self.material_name}.png"
+
+@dataclass(frozen=True, slots=True)
+class TexturedGlbTileSet:
+    tile_size: int
+    tiles: tuple[TexturedGlbTile, ...]
+
+    def manifest(self, tile_folder: str) -> dict[str, object]:
+        """Describe the tiles and their bounds for a viewer to stream and cull
+
+        Args:
+            tile_folder (str): Folder the tile files are written to, relative to the manifest
+
+        Returns:
+            dict[str, object]: JSON compatible manifest data
+        """
+        return _glb_tile_manifest(
+            self.tile_size, [tile.manifest_entry(tile_folder) for tile in self.tiles]
+        )
+
+    def close(self) -> None:
+        """Release every tile's spooled binary buffer"""
+        for tile in self.tiles:
+            tile.export.close()
+
+
+@dataclass(frozen=True, slots=True)
+class _DaeTextureMaterial:
+    name: str
+    color_path: str
+    alpha_path: str | None
+    wrap_s: str
+    wrap_t: str
 
 
 @dataclass(frozen=True, slots=True)
@@ -122,10 +235,68 @@ class _DecodedTextureLevel:
     rgba: bytes
 
 
+@dataclass(frozen=True, slots=True)
+class _TextureAnalysis:
+    """What the exporters need to know about a decoded texture's pixels
+
+    has_alpha is set when any pixel is not fully opaque, binary_alpha when
+    every pixel is either fully opaque or fully transparent, so the texture
+    can be alpha tested instead of blended. palette_size is the number of
+    palette entries for colour indexed textures. rgba holds the analysed
+    pixels, unique_colors sorts them so it is only counted when first read.
+    """
+
+    has_alpha: bool
+    binary_alpha: bool
+    rgba: bytes = field(repr=False, compare=False)
+    palette_size: int | None = None
+    _unique_colors: int | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def unique_colors(self) -> int:
+        """The number of distinct RGBA colours, counted on first access"""
+        unique_colors = self._unique_colors
+        if unique_colors is None:
+            unique_colors = len(numpy_unique(numpy_frombuffer(self.rgba, dtype=numpy_uint32)))
+            object.__setattr__(self, "_unique_colors", unique_colors)
+        return unique_colors
+
+    @classmethod
+    def from_level(
+        cls,
+        level: _DecodedTextureLevel,
+        palette_size: int | None = None,
+    ) -> "_TextureAnalysis":
+        rgba = level.rgba[: len(level.rgba) - len(level.rgba) % 4]
+        alpha = numpy_frombuffer(rgba, dtype=numpy_uint8)[3::4]
+        return cls(
+            has_alpha=bool((alpha < 255).any()),
+            binary_alpha=bool(((alpha == 0) | (alpha == 255)).all()),
+            rgba=rgba,
+            palette_size=palette_size,
+        )
+
+
 @dataclass(frozen=True, slots=True)
 class _TextureExportPlan:
     texture: _TextureKey
     levels: tuple[_DecodedTextureLevel, ...]
+    _analysis: _TextureAnalysis | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def analysis(self) -> _TextureAnalysis:
+        """The base level's analysis, computed on first access"""
+        analysis = self._analysis
+        if analysis is None:
+            analysis = _TextureAnalysis.from_level(
+                self.levels[0], _texture_palette_size(self.texture)
+            )
+            object.__setattr__(self, "_analysis", analysis)
+        return analysis
 
 
 @dataclass(frozen=True, slots=True)
@@ -140,6 +311,20 @@ class _TextureAnimationPlan:
     frames: tuple[_TextureAnimationFrame, ...]
     frame_duration: int
     atlas_level: _DecodedTextureLevel
+    _analysis: _TextureAnalysis | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def analysis(self) -> _TextureAnalysis:
+        """The atlas's analysis, computed on first access"""
+        analysis = self._analysis
+        if analysis is None:
+            analysis = _TextureAnalysis.from_level(
+                self.atlas_level, _texture_palette_size(self.texture)
+            )
+            object.__setattr__(self, "_analysis", analysis)
+        return analysis
 
     @property
     def frame_count(self) -> int:
@@ -154,113 +339,350 @@ class _MeshGroup:
     display_list_offset: int
 
 
+@dataclass(frozen=True, slots=True)
+class DaeDocument:
+    """A COLLADA document for mesh groups, streamed straight to a file
+
+    Writes the same document a pycollada tree of the groups would, a
+    library at a time with arrays formatted in bulk, instead of holding the
+    whole XML tree in memory.
+    """
+
+    groups: tuple[_MeshGroup, ...]
+    texture_plans: tuple[_TextureExportPlan, ...] = tuple()
+    texture_folder: str = "textures"
+    animation_plans_by_texture: Mapping[_TextureKey, _TextureAnimationPlan] | None = None
+
+    @classmethod
+    def from_vertex_colors(
+        cls,
+        vertices: Sequence[Vertex],
+        triangles: Sequence[Triangle],
+    ) -> "DaeDocument":
+        """A document holding one untextured, vertex coloured geometry
+
+        Args:
+            vertices (Sequence[Vertex]): The geometry's vertices
+            triangles (Sequence[Triangle]): Triangles indexing vertices
+
+        Returns:
+            DaeDocument: The document
+        """
+        return cls((_MeshGroup(tuple(vertices), tuple(triangles), None, 0),))
+
+    def write(self, file: str | os.PathLike | BinaryIO) -> None:
+        """Write the document
+
+        Args:
+            file (str | os.PathLike | BinaryIO): Path or binary file object to write to
+        """
+        if hasattr(file, "write"):
+            _write_dae_document(self, file)
+            return
+        with open(file, "wb") as stream:
+            _write_dae_document(self, stream)
+
+    def to_bytes(self) -> bytes:
+        stream = io.BytesIO()
+        self.write(stream)
+        return stream.getvalue()
+
+    def to_collada(self) -> "Collada":
+        """Parse the document into a pycollada object
+
+        Returns:
+            Collada: The parsed document
+        """
+        from collada import Collada
+
+        return Collada(io.BytesIO(self.to_bytes()))
+
+
 @dataclass(frozen=True, slots=True)
 class _GltfMaterialKey:
     texture: _TextureKey | None
     blended: bool
+    masked: bool = False
 
 
+TILE_MANIFEST_FORMAT = 1
+
 TextureAnimationFrameRef = int | tuple[int, int | None]
 TextureAnimationFrames = Mapping[int, Sequence[TextureAnimationFrameRef]]
 
 
-class _TextureState:
+class _MeshGroupFrame:
+    __slots__ = ("vertices", "triangles", "texture")
+
     def __init__(self):
-        self._pending_image: _ImageSource | None = None
-        self._loaded_images: dict[int, _ImageSource] = {}
-        self._tile_descriptors: dict[int, _TileDescriptor] = {}
-        self._tile_sizes: dict[int, tuple[int, int]] = {}
-        self._last_loaded_tile: int | None = None
-        self._last_palette: _ImageSource | None = None
-        self._active_tile: int | None = None
-
-    def clone(self) -> "_TextureState":
-        state = _TextureState()
-        state._pending_image = self._pending_image
-        state._loaded_images = dict(self._loaded_images)
-        state._tile_descriptors = dict(self._tile_descriptors)
-        state._tile_sizes = dict(self._tile_sizes)
-        state._last_loaded_tile = self._last_loaded_tile
-        state._last_palette = self._last_palette
-        state._active_tile = self._active_tile
-        return state
-
-    def apply(self, command: commands.DL_Command) -> None:
-        if isinstance(command, commands.G_SETTIMG):
-            self._pending_image = _ImageSource(
-                index=command.address,
-                fmt=command.fmt,
-                size=command.size,
-            )
-            return
+        self.vertices: tuple[Vertex, ...] = tuple()
+        self.triangles: list[Triangle] = []
+        self.texture: _TextureKey | None = None
 
-        if isinstance(command, (commands.G_LOADBLOCK, commands.G_LOADTILE)):
-            if self._pending_image is not None:
-                self._loaded_images[command.tile] = self._pending_image
-                self._last_loaded_tile = command.tile
-            return
 
-        if isinstance(command, commands.G_LOADTLUT):
-            if self._pending_image is not None:
-                self._last_palette = self._pending_image
+class _MeshGroupCollector(DisplayListHandler):
+    """Splits display lists into mesh groups at vertex loads and texture changes
+
+    Each display list and branch collects its own pending group, so a
+    branch's groups come before the group its caller was building.
+    """
+
+    opcodes = frozenset((b"\x01", b"\x05", b"\x06"))
+
+    def __init__(self):
+        self.groups: list[_MeshGroup] = []
+        self._frames: list[_MeshGroupFrame] = []
+
+    def enter_display_list(self, display_list: object, state: _TextureState) -> None:
+        self._frames.append(_MeshGroupFrame())
+
+    def exit_display_list(self, display_list: object, state: _TextureState) -> None:
+        self._flush(self._frames.pop(), display_list)
+
+    def handle_command(
+        self,
+        command: commands.DL_Command,
+        display_list: object,
+        state: _TextureState,
+    ) -> None:
+        frame = self._frames[-1]
+        if command.opcode == b"\x01":
+            self._flush(frame, display_list)
+            frame.vertices = tuple(_vertices_for_command(display_list, command))
+            frame.triangles = []
+            frame.texture = state.active_texture
             return
 
-        if isinstance(command, commands.G_SETTILE):
-            self._tile_descriptors[command.tile] = _TileDescriptor(
-                fmt=command.fmt,
-                size=command.size,
-                line=command.line,
-                tmem=command.tmem,
-                palette=command.palette,
-                clamp_s=bool(command.cm_s & 0x2),
-                clamp_t=bool(command.cm_t & 0x2),
+        active_texture = state.active_texture
+        if frame.triangles and active_texture != frame.texture:
+            self._flush(frame, display_list)
+            frame.triangles = []
+        frame.texture = active_texture
+        if command.opcode == b"\x05":
+            frame.triangles.append(Triangle.from_tri1(command))
+        else:
+            frame.triangles.extend(Triangle.from_tri2(command))
+
+    def _flush(self, frame: _MeshGroupFrame, display_list: object) -> None:
+        if frame.vertices and frame.triangles:
+            self.groups.append(
+                _MeshGroup(
+                    vertices=frame.vertices,
+                    triangles=tuple(frame.triangles),
+                    texture=frame.texture,
+                    display_list_offset=display_list.offset,
+                )
             )
-            return
 
-        if isinstance(command, commands.G_SETTILESIZE):
-            if self._active_tile is None:
-                self._active_tile = command.tile
-            self._tile_sizes[command.tile] = _tile_dimensions(command)
+
+@dataclass(frozen=True, slots=True)
+class _DecodedMeshGroup:
+    texture: _TextureKey | None
+    display_list_offset: int
+    vertex_count: int
+    triangle_count: int
+
+
+class DecodedMesh:
+    def __init__(
+        self,
+        group_headers: Sequence[_DecodedMeshGroup],
+        vertex_data: bytes | memoryview,
+        index_data: bytes | memoryview,
+        mapped_file: "mmap | None" = None,
+    ):
+        """A geometry's mesh groups, decoded once and reusable across exports
+
+        Exporters accept a DecodedMesh wherever they accept display lists and
+        skip walking the display lists entirely.
+
+        Args:
+            group_headers (Sequence[_DecodedMeshGroup]): Texture, display list
+                offset and sizes of each mesh group, in export order
+            vertex_data (bytes | memoryview): Every group's 16 byte vertex
+                records, back to back
+            index_data (bytes | memoryview): Every group's triangle vertex
+                indices as little-endian u16, three per triangle
+            mapped_file (mmap | None, optional): Memory-mapped file the data
+                views point into, closed by close. Defaults to None.
+        """
+        self.group_headers = tuple(group_headers)
+        self.vertex_data = vertex_data
+        self.index_data = index_data
+        self._mapped_file = mapped_file
+        self._groups: tuple[_MeshGroup, ...] | None = None
+
+    def close(self) -> None:
+        """Release the memory-mapped file a cached mesh reads from
+
+        Groups built before closing stay usable, the vertex and index data do not.
+        """
+        if self._mapped_file is None:
             return
+        for data in (self.vertex_data, self.index_data):
+            if isinstance(data, memoryview):
+                data.release()
+        self._mapped_file.close()
+        self._mapped_file = None
+
+    def __enter__(self) -> "DecodedMesh":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[_MeshGroup]) -> "DecodedMesh":
+        groups = tuple(groups)
+        decoded_mesh = cls(
+            tuple(
+                _DecodedMeshGroup(
+                    texture=group.texture,
+                    display_list_offset=group.display_list_offset,
+                    vertex_count=len(group.vertices),
+                    triangle_count=len(group.triangles),
+                )
+                for group in groups
+            ),
+            b"".join(
+                VERTEX_LAYOUT.struct.pack(
+                    vertex.x,
+                    vertex.y,
+                    vertex.z,
+                    vertex.unk,
+                    vertex.texture_cord_u,
+                    vertex.texture_cord_v,
+                    vertex.xr,
+                    vertex.yg,
+                    vertex.zb,
+                    vertex.alpha,
+                )
+                for group in groups
+                for vertex in group.vertices
+            ),
+            numpy_array(
+                [
+                    (triangle.v1, triangle.v2, triangle.v3)
+                    for group in groups
+                    for triangle in group.triangles
+                ],
+                dtype="<u2",
+            ).tobytes(),
+        )
+        decoded_mesh._groups = groups
+        return decoded_mesh
+
+    @classmethod
+    def from_display_lists(cls, display_lists: Iterable[object]) -> "DecodedMesh":
+        collector = _MeshGroupCollector()
+        DisplayListInterpreter((collector,)).run(display_lists)
+        return cls.from_groups(collector.groups)
 
-        if isinstance(command, commands.G_TEXTURE):
-            self._active_tile = command.tile if command.on else None
+    def lod_meshes(self, lod_ratios: Sequence[float]) -> tuple["DecodedMesh", ...]:
+        """Simplified levels of detail of this mesh
+
+        Args:
+            lod_ratios (Sequence[float]): Fraction of the triangles each level keeps
+
+        Returns:
+            tuple[DecodedMesh, ...]: One mesh per ratio, in the same order
+        """
+        return tuple(
+            DecodedMesh.from_groups(level_groups)
+            for level_groups in _lod_mesh_groups(self.groups, lod_ratios)
+        )
 
     @property
-    def active_texture(self) -> _TextureKey | None:
-        if self._active_tile is None:
-            return None
+    def texture_keys(self) -> tuple[_TextureKey, ...]:
+        """The distinct textures the mesh draws with, in first use order"""
+        return tuple(
+            texture
+            for texture in dict.fromkeys(header.texture for header in self.group_headers)
+            if texture
+        )
 
-        descriptor = self._tile_descriptors.get(self._active_tile)
-        dimensions = self._tile_sizes.get(self._active_tile)
-        if descriptor is None or dimensions is None:
-            return None
+    @property
+    def groups(self) -> tuple[_MeshGroup, ...]:
+        """The mesh groups, built from the vertex and index data on first use"""
+        if self._groups is None:
+            self._groups = tuple(self._build_groups())
+        return self._groups
+
+    def _build_groups(self) -> Iterable[_MeshGroup]:
+        indices = numpy_frombuffer(self.index_data, dtype="<u2").tolist()
+        vertex_start = 0
+        index_start = 0
+        for header in self.group_headers:
+            vertex_end = vertex_start + header.vertex_count * VERTEX_LAYOUT.size
+            index_end = index_start + header.triangle_count * 3
+            group_indices = indices[index_start:index_end]
+            yield _MeshGroup(
+                vertices=tuple(
+                    Vertex.from_table(
+                        memoryview(self.vertex_data)[vertex_start:vertex_end]
+                    )
+                ),
+                triangles=tuple(
+                    Triangle(*group_indices[index : index + 3])
+                    for index in range(0, len(group_indices), 3)
+                ),
+                texture=header.texture,
+                display_list_offset=header.display_list_offset,
+            )
+            vertex_start = vertex_end
+            index_start = index_end
 
-        source = self._loaded_images.get(self._active_tile)
-        if source is None and self._last_loaded_tile is not None:
-            source = self._loaded_images.get(self._last_loaded_tile)
-        if source is None:
-            return None
 
-        palette_index = None
-        if descriptor.fmt == 2 and self._last_palette is not None:
-            palette_index = self._last_palette.index
+@dataclass(frozen=True, slots=True)
+class DecodedGeometry:
+    """A map's mesh groups and mesh arrays, collected in one walk of its display lists
+
+    The arrays are read-only, since they are shared by every caller.
+
+    Attributes:
+        mesh: Mesh groups for the textured exporters
+        arrays: The mesh as contiguous NumPy arrays
+    """
+
+    mesh: DecodedMesh
+    arrays: MeshArrays
+
+    @classmethod
+    def from_display_lists(cls, display_lists: Iterable[object]) -> "DecodedGeometry":
+        group_collector = _MeshGroupCollector()
+        array_collector = _MeshArrayCollector()
+        DisplayListInterpreter((group_collector, array_collector)).run(display_lists)
+        arrays = array_collector.to_arrays()
+        for array in (
+            arrays.positions,
+            arrays.colors,
+            arrays.uvs_raw,
+            arrays.uvs,
+            arrays.triangles,
+            arrays.triangle_texture_ids,
+            arrays.triangle_display_list_offsets,
+        ):
+            array.flags.writeable = False
+        return cls(DecodedMesh.from_groups(group_collector.groups), arrays)
 
-        return _TextureKey(
-            image_index=source.index,
-            palette_index=palette_index,
-            fmt=descriptor.fmt,
-            size=descriptor.size,
-            width=dimensions[0],
-            height=dimensions[1],
-            clamp_s=descriptor.clamp_s,
-            clamp_t=descriptor.clamp_t,
-        )
+    @property
+    def texture_keys(self) -> tuple[_TextureKey, ...]:
+        """The distinct textures the map draws with, in first use order"""
+        return self.mesh.texture_keys
 
 
 class TexturedObjExporter:
-    def __init__(self, texture_data: Iterable[object]):
+    def __init__(self, texture_data: Iterable[object], optimize_meshes: bool = False):
+        """Export textured geometry from F3DEX2 display lists
+
+        Args:
+            texture_data (Iterable[object]): The geometry texture table
+            optimize_meshes (bool, optional): Merge mesh groups per material,
+                drop unused vertices, weld duplicates and reorder triangles for
+                the vertex cache before writing. Defaults to False.
+        """
         self._texture_data = tuple(texture_data)
+        self._optimize_meshes = optimize_meshes
 
     def export(
         self,
@@ -274,7 +696,7 @@ class TexturedObjExporter:
         transparent_textures = tuple(
             texture_plan.texture
             for texture_plan in texture_plans
-            if _texture_level_has_transparency(texture_plan.levels[0])
+            if texture_plan.analysis.has_alpha
         )
         return TexturedObjExport(
             obj_data=self._obj_data(groups, mtl_filename),
@@ -298,9 +720,13 @@ class TexturedObjExporter:
 
     def texture_image_indices(self, display_lists: Iterable[object]) -> tuple[int, ...]:
         """Return texture image table indices identified by F3DEX2 display lists."""
+        return tuple(texture.image_index for texture in self.texture_keys(display_lists))
+
+    def texture_keys(self, display_lists: Iterable[object]) -> tuple[_TextureKey, ...]:
+        """Return the distinct textures F3DEX2 display lists draw with, in first use order."""
         groups = tuple(self._iter_mesh_groups(display_lists))
         return tuple(
-            texture.image_index
+            texture
             for texture in dict.fromkeys(group.texture for group in groups)
             if texture
         )
@@ -334,80 +760,15 @@ class TexturedObjExporter:
         self,
         display_lists: Iterable[object],
     ) -> Iterable[_MeshGroup]:
-        for display_list in display_lists:
-            if display_list.is_branched:
-                continue
-            yield from self._iter_display_list_groups(display_list, _TextureState())
-
-    def _iter_display_list_groups(
-        self,
-        display_list: object,
-        state: _TextureState,
-    ) -> Iterable[_MeshGroup]:
-        vertices: tuple[Vertex, ...] = tuple()
-        triangles: list[Triangle] = []
-        current_texture: _TextureKey | None = None
-
-        for command in display_list.commands:
-            if isinstance(command, commands.G_VTX):
-                if vertices and triangles:
-                    yield _MeshGroup(
-                        vertices=vertices,
-                        triangles=tuple(triangles),
-                        texture=current_texture,
-                        display_list_offset=display_list.offset,
-                    )
-                vertices = tuple(_vertices_for_command(display_list, command))
-                triangles = []
-                current_texture = state.active_texture
-                continue
-
-            if isinstance(command, commands.G_TRI1):
-                active_texture = state.active_texture
-                if triangles and active_texture != current_texture:
-                    yield _MeshGroup(
-                        vertices=vertices,
-                        triangles=tuple(triangles),
-                        texture=current_texture,
-                        display_list_offset=display_list.offset,
-                    )
-                    triangles = []
-                current_texture = active_texture
-                triangles.append(Triangle.from_tri1(command))
-                continue
-
-            if isinstance(command, commands.G_TRI2):
-                active_texture = state.active_texture
-                if triangles and active_texture != current_texture:
-                    yield _MeshGroup(
-                        vertices=vertices,
-                        triangles=tuple(triangles),
-                        texture=current_texture,
-                        display_list_offset=display_list.offset,
-                    )
-                    triangles = []
-                current_texture = active_texture
-                tri1, tri2 = Triangle.from_tri2(command)
-                triangles.extend((tri1, tri2))
-                continue
-
-            if isinstance(command, commands.G_DL):
-                branch = display_list.get_branch_by_offset(
-                    int.from_bytes(command.address, "big")
-                )
-                if branch is not None:
-                    yield from self._iter_display_list_groups(branch, state.clone())
-                continue
-
-            state.apply(command)
-
-        if vertices and triangles:
-            yield _MeshGroup(
-                vertices=vertices,
-                triangles=tuple(triangles),
-                texture=current_texture,
-                display_list_offset=display_list.offset,
-            )
+        if isinstance(display_lists, DecodedMesh):
+            groups = display_lists.groups
+        else:
+            collector = _MeshGroupCollector()
+            DisplayListInterpreter((collector,)).run(display_lists)
+            groups = tuple(collector.groups)
+        if self._optimize_meshes:
+            return _optimize_mesh_groups(groups)
+        return groups
 
     def _obj_data(self, groups: tuple[_MeshGroup, ...], mtl_filename: str) -> str:
         lines = [f"mtllib {mtl_filename}", ""]
@@ -457,7 +818,7 @@ class TexturedObjExporter:
         lines: list[str] = []
         for texture_plan in texture_plans:
             texture = texture_plan.texture
-            has_transparency = _texture_level_has_transparency(texture_plan.levels[0])
+            has_transparency = texture_plan.analysis.has_alpha
             lines.extend(
                 (
                     f"newmtl {texture.material_name}",
@@ -484,6 +845,16 @@ class TexturedObjExporter:
             texture_folder,
         ) + self._alpha_mask_image(texture_plan, texture_folder)
 
+    def _texture_key_images(
+        self,
+        texture: _TextureKey,
+        texture_folder: str,
+    ) -> tuple[TextureImageFile, ...]:
+        return self._texture_images(
+            _TextureExportPlan(texture, self._decoded_texture_levels(texture)),
+            texture_folder,
+        )
+
     def _texture_level_images(
         self,
         texture_plan: _TextureExportPlan,
@@ -506,9 +877,9 @@ class TexturedObjExporter:
         texture_plan: _TextureExportPlan,
         texture_folder: str,
     ) -> tuple[TextureImageFile, ...]:
-        base_level = texture_plan.levels[0]
-        if not _texture_level_has_transparency(base_level):
+        if not texture_plan.analysis.has_alpha:
             return tuple()
+        base_level = texture_plan.levels[0]
         return (
             TextureImageFile(
                 filename=_texture_asset_filename(
@@ -597,7 +968,7 @@ class TexturedDaeExporter(TexturedObjExporter):
             )
         )
         return TexturedDaeExport(
-            dae=_dae_mesh(
+            document=DaeDocument(
                 groups,
                 texture_plans,
                 texture_folder,
@@ -673,7 +1044,7 @@ class TexturedDaeExporter(TexturedObjExporter):
                 ),
             )
         ]
-        if _texture_level_has_transparency(atlas_level):
+        if animation_plan.analysis.has_alpha:
             images.append(
                 TextureImageFile(
                     filename=_texture_asset_filename(
@@ -697,7 +1068,19 @@ class TexturedGltfExporter(TexturedObjExporter):
         binary_filename: str = "geometry.bin",
         texture_folder: str = "textures",
         include_textures: bool = True,
+        quantize: bool = False,
+        lod_ratios: Sequence[float] = (),
+        alpha_mask: bool = False,
     ) -> TexturedGltfExport:
+        """Export glTF JSON, its binary buffer, and texture images.
+
+        With quantize, vertex attributes are stored as integers using
+        KHR_mesh_quantization instead of 32-bit floats. Each of lod_ratios
+        adds a simplified level of detail keeping that fraction of the
+        triangles, linked from the full detail node with MSFT_lod. With
+        alpha_mask, textures whose pixels are only fully opaque or fully
+        transparent use alphaMode MASK instead of BLEND.
+        """
         groups, texture_plans = self._groups_and_texture_plans(
             display_lists,
             include_textures,
@@ -707,13 +1090,32 @@ class TexturedGltfExporter(TexturedObjExporter):
             for texture_plan in texture_plans
             for image in self._texture_level_images(texture_plan, texture_folder)
         )
-        gltf, binary_data = _gltf_mesh(
+        image_uris = {
+            _texture_asset_filename(texture_folder, texture_plan.texture.image_filename)
+            for texture_plan in texture_plans
+        }
+        gltf, binary = _gltf_mesh(
             groups,
             texture_plans,
             binary_filename,
             texture_folder,
             embedded_images=tuple(),
+            quantize=quantize,
+            lod_groups=_lod_mesh_groups(groups, lod_ratios),
+            alpha_mask=alpha_mask,
+            external_images=tuple(image for image in images if image.filename in image_uris),
+        )
+        # Duplicate images point at the first file with the same PNG data
+        used_uris = {image.get("uri") for image in gltf.get("images", ())}
+        images = tuple(
+            image
+            for image in images
+            if image.filename not in image_uris or image.filename in used_uris
         )
+        try:
+            binary_data = binary.to_bytes()
+        finally:
+            binary.close()
         return TexturedGltfExport(
             gltf_data=_gltf_json(gltf),
             binary_filename=binary_filename,
@@ -725,25 +1127,181 @@ class TexturedGltfExporter(TexturedObjExporter):
         self,
         display_lists: Iterable[object],
         include_textures: bool = True,
+        quantize: bool = False,
+        lod_ratios: Sequence[float] = (),
+        alpha_mask: bool = False,
     ) -> TexturedGlbExport:
+        """Export binary glTF with embedded texture images.
+
+        With quantize, vertex attributes are stored as integers using
+        KHR_mesh_quantization instead of 32-bit floats. Each of lod_ratios
+        adds a simplified level of detail keeping that fraction of the
+        triangles, linked from the full detail node with MSFT_lod. With
+        alpha_mask, textures whose pixels are only fully opaque or fully
+        transparent use alphaMode MASK instead of BLEND.
+        """
         groups, texture_plans = self._groups_and_texture_plans(
             display_lists,
             include_textures,
         )
-        embedded_images = tuple(
-            image
-            for texture_plan in texture_plans
-            for image in self._texture_level_images(texture_plan, "")
-            if "_mip" not in image.filename
-        )
-        gltf, binary_data = _gltf_mesh(
+        embedded_images = self._glb_embedded_images(texture_plans)
+        gltf, binary = _gltf_mesh(
             groups,
             texture_plans,
             binary_filename=None,
             texture_folder="",
             embedded_images=embedded_images,
+            quantize=quantize,
+            lod_groups=_lod_mesh_groups(groups, lod_ratios),
+            alpha_mask=alpha_mask,
+        )
+        return TexturedGlbExport(gltf, binary)
+
+    def export_glb_tiles(
+        self,
+        display_lists: Iterable[object],
+        tile_size: int,
+        include_textures: bool = True,
+        quantize: bool = False,
+        alpha_mask: bool = False,
+    ) -> TexturedGlbTileSet:
+        """Split the geometry into a uniform grid of binary glTF tiles.
+
+        Every tile is built before this returns, each holding its own spooled
+        binary buffer. iter_glb_tiles builds them one at a time instead.
+
+        Args:
+            display_lists (Iterable[object]): Display lists or a DecodedMesh
+            tile_size (int): Width and depth of a tile in map units
+            include_textures (bool, optional): Whether to embed textures. Defaults to True.
+            quantize (bool, optional): Store vertex attributes as integers. Defaults to False.
+            alpha_mask (bool, optional): Alpha test textures with only fully
+                opaque or fully transparent pixels. Defaults to False.
+
+        Returns:
+            TexturedGlbTileSet: The non-empty tiles, ordered by row then column
+        """
+        tiles = []
+        try:
+            tiles.extend(
+                self.iter_glb_tiles(
+                    display_lists,
+                    tile_size,
+                    include_textures=include_textures,
+                    quantize=quantize,
+                    alpha_mask=alpha_mask,
+                )
+            )
+        except BaseException:
+            for tile in tiles:
+                tile.export.close()
+            raise
+        return TexturedGlbTileSet(tile_size=tile_size, tiles=tuple(tiles))
+
+    def iter_glb_tiles(
+        self,
+        display_lists: Iterable[object],
+        tile_size: int,
+        include_textures: bool = True,
+        quantize: bool = False,
+        alpha_mask: bool = False,
+    ) -> Iterator[TexturedGlbTile]:
+        """Build the binary glTF tiles of a uniform grid one at a time.
+
+        Triangles go to the tile on the X/Z plane holding their centroid.
+        Each tile only embeds the textures its triangles use. A tile's
+        binary buffer is only spooled when the tile is reached, so closing
+        each tile once it is written keeps a single buffer open at a time.
+
+        Args:
+            display_lists (Iterable[object]): Display lists or a DecodedMesh
+            tile_size (int): Width and depth of a tile in map units
+            include_textures (bool, optional): Whether to embed textures. Defaults to True.
+            quantize (bool, optional): Store vertex attributes as integers. Defaults to False.
+            alpha_mask (bool, optional): Alpha test textures with only fully
+                opaque or fully transparent pixels. Defaults to False.
+
+        Yields:
+            TexturedGlbTile: The non-empty tiles, ordered by row then column
+        """
+        groups, texture_plans = self._groups_and_texture_plans(
+            display_lists,
+            include_textures,
+        )
+        embedded_images = self._glb_embedded_images(texture_plans)
+        for (column, row), tile_groups in sorted(
+            _tile_mesh_groups(groups, tile_size).items(),
+            key=lambda item: (item[0][1], item[0][0]),
+        ):
+            tile_textures = {group.texture for group in tile_groups}
+            gltf, binary = _gltf_mesh(
+                tile_groups,
+                tuple(
+                    texture_plan
+                    for texture_plan in texture_plans
+                    if texture_plan.texture in tile_textures
+                ),
+                binary_filename=None,
+                texture_folder="",
+                embedded_images=embedded_images,
+                quantize=quantize,
+                alpha_mask=alpha_mask,
+            )
+            vertices = tuple(vertex for group in tile_groups for vertex in group.vertices)
+            yield TexturedGlbTile(
+                column=column,
+                row=row,
+                bounds_min=(
+                    min(vertex.x for vertex in vertices),
+                    min(vertex.y for vertex in vertices),
+                    min(vertex.z for vertex in vertices),
+                ),
+                bounds_max=(
+                    max(vertex.x for vertex in vertices),
+                    max(vertex.y for vertex in vertices),
+                    max(vertex.z for vertex in vertices),
+                ),
+                triangle_count=sum(len(group.triangles) for group in tile_groups),
+                export=TexturedGlbExport(gltf, binary),
+            )
+
+    def lod_meshes(
+        self,
+        display_lists: Iterable[object],
+        lod_ratios: Sequence[float],
+        include_textures: bool = True,
+    ) -> tuple["DecodedMesh", ...]:
+        """Simplified levels of detail, built like the MSFT_lod levels of export
+
+        The groups are merged, stripped of textures or cleared of untextured
+        duplicate triangles exactly as export prepares them before they are
+        simplified, so writing each level as its own file gives the same
+        triangles as linking them with MSFT_lod.
+
+        Args:
+            display_lists (Iterable[object]): Display lists or a DecodedMesh
+            lod_ratios (Sequence[float]): Fraction of the triangles each level keeps
+            include_textures (bool, optional): Whether the levels keep their textures. Defaults to True.
+
+        Returns:
+            tuple[DecodedMesh, ...]: One mesh per ratio, in the same order
+        """
+        groups, _ = self._groups_and_texture_plans(display_lists, include_textures)
+        return tuple(
+            DecodedMesh.from_groups(level_groups)
+            for level_groups in _lod_mesh_groups(groups, lod_ratios)
+        )
+
+    def _glb_embedded_images(
+        self,
+        texture_plans: tuple[_TextureExportPlan, ...],
+    ) -> tuple[TextureImageFile, ...]:
+        return tuple(
+            image
+            for texture_plan in texture_plans
+            for image in self._texture_level_images(texture_plan, "")
+            if "_mip" not in image.filename
         )
-        return TexturedGlbExport(data=_glb_data(gltf, binary_data))
 
     def _groups_and_texture_plans(
         self,
@@ -775,34 +1333,220 @@ class TexturedGltfExporter(TexturedObjExporter):
         return groups, texture_plans
 
 
+def _optimize_mesh_groups(groups: tuple[_MeshGroup, ...]) -> tuple[_MeshGroup, ...]:
+    """Merge groups sharing a material into compact, cache friendly groups
+
+    Runs of neighbouring groups are merged per texture and vertex alpha, so
+    each merged group keeps the material it would have had on its own and
+    groups are still drawn in display list order. Merged groups take the
+    display list offset of their first group.
+    """
+    return tuple(
+        _compact_mesh_group(group, [_triangle_face(triangle) for triangle in group.triangles])
+        for group in _welded_material_groups(groups)
+    )
+
+
+def _welded_material_groups(groups: tuple[_MeshGroup, ...]) -> Iterable[_MeshGroup]:
+    """Merge runs of groups sharing a texture and vertex alpha, dropping unused and duplicate vertices
+
+    Only neighbouring groups are merged, so blended groups keep their draw order.
+    """
+    runs = groupby(
+        groups,
+        key=lambda group: (group.texture, _mesh_group_has_vertex_transparency(group)),
+    )
+    for (texture, _), material_groups in runs:
+        material_groups = tuple(material_groups)
+        vertices: list[Vertex] = []
+        triangles: list[tuple[int, int, int]] = []
+        for group in material_groups:
+            vertex_offset = len(vertices)
+            vertex_count = len(group.vertices)
+            vertices.extend(group.vertices)
+            triangles.extend(
+                (
+                    triangle.v1 + vertex_offset,
+                    triangle.v2 + vertex_offset,
+                    triangle.v3 + vertex_offset,
+                )
+                for triangle in group.triangles
+                if max(triangle.v1, triangle.v2, triangle.v3) < vertex_count
+            )
+
+        kept_vertices, triangles = weld_vertices(
+            [_vertex_weld_key(vertex, texture is not None) for vertex in vertices],
+            triangles,
+        )
+        if triangles:
+            yield _MeshGroup(
+                vertices=tuple(vertices[index] for index in kept_vertices),
+                triangles=tuple(Triangle(*triangle) for triangle in triangles),
+                texture=texture,
+                display_list_offset=material_groups[0].display_list_offset,
+            )
+
+
+def _compact_mesh_group(
+    group: _MeshGroup, faces: Sequence[tuple[int, int, int]]
+) -> _MeshGroup:
+    """Reorder faces for the vertex cache and keep only the group vertices they use"""
+    faces = optimize_vertex_cache(faces, len(group.vertices))
+    # Number vertices in the order the reordered triangles use them
+    draw_order, faces = weld_vertices(range(len(group.vertices)), faces)
+    return _MeshGroup(
+        vertices=tuple(group.vertices[index] for index in draw_order),
+        triangles=tuple(Triangle(*face) for face in faces),
+        texture=group.texture,
+        display_list_offset=group.display_list_offset,
+    )
+
+
+def _lod_mesh_groups(
+    groups: tuple[_MeshGroup, ...],
+    lod_ratios: Sequence[float],
+) -> tuple[tuple[_MeshGroup, ...], ...]:
+    """Simplified copies of the groups, one per ratio of the full triangle count
+
+    Each level is simplified from the one before it, per merged material
+    group, so texture and colour seams stay where they are.
+    """
+    for ratio in lod_ratios:
+        if not 0 < ratio < 1:
+            raise ValueError("LOD ratios must be between 0 and 1")
+
+    material_groups = tuple(_welded_material_groups(groups))
+    current_faces = [
+        [_triangle_face(triangle) for triangle in group.triangles]
+        for group in material_groups
+    ]
+    levels = []
+    for ratio in lod_ratios:
+        level = []
+        for group_index, group in enumerate(material_groups):
+            current_faces[group_index] = simplify_triangles(
+                [(vertex.x, vertex.y, vertex.z) for vertex in group.vertices],
+                current_faces[group_index],
+                max(1, math.ceil(len(group.triangles) * ratio)),
+            )
+            level.append(_compact_mesh_group(group, current_faces[group_index]))
+        levels.append(tuple(level))
+    return tuple(levels)
+
+
+def _tile_mesh_groups(
+    groups: tuple[_MeshGroup, ...],
+    tile_size: int,
+) -> dict[tuple[int, int], tuple[_MeshGroup, ...]]:
+    """Split groups by the X/Z grid cell of each triangle's centroid
+
+    Every tile keeps the group order, and each split group only the
+    vertices its triangles use.
+    """
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive")
+
+    tiles: dict[tuple[int, int], list[_MeshGroup]] = {}
+    for group in groups:
+        vertex_count = len(group.vertices)
+        faces_by_tile: dict[tuple[int, int], list[tuple[int, int, int]]] = {}
+        for triangle in group.triangles:
+            face = _triangle_face(triangle)
+            if not all(0 <= index < vertex_count for index in face):
+                continue
+            corners = [group.vertices[index] for index in face]
+            # Floor division of the summed corners keeps the centroid exact
+            tile = (
+                sum(corner.x for corner in corners) // (3 * tile_size),
+                sum(corner.z for corner in corners) // (3 * tile_size),
+            )
+            faces_by_tile.setdefault(tile, []).append(face)
+
+        for tile, faces in faces_by_tile.items():
+            kept_vertices, faces = weld_vertices(range(vertex_count), faces)
+            if faces:
+                tiles.setdefault(tile, []).append(
+                    _MeshGroup(
+                        vertices=tuple(group.vertices[index] for index in kept_vertices),
+                        triangles=tuple(Triangle(*face) for face in faces),
+                        texture=group.texture,
+                        display_list_offset=group.display_list_offset,
+                    )
+                )
+    return {tile: tuple(tile_groups) for tile, tile_groups in tiles.items()}
+
+
+def _triangle_face(triangle: Triangle) -> tuple[int, int, int]:
+    return triangle.v1, triangle.v2, triangle.v3
+
+
+def _vertex_weld_key(vertex: Vertex, textured: bool) -> tuple[int, ...]:
+    # Exports never write the unknown field, and untextured groups drop UVs
+    key = (vertex.x, vertex.y, vertex.z, vertex.xr, vertex.yg, vertex.zb, vertex.alpha)
+    if textured:
+        return key + (vertex.texture_cord_u, vertex.texture_cord_v)
+    return key
+
+
+# Shifts signed 16-bit positions to unsigned before they are packed
+_POSITION_KEY_OFFSET = 0x8000
+_INVALID_CORNER_KEY = 1 << 48
+_VERTEX_POSITION = attrgetter("x", "y", "z")
+_TRIANGLE_CORNERS = attrgetter("v1", "v2", "v3")
+
+
 def _drop_untextured_duplicate_triangles(
     groups: tuple[_MeshGroup, ...],
 ) -> tuple[_MeshGroup, ...]:
-    textured_triangles = {
-        _triangle_position_key(group, triangle)
+    """Drop untextured triangles that repeat the corners of a textured one
+
+    Triangles are compared by their sorted corner positions, ignoring
+    winding and which vertices they index.
+    """
+    textured_keys = [
+        _triangle_position_keys(group)
         for group in groups
-        if group.texture is not None
-        for triangle in group.triangles
-    }
-    if not textured_triangles:
+        if group.texture is not None and group.triangles
+    ]
+    if not textured_keys:
         return groups
 
+    # One membership test for every untextured triangle, split back per group
+    untextured_groups = [
+        group for group in groups if group.texture is None and group.triangles
+    ]
+    if untextured_groups:
+        duplicates = numpy_isin(
+            numpy_concatenate([_triangle_position_keys(group) for group in untextured_groups]),
+            numpy_concatenate(textured_keys),
+        )
+        group_duplicates = iter(
+            numpy_split(
+                duplicates,
+                numpy_cumsum([len(group.triangles) for group in untextured_groups])[:-1],
+            )
+        )
+
     filtered_groups = list()
     for group in groups:
         if group.texture is not None:
             filtered_groups.append(group)
             continue
+        if not group.triangles:
+            continue
 
-        triangles = tuple(
-            triangle
-            for triangle in group.triangles
-            if _triangle_position_key(group, triangle) not in textured_triangles
-        )
-        if triangles:
+        duplicate = next(group_duplicates)
+        if not duplicate.any():
+            filtered_groups.append(group)
+        elif not duplicate.all():
             filtered_groups.append(
                 _MeshGroup(
                     vertices=group.vertices,
-                    triangles=triangles,
+                    triangles=tuple(
+                        triangle
+                        for triangle, is_duplicate in zip(group.triangles, duplicate.tolist())
+                        if not is_duplicate
+                    ),
                     texture=group.texture,
                     display_list_offset=group.display_list_offset,
                 )
@@ -811,21 +1555,42 @@ def _drop_untextured_duplicate_triangles(
     return tuple(filtered_groups)
 
 
-def _triangle_position_key(
-    group: _MeshGroup,
-    triangle: Triangle,
-) -> tuple[tuple[int, int, int], ...]:
-    return tuple(
-        sorted(
-            (
-                group.vertices[vertex_index].x,
-                group.vertices[vertex_index].y,
-                group.vertices[vertex_index].z,
-            )
-            for vertex_index in (triangle.v1, triangle.v2, triangle.v3)
-            if 0 <= vertex_index < len(group.vertices)
-        )
+def _triangle_position_keys(group: _MeshGroup) -> ndarray:
+    """One comparable key per triangle from its sorted corner positions
+
+    Each signed 16-bit position is packed into an int64 that sorts like the
+    (x, y, z) tuple. Out of range corners take a sentinel above every
+    position, so they sort last just as the old tuple key left them out.
+    The three sorted corners are viewed as one 24 byte value per triangle.
+    """
+    vertex_count = len(group.vertices)
+    positions = numpy_fromiter(
+        chain.from_iterable(map(_VERTEX_POSITION, group.vertices)),
+        dtype=numpy_int64,
+        count=vertex_count * 3,
+    ).reshape(-1, 3) + _POSITION_KEY_OFFSET
+    packed = numpy_append(
+        (positions[:, 0] << 32) | (positions[:, 1] << 16) | positions[:, 2],
+        _INVALID_CORNER_KEY,
     )
+    corners = numpy_fromiter(
+        chain.from_iterable(map(_TRIANGLE_CORNERS, group.triangles)),
+        dtype=numpy_int64,
+        count=len(group.triangles) * 3,
+    ).reshape(-1, 3)
+    corners = packed[
+        numpy_where((corners >= 0) & (corners < vertex_count), corners, vertex_count)
+    ]
+
+    # Sorting network for three columns, much cheaper than sorting tiny rows
+    low = numpy_minimum(corners[:, 0], corners[:, 1])
+    high = numpy_maximum(corners[:, 0], corners[:, 1])
+    middle = numpy_minimum(high, corners[:, 2])
+    high = numpy_maximum(high, corners[:, 2])
+    keys = numpy_stack(
+        (numpy_minimum(low, middle), numpy_maximum(low, middle), high), axis=1
+    )
+    return keys.view(numpy_dtype((numpy_void, keys.itemsize * 3))).ravel()
 
 
 def decode_texture(
@@ -914,7 +1679,10 @@ def save_textured_dae_export(
     folder = pathlib.Path(folderpath)
     dae_path = folder / dae_filename
     dae_path.parent.mkdir(parents=True, exist_ok=True)
-    export.dae.write(dae_path)
+    if export._dae is None:
+        export.document.write(dae_path)
+    else:
+        export._dae.write(str(dae_path))
     written_paths = [dae_path]
 
     for image in export.images:
@@ -960,13 +1728,87 @@ def save_textured_glb_export(
     glb_filename: str,
     folderpath: str = ".",
 ) -> list[pathlib.Path]:
+    """Write the GLB and close the export, releasing its spooled buffer"""
     folder = pathlib.Path(folderpath)
     glb_path = folder / glb_filename
     glb_path.parent.mkdir(parents=True, exist_ok=True)
-    glb_path.write_bytes(export.data)
+    with export:
+        export.write(glb_path)
     return [glb_path]
 
 
+def save_textured_glb_tiles(
+    tile_set: TexturedGlbTileSet,
+    manifest_filename: str,
+    folderpath: str = ".",
+) -> list[pathlib.Path]:
+    """Write each tile beside a JSON manifest of their files and bounds
+
+    Tiles go in a folder named after the manifest, e.g. ``map.json`` and
+    ``map/tile_0_0.glb``. Every tile's export is closed, even when writing fails.
+    """
+    try:
+        return save_textured_glb_tile_stream(
+            tile_set.tiles, tile_set.tile_size, manifest_filename, folderpath
+        )
+    finally:
+        tile_set.close()
+
+
+def save_textured_glb_tile_stream(
+    tiles: Iterable[TexturedGlbTile],
+    tile_size: int,
+    manifest_filename: str,
+    folderpath: str = ".",
+) -> list[pathlib.Path]:
+    """Write tiles as they are built, then a JSON manifest of their files and bounds
+
+    Each tile's export is closed once it is written and only its manifest
+    entry is kept, so tiles from iter_glb_tiles hold one binary buffer at a
+    time. A generator of tiles is closed when writing fails.
+    """
+    manifest_path = pathlib.Path(folderpath, manifest_filename)
+    tile_folder = pathlib.PurePath(manifest_filename).stem
+    written_paths = [manifest_path]
+    tile_entries = []
+    try:
+        for tile in tiles:
+            with tile.export:
+                tile_path = manifest_path.parent / tile_folder / tile.filename
+                tile_path.parent.mkdir(parents=True, exist_ok=True)
+                tile.export.write(tile_path)
+            written_paths.append(tile_path)
+            tile_entries.append(tile.manifest_entry(tile_folder))
+    finally:
+        close = getattr(tiles, "close", None)
+        if close is not None:
+            close()
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(
+        json.dumps(_glb_tile_manifest(tile_size, tile_entries), indent=2) + "\n"
+    )
+    return written_paths
+
+
+def _glb_tile_manifest(
+    tile_size: int, tile_entries: list[dict[str, object]]
+) -> dict[str, object]:
+    manifest: dict[str, object] = {
+        "format": TILE_MANIFEST_FORMAT,
+        "tile_size": tile_size,
+        "axes": ["x", "z"],
+        "tiles": tile_entries,
+    }
+    if tile_entries:
+        manifest["min"] = [
+            min(entry["min"][axis] for entry in tile_entries) for axis in range(3)
+        ]
+        manifest["max"] = [
+            max(entry["max"][axis] for entry in tile_entries) for axis in range(3)
+        ]
+    return manifest
+
+
 def _texture_level_filename(
     texture: _TextureKey,
     level: _DecodedTextureLevel,
@@ -986,15 +1828,14 @@ def _alpha_mask_filename(texture: _TextureKey) -> str:
     return f"{texture.material_name}_alpha.png"
 
 
-def _texture_level_has_transparency(level: _DecodedTextureLevel) -> bool:
-    return any(alpha < 255 for alpha in level.rgba[3::4])
+def _texture_palette_size(texture: _TextureKey) -> int | None:
+    if texture.fmt != 2:
+        return None
+    return 16 if texture.size == 0 else 256
 
 
 def _alpha_mask_rgba(source_rgba: bytes) -> bytes:
-    mask = bytearray()
-    for alpha in source_rgba[3::4]:
-        mask.extend((alpha, alpha, alpha, alpha))
-    return bytes(mask)
+    return numpy_repeat(numpy_frombuffer(source_rgba, dtype=numpy_uint8)[3::4], 4).tobytes()
 
 
 def _mtl_texture_map_statement(
@@ -1103,23 +1944,25 @@ def _horizontal_texture_atlas(
 
     frame_width = levels[0].width
     frame_height = levels[0].height
-    atlas_width = frame_width * len(levels)
-    atlas = bytearray(atlas_width * frame_height * 4)
-    for frame_index, level in enumerate(levels):
+    for level in levels:
         if level.width != frame_width or level.height != frame_height:
             raise ValueError("animated texture frames must share one size")
-        for row in range(frame_height):
-            source_start = row * frame_width * 4
-            source_finish = source_start + frame_width * 4
-            dest_start = (row * atlas_width + frame_index * frame_width) * 4
-            atlas[dest_start : dest_start + frame_width * 4] = level.rgba[
-                source_start:source_finish
-            ]
+
+    # Frames sit side by side, so each atlas row is that row of every frame
+    atlas = numpy_concatenate(
+        [
+            numpy_frombuffer(level.rgba, dtype=numpy_uint8).reshape(
+                frame_height, frame_width * 4
+            )
+            for level in levels
+        ],
+        axis=1,
+    )
     return _DecodedTextureLevel(
         level=None,
-        width=atlas_width,
+        width=frame_width * len(levels),
         height=frame_height,
-        rgba=bytes(atlas),
+        rgba=atlas.tobytes(),
     )
 
 
@@ -1159,7 +2002,7 @@ def _dae_animation_blender_script(
             texture_folder,
             _animation_atlas_filename(animation_plan),
         )
-        has_alpha = _texture_level_has_transparency(animation_plan.atlas_level)
+        has_alpha = animation_plan.analysis.has_alpha
         max_frame = max(
             max_frame,
             1 + animation_plan.frame_count * animation_plan.frame_duration,
@@ -1284,238 +2127,347 @@ print(f\"Configured {{len(ANIMATED_TEXTURES)}} animated DK64 texture material(s)
 """
 
 
-def _dae_mesh(
-    groups: tuple[_MeshGroup, ...],
-    texture_plans: tuple[_TextureExportPlan, ...],
-    texture_folder: str,
-    animation_plans_by_texture: Mapping[_TextureKey, _TextureAnimationPlan] | None = None,
-) -> Collada:
-    mesh = Collada()
-    animation_plans_by_texture = animation_plans_by_texture or {}
-    materials_by_symbol = _dae_materials_by_symbol(
-        mesh,
-        texture_plans,
-        texture_folder,
-        animation_plans_by_texture,
+def _write_dae_document(document: "DaeDocument", stream: BinaryIO) -> None:
+    def write(text: str) -> None:
+        stream.write(text.encode("utf-8"))
+
+    animation_plans_by_texture = document.animation_plans_by_texture or {}
+    texture_materials = [
+        _dae_texture_material(
+            texture_plan,
+            document.texture_folder,
+            animation_plans_by_texture.get(texture_plan.texture),
+        )
+        for texture_plan in document.texture_plans
+    ]
+
+    timestamp = datetime.datetime.now().isoformat()
+    write(
+        f'<COLLADA xmlns="{_DAE_NAMESPACE}" version="1.4.1">\n'
+        "  <asset>\n"
+        f"    <created>{timestamp}</created>\n"
+        f"    <modified>{timestamp}</modified>\n"
+        "    <up_axis>Y_UP</up_axis>\n"
+        "  </asset>\n"
+        "  <library_effects>\n"
     )
-    geometry_nodes = list()
+    write(_dae_effect("vertex-effect", "", "<color>1.0 1.0 1.0 1.0</color>"))
+    for texture_material in texture_materials:
+        name = texture_material.name
+        diffuse = f'<texture texture="{name}-sampler" texcoord="TEX0" />'
+        transparent = (
+            f'<texture texture="{name}-alpha-sampler" texcoord="TEX0" />'
+            if texture_material.alpha_path is not None
+            else None
+        )
+        write(
+            _dae_effect(
+                f"{name}-effect", _dae_texture_params(texture_material), diffuse, transparent
+            )
+        )
+    write("  </library_effects>\n")
 
-    for group_index, group in enumerate(groups):
+    geometry_ids = []
+    for group_index, group in enumerate(document.groups):
         if not group.vertices or not group.triangles:
             continue
+        if not geometry_ids:
+            write("  <library_geometries>\n")
+        geometry_ids.append((f"geometry{group_index}", group.texture))
         animation_plan = (
             animation_plans_by_texture.get(group.texture) if group.texture else None
         )
-        geom = _dae_geometry_for_group(mesh, group, group_index, animation_plan)
-        mesh.geometries.append(geom)
-        material_symbol = _dae_material_symbol(group.texture)
-        material_inputs = [("TEX0", "TEXCOORD", "0")] if group.texture else []
-        material_node = scene.MaterialNode(
-            material_symbol,
-            materials_by_symbol[material_symbol],
-            material_inputs,
+        _write_dae_geometry(write, f"geometry{group_index}", group, animation_plan)
+    if geometry_ids:
+        write("  </library_geometries>\n")
+
+    if texture_materials:
+        write("  <library_images>\n")
+        for texture_material in texture_materials:
+            write(_dae_image(texture_material.name, texture_material.color_path))
+            if texture_material.alpha_path is not None:
+                write(_dae_image(f"{texture_material.name}-alpha", texture_material.alpha_path))
+        write("  </library_images>\n")
+
+    write("  <library_materials>\n")
+    for name in ("vertex-material", *(material.name for material in texture_materials)):
+        effect = "vertex-effect" if name == "vertex-material" else f"{name}-effect"
+        write(
+            f'    <material id="{name}" name="{name}">\n'
+            f'      <instance_effect url="#{effect}" />\n'
+            "    </material>\n"
         )
-        geometry_nodes.append(scene.GeometryNode(geom, [material_node]))
-
-    node = scene.Node("node0", children=geometry_nodes)
-    dae_scene = scene.Scene("myscene", [node])
-    mesh.scenes.append(dae_scene)
-    mesh.scene = dae_scene
-    return mesh
+    write("  </library_materials>\n")
+
+    write("  <library_visual_scenes>\n" '    <visual_scene id="myscene">\n')
+    if geometry_ids:
+        write('      <node id="node0" name="node0">\n')
+        for geometry_id, texture in geometry_ids:
+            write(_dae_instance_geometry(geometry_id, texture))
+        write("      </node>\n")
+    else:
+        write('      <node id="node0" name="node0" />\n')
+    write(
+        "    </visual_scene>\n"
+        "  </library_visual_scenes>\n"
+        "  <scene>\n"
+        '    <instance_visual_scene url="#myscene" />\n'
+        "  </scene>\n"
+        "</COLLADA>\n"
+    )
 
 
-def _dae_materials_by_symbol(
-    mesh: Collada,
-    texture_plans: tuple[_TextureExportPlan, ...],
+def _dae_texture_material(
+    texture_plan: _TextureExportPlan,
     texture_folder: str,
-    animation_plans_by_texture: Mapping[_TextureKey, _TextureAnimationPlan],
-) -> dict[str, collada_material.Material]:
-    materials = {"vertex-material": _dae_vertex_material(mesh)}
-    for texture_plan in texture_plans:
-        symbol = texture_plan.texture.material_name
-        materials[symbol] = _dae_texture_material(
-            mesh,
-            texture_plan,
-            texture_folder,
-            animation_plans_by_texture.get(texture_plan.texture),
-        )
-    return materials
+    animation_plan: _TextureAnimationPlan | None,
+) -> _DaeTextureMaterial:
+    texture = texture_plan.texture
+    if animation_plan is not None:
+        texture_filename = _animation_atlas_filename(animation_plan)
+        alpha_filename = _animation_alpha_mask_filename(animation_plan)
+        analysis = animation_plan.analysis
+    else:
+        texture_filename = texture.image_filename
+        alpha_filename = _alpha_mask_filename(texture)
+        analysis = texture_plan.analysis
+
+    alpha_path = None
+    if analysis.has_alpha:
+        alpha_path = _dae_texture_path(texture_folder, alpha_filename)
+    return _DaeTextureMaterial(
+        name=texture.material_name,
+        color_path=_dae_texture_path(texture_folder, texture_filename),
+        alpha_path=alpha_path,
+        wrap_s="CLAMP" if texture.clamp_s else "WRAP",
+        wrap_t="CLAMP" if texture.clamp_t else "WRAP",
+    )
 
 
-def _dae_vertex_material(mesh: Collada) -> collada_material.Material:
-    effect = collada_material.Effect(
-        "vertex-effect",
-        [],
-        "phong",
-        diffuse=(1.0, 1.0, 1.0, 1.0),
-        specular=(0.0, 0.0, 0.0, 1.0),
+def _dae_texture_params(texture_material: _DaeTextureMaterial) -> str:
+    map_names = [texture_material.name]
+    if texture_material.alpha_path is not None:
+        map_names.append(f"{texture_material.name}-alpha")
+    return "".join(
+        f'        <newparam sid="{map_name}-surface">\n'
+        '          <surface type="2D">\n'
+        f"            <init_from>{map_name}-image</init_from>\n"
+        "            <format>A8R8G8B8</format>\n"
+        "          </surface>\n"
+        "        </newparam>\n"
+        f'        <newparam sid="{map_name}-sampler">\n'
+        "          <sampler2D>\n"
+        f"            <source>{map_name}-surface</source>\n"
+        f"            <wrap_s>{texture_material.wrap_s}</wrap_s>\n"
+        f"            <wrap_t>{texture_material.wrap_t}</wrap_t>\n"
+        "          </sampler2D>\n"
+        "        </newparam>\n"
+        for map_name in map_names
     )
-    effect.transparent = None
-    effect.transparency = None
-    mat = collada_material.Material("vertex-material", "vertex-material", effect)
-    mesh.effects.append(effect)
-    mesh.materials.append(mat)
-    return mat
 
 
-def _dae_texture_material(
-    mesh: Collada,
-    texture_plan: _TextureExportPlan,
-    texture_folder: str,
-    animation_plan: _TextureAnimationPlan | None = None,
-) -> collada_material.Material:
-    texture = texture_plan.texture
-    texture_filename = (
-        _animation_atlas_filename(animation_plan)
-        if animation_plan is not None
-        else texture.image_filename
-    )
-    alpha_filename = (
-        _animation_alpha_mask_filename(animation_plan)
-        if animation_plan is not None
-        else _alpha_mask_filename(texture)
-    )
-    transparency_level = (
-        animation_plan.atlas_level
-        if animation_plan is not None
-        else texture_plan.levels[0]
-    )
-    color_map, params = _dae_texture_map(
-        mesh,
-        texture.material_name,
-        _dae_texture_path(texture_folder, texture_filename),
-        texture,
-    )
-    has_transparency = _texture_level_has_transparency(transparency_level)
-    transparent = None
-    transparency = None
-    if has_transparency:
-        alpha_map, alpha_params = _dae_texture_map(
-            mesh,
-            f"{texture.material_name}-alpha",
-            _dae_texture_path(texture_folder, alpha_filename),
-            texture,
+def _dae_effect(effect_id: str, params: str, diffuse: str, transparent: str | None = None) -> str:
+    """A phong effect laid out the way pycollada writes one"""
+    transparency = ""
+    if transparent is not None:
+        transparency = (
+            "            <transparent>\n"
+            f"              {transparent}\n"
+            "            </transparent>\n"
+            "            <transparency>\n"
+            "              <float>1.0</float>\n"
+            "            </transparency>\n"
         )
-        params.extend(alpha_params)
-        transparent = alpha_map
-        transparency = 1.0
-
-    effect = collada_material.Effect(
-        f"{texture.material_name}-effect",
-        params,
-        "phong",
-        diffuse=color_map,
-        specular=(0.0, 0.0, 0.0, 1.0),
-        transparent=transparent,
-        transparency=transparency,
-    )
-    if not has_transparency:
-        # pycollada defaults to writing a transparency value; omit it for
-        # opaque textures so importers do not infer unintended alpha behavior.
-        effect.transparent = None
-        effect.transparency = None
-    mat = collada_material.Material(
-        texture.material_name,
-        texture.material_name,
-        effect,
-    )
-    mesh.effects.append(effect)
-    mesh.materials.append(mat)
-    return mat
-
-
-def _dae_texture_map(
-    mesh: Collada,
-    name: str,
-    path: str,
-    texture: _TextureKey,
-) -> tuple[collada_material.Map, list[object]]:
-    image = collada_material.CImage(f"{name}-image", path)
-    mesh.images.append(image)
-    surface = collada_material.Surface(f"{name}-surface", image)
-    sampler = collada_material.Sampler2D(f"{name}-sampler", surface)
-    _dae_set_sampler_wrap(sampler, texture)
-    return collada_material.Map(sampler, "TEX0"), [surface, sampler]
+    return (
+        f'    <effect id="{effect_id}" name="{effect_id}">\n'
+        "      <profile_COMMON>\n"
+        f"{params}"
+        '        <technique sid="common">\n'
+        "          <phong>\n"
+        "            <emission>\n"
+        "              <color>0.0 0.0 0.0 1.0</color>\n"
+        "            </emission>\n"
+        "            <ambient>\n"
+        "              <color>0.0 0.0 0.0 1.0</color>\n"
+        "            </ambient>\n"
+        "            <diffuse>\n"
+        f"              {diffuse}\n"
+        "            </diffuse>\n"
+        "            <specular>\n"
+        "              <color>0.0 0.0 0.0 1.0</color>\n"
+        "            </specular>\n"
+        "            <shininess>\n"
+        "              <float>0.0</float>\n"
+        "            </shininess>\n"
+        "            <reflective>\n"
+        "              <color>0.0 0.0 0.0 1.0</color>\n"
+        "            </reflective>\n"
+        "            <reflectivity>\n"
+        "              <float>0.0</float>\n"
+        "            </reflectivity>\n"
+        f"{transparency}"
+        "          </phong>\n"
+        "        </technique>\n"
+        "        <extra>\n"
+        '          <technique profile="GOOGLEEARTH">\n'
+        "            <double_sided>0</double_sided>\n"
+        "          </technique>\n"
+        "        </extra>\n"
+        "      </profile_COMMON>\n"
+        "    </effect>\n"
+    )
 
 
-def _dae_set_sampler_wrap(
-    sampler: collada_material.Sampler2D,
-    texture: _TextureKey,
-) -> None:
-    sampler_node = sampler.xmlnode.find(tag("sampler2D"))
-    if sampler_node is None:
-        return
-    sampler_node.append(E.wrap_s("CLAMP" if texture.clamp_s else "WRAP"))
-    sampler_node.append(E.wrap_t("CLAMP" if texture.clamp_t else "WRAP"))
+def _dae_image(name: str, path: str) -> str:
+    return (
+        f'    <image id="{name}-image" name="{name}-image">\n'
+        f"      <init_from>{xml_escape(path)}</init_from>\n"
+        "    </image>\n"
+    )
 
 
-def _dae_texture_path(texture_folder: str, filename: str) -> str:
-    return pathlib.PurePosixPath(texture_folder, filename).as_posix()
+def _dae_instance_geometry(geometry_id: str, texture: _TextureKey | None) -> str:
+    symbol = _dae_material_symbol(texture)
+    if texture is None:
+        instance_material = (
+            f'              <instance_material symbol="{symbol}" target="#{symbol}" />\n'
+        )
+    else:
+        instance_material = (
+            f'              <instance_material symbol="{symbol}" target="#{symbol}">\n'
+            '                <bind_vertex_input semantic="TEX0" input_semantic="TEXCOORD" '
+            'input_set="0" />\n'
+            "              </instance_material>\n"
+        )
+    return (
+        f'        <instance_geometry url="#{geometry_id}">\n'
+        "          <bind_material>\n"
+        "            <technique_common>\n"
+        f"{instance_material}"
+        "            </technique_common>\n"
+        "          </bind_material>\n"
+        "        </instance_geometry>\n"
+    )
 
 
-def _dae_geometry_for_group(
-    mesh: Collada,
+def _write_dae_geometry(
+    write: Callable[[str], None],
+    geometry_id: str,
     group: _MeshGroup,
-    group_index: int,
     animation_plan: _TextureAnimationPlan | None = None,
-) -> collada_geometry.Geometry:
-    geom_id = f"geometry{group_index}"
-    vertices = list()
-    colors = list()
-    texcoords = list()
-    triangles = list()
-
-    for vertex in group.vertices:
-        vertices.extend((vertex.x, vertex.y, vertex.z))
-        colors.extend(
+) -> None:
+    vertices = numpy_array(
+        [
             (
-                vertex.xr / 255,
-                vertex.yg / 255,
-                vertex.zb / 255,
-                vertex.alpha / 255,
+                vertex.x,
+                vertex.y,
+                vertex.z,
+                vertex.xr,
+                vertex.yg,
+                vertex.zb,
+                vertex.alpha,
+                vertex.texture_cord_u,
+                vertex.texture_cord_v,
             )
-        )
-        if group.texture is not None:
-            u, v = _uv_for_vertex(vertex, group.texture)
-            if animation_plan is not None:
-                u /= animation_plan.frame_count
-            texcoords.extend((u, v))
-
-    for tri in group.triangles:
-        triangles.extend((tri.v1, tri.v2, tri.v3))
-
-    src_vertices = source.FloatSource(
-        f"{geom_id}-vertices",
-        numpy_array(vertices),
-        ("X", "Y", "Z"),
+            for vertex in group.vertices
+        ],
+        dtype=numpy_int64,
+    )
+    triangles = numpy_array(
+        [(tri.v1, tri.v2, tri.v3) for tri in group.triangles], dtype=numpy_int64
     )
-    src_colors = source.FloatSource(
-        f"{geom_id}-colors",
-        numpy_array(colors),
-        ("R", "G", "B", "A"),
+
+    write(f'    <geometry id="{geometry_id}" name="{geometry_id}">\n' "      <mesh>\n")
+    _write_dae_source(write, f"{geometry_id}-vertices", vertices[:, 0:3], ("X", "Y", "Z"))
+    _write_dae_source(
+        write, f"{geometry_id}-colors", vertices[:, 3:7] / 255, ("R", "G", "B", "A")
     )
-    sources = [src_vertices, src_colors]
-    input_list = source.InputList()
-    input_list.addInput(0, "VERTEX", f"#{geom_id}-vertices")
-    input_list.addInput(0, "COLOR", f"#{geom_id}-colors")
+    if group.texture is not None:
+        texcoords = _dae_texcoords(vertices[:, 7:9], group.texture)
+        if animation_plan is not None:
+            texcoords[:, 0] /= animation_plan.frame_count
+        _write_dae_source(write, f"{geometry_id}-texcoords", texcoords, ("S", "T"))
 
+    texcoord_input = ""
     if group.texture is not None:
-        src_texcoords = source.FloatSource(
-            f"{geom_id}-texcoords",
-            numpy_array(texcoords),
-            ("S", "T"),
+        texcoord_input = (
+            f'          <input offset="0" semantic="TEXCOORD" source="#{geometry_id}-texcoords" '
+            'set="0" />\n'
         )
-        sources.append(src_texcoords)
-        input_list.addInput(0, "TEXCOORD", f"#{geom_id}-texcoords", set="0")
+    write(
+        f'        <vertices id="{geometry_id}-vertices-vertices">\n'
+        f'          <input semantic="POSITION" source="#{geometry_id}-vertices" />\n'
+        "        </vertices>\n"
+        f'        <triangles count="{len(triangles)}" '
+        f'material="{_dae_material_symbol(group.texture)}">\n'
+        f'          <input offset="0" semantic="VERTEX" '
+        f'source="#{geometry_id}-vertices-vertices" />\n'
+        f"{texcoord_input}"
+        f'          <input offset="0" semantic="COLOR" source="#{geometry_id}-colors" />\n'
+        "          <p>"
+    )
+    _write_dae_numbers(write, triangles, "%d")
+    write("</p>\n" "        </triangles>\n" "      </mesh>\n" "    </geometry>\n")
+
 
-    geom = collada_geometry.Geometry(mesh, geom_id, geom_id, sources)
-    triset = geom.createTriangleSet(
-        numpy_array(triangles),
-        input_list,
-        _dae_material_symbol(group.texture),
+def _dae_texcoords(raw_texcoords: ndarray, texture: _TextureKey) -> ndarray:
+    """Vectorised _uv_for_vertex, giving the same floats"""
+    signed = numpy_where(raw_texcoords & 0x8000, raw_texcoords - 0x10000, raw_texcoords)
+    u = signed[:, 0] / 32 / texture.width
+    v = 1 - (signed[:, 1] / 32 / texture.height)
+    if texture.clamp_s:
+        u = numpy_clip(u, 0.0, 1.0)
+    if texture.clamp_t:
+        v = numpy_clip(v, 0.0, 1.0)
+    return numpy_stack((u, v), axis=1)
+
+
+def _write_dae_source(
+    write: Callable[[str], None],
+    source_id: str,
+    values: ndarray,
+    param_names: tuple[str, ...],
+) -> None:
+    stride = len(param_names)
+    params = "".join(
+        f'              <param type="float" name="{name}" />\n' for name in param_names
+    )
+    write(
+        f'        <source id="{source_id}">\n'
+        f'          <float_array count="{values.size}" id="{source_id}-array">'
     )
-    geom.primitives.append(triset)
-    return geom
+    _write_dae_numbers(write, values, "%.7g")
+    write(
+        "</float_array>\n"
+        "          <technique_common>\n"
+        f'            <accessor count="{values.size // stride}" '
+        f'source="#{source_id}-array" stride="{stride}">\n'
+        f"{params}"
+        "            </accessor>\n"
+        "          </technique_common>\n"
+        "        </source>\n"
+    )
+
+
+def _write_dae_numbers(
+    write: Callable[[str], None],
+    values: ndarray,
+    number_format: str,
+) -> None:
+    """Write space separated numbers, formatting a chunk at a time in one call"""
+    values = values.ravel().tolist()
+    chunk_format = " ".join((number_format,) * _DAE_CHUNK_SIZE)
+    for start in range(0, len(values), _DAE_CHUNK_SIZE):
+        chunk = values[start : start + _DAE_CHUNK_SIZE]
+        if start:
+            write(" ")
+        if len(chunk) < _DAE_CHUNK_SIZE:
+            chunk_format = " ".join((number_format,) * len(chunk))
+        write(chunk_format % tuple(chunk))
+
+
+def _dae_texture_path(texture_folder: str, filename: str) -> str:
+    return pathlib.PurePosixPath(texture_folder, filename).as_posix()
 
 
 def _dae_material_symbol(texture: _TextureKey | None) -> str:
@@ -1524,37 +2476,83 @@ def _dae_material_symbol(texture: _TextureKey | None) -> str:
     return texture.material_name
 
 
+_DAE_NAMESPACE = "http://www.collada.org/2005/11/COLLADASchema"
+# Numbers formatted per call when writing DAE arrays
+_DAE_CHUNK_SIZE = 4096
+
 _GLTF_ARRAY_BUFFER = 34962
 _GLTF_ELEMENT_ARRAY_BUFFER = 34963
 _GLTF_FLOAT = 5126
+_GLTF_SHORT = 5122
+_GLTF_UNSIGNED_BYTE = 5121
 _GLTF_UNSIGNED_SHORT = 5123
 _GLTF_UNSIGNED_INT = 5125
 _GLTF_TRIANGLES = 4
 _GLTF_REPEAT = 10497
 _GLTF_CLAMP_TO_EDGE = 33071
+_GLTF_ALPHA_CUTOFF = 0.5
+
+# Binary buffers larger than this are spooled to disk instead of memory
+_GLTF_SPOOL_MEMORY_BYTES = 1 << 20
+_GLTF_COPY_CHUNK_SIZE = 1 << 20
 
 
 class _GltfBinaryBuilder:
+    """Records buffer views while spooling their payloads to a temporary file
+
+    Payloads are written as each accessor is built, so only one mesh
+    group's data is in memory at a time. Small buffers stay in memory.
+    """
+
     def __init__(self):
-        self.data = bytearray()
+        self.spool = tempfile.SpooledTemporaryFile(max_size=_GLTF_SPOOL_MEMORY_BYTES)
+        self.length = 0
         self.buffer_views: list[dict[str, object]] = []
 
-    def add_view(self, payload: bytes, target: int | None = None) -> int:
-        _pad_bytearray(self.data)
+    @property
+    def padded_length(self) -> int:
+        return self.length + (-self.length % 4)
+
+    def add_view(
+        self,
+        payload: bytes,
+        target: int | None = None,
+        byte_stride: int | None = None,
+    ) -> int:
+        self._pad()
         view = {
             "buffer": 0,
-            "byteOffset": len(self.data),
+            "byteOffset": self.length,
             "byteLength": len(payload),
         }
+        if byte_stride is not None:
+            view["byteStride"] = byte_stride
         if target is not None:
             view["target"] = target
-        self.data.extend(payload)
+        self.spool.write(payload)
+        self.length += len(payload)
         self.buffer_views.append(view)
         return len(self.buffer_views) - 1
 
+    def write(self, target: BinaryIO) -> None:
+        """Copy the padded buffer to target"""
+        self._pad()
+        self.spool.seek(0)
+        shutil.copyfileobj(self.spool, target, _GLTF_COPY_CHUNK_SIZE)
+
     def to_bytes(self) -> bytes:
-        _pad_bytearray(self.data)
-        return bytes(self.data)
+        buffer = io.BytesIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    def close(self) -> None:
+        self.spool.close()
+
+    def _pad(self) -> None:
+        padding = -self.length % 4
+        self.spool.seek(self.length)
+        self.spool.write(b"\x00" * padding)
+        self.length += padding
 
 
 def _gltf_mesh(
@@ -1563,7 +2561,11 @@ def _gltf_mesh(
     binary_filename: str | None,
     texture_folder: str,
     embedded_images: tuple[TextureImageFile, ...],
-) -> tuple[dict[str, object], bytes]:
+    quantize: bool = False,
+    lod_groups: tuple[tuple[_MeshGroup, ...], ...] = (),
+    alpha_mask: bool = False,
+    external_images: tuple[TextureImageFile, ...] = (),
+) -> tuple[dict[str, object], _GltfBinaryBuilder]:
     binary = _GltfBinaryBuilder()
     gltf: dict[str, object] = {
         "asset": {
@@ -1577,70 +2579,125 @@ def _gltf_mesh(
         "meshes": [],
         "materials": [_gltf_vertex_material(blended=False)],
     }
+    if quantize:
+        quantization_extensions = ["KHR_mesh_quantization"]
+        if texture_plans:
+            quantization_extensions.append("KHR_texture_transform")
+        gltf["extensionsUsed"].extend(quantization_extensions)
+        gltf["extensionsRequired"] = quantization_extensions
     material_indices: dict[_GltfMaterialKey, int] = {
         _GltfMaterialKey(None, False): 0
     }
+    # Keys whose materials only differ by name share the first one
+    material_indices_by_content = {_gltf_material_content(gltf["materials"][0]): 0}
     texture_indices = _gltf_add_texture_resources(
         gltf,
         binary,
         texture_plans,
         texture_folder,
         embedded_images,
+        external_images,
     )
     texture_plans_by_texture = {
         texture_plan.texture: texture_plan for texture_plan in texture_plans
     }
 
-    for group_index, group in enumerate(groups):
-        if not group.vertices or not group.triangles:
-            continue
-        material_key = _gltf_material_key(group, texture_plans_by_texture)
-        material_index = material_indices.get(material_key)
-        if material_index is None:
-            material_index = _gltf_add_material(
+    def add_group_nodes(level_groups: tuple[_MeshGroup, ...], name_prefix: str) -> list[int]:
+        node_indices = []
+        for group_index, group in enumerate(level_groups):
+            if not group.vertices or not group.triangles:
+                continue
+            material_key = _gltf_material_key(group, texture_plans_by_texture, alpha_mask)
+            material_index = material_indices.get(material_key)
+            if material_index is None:
+                material = _gltf_material(
+                    material_key,
+                    texture_plans_by_texture,
+                    texture_indices,
+                    quantize,
+                )
+                material_content = _gltf_material_content(material)
+                material_index = material_indices_by_content.get(material_content)
+                if material_index is None:
+                    material_index = _gltf_append(gltf, "materials", material)
+                    material_indices_by_content[material_content] = material_index
+                material_indices[material_key] = material_index
+            mesh_index = _gltf_add_mesh(
                 gltf,
-                material_key,
-                texture_plans_by_texture,
-                texture_indices,
+                binary,
+                group,
+                group_index,
+                material_index,
+                quantize,
+                name_prefix,
             )
-            material_indices[material_key] = material_index
-        mesh_index = _gltf_add_mesh(gltf, binary, group, group_index, material_index)
-        node_index = _gltf_append(
-            gltf,
-            "nodes",
-            {
-                "name": f"mesh_group_{group_index}",
-                "mesh": mesh_index,
-            },
-        )
-        gltf["scenes"][0]["nodes"].append(node_index)
+            node_indices.append(
+                _gltf_append(
+                    gltf,
+                    "nodes",
+                    {
+                        "name": f"{name_prefix}mesh_group_{group_index}",
+                        "mesh": mesh_index,
+                    },
+                )
+            )
+        return node_indices
+
+    if not lod_groups:
+        gltf["scenes"][0]["nodes"].extend(add_group_nodes(groups, ""))
+    else:
+        # MSFT_lod switches between whole maps, so each level gets a root node
+        # and only the full detail root is part of the scene
+        root_indices = [
+            _gltf_append(
+                gltf,
+                "nodes",
+                {
+                    "name": f"lod{level}",
+                    "children": add_group_nodes(level_groups, f"lod{level}_"),
+                },
+            )
+            for level, level_groups in enumerate((groups, *lod_groups))
+        ]
+        gltf["nodes"][root_indices[0]]["extensions"] = {
+            "MSFT_lod": {"ids": root_indices[1:]}
+        }
+        gltf["extensionsUsed"].append("MSFT_lod")
+        gltf["scenes"][0]["nodes"].append(root_indices[0])
 
-    binary_data = binary.to_bytes()
-    gltf["buffers"] = [{"byteLength": len(binary_data)}]
+    gltf["buffers"] = [{"byteLength": binary.padded_length}]
     if binary_filename is not None:
         gltf["buffers"][0]["uri"] = pathlib.PurePosixPath(binary_filename).as_posix()
     if binary.buffer_views:
         gltf["bufferViews"] = binary.buffer_views
-    return gltf, binary_data
+    return gltf, binary
 
 
 def _gltf_material_key(
     group: _MeshGroup,
     texture_plans_by_texture: dict[_TextureKey, _TextureExportPlan],
+    alpha_mask: bool = False,
 ) -> _GltfMaterialKey:
-    texture_has_alpha = False
+    texture_plan = None
     if group.texture is not None:
         texture_plan = texture_plans_by_texture.get(group.texture)
-        texture_has_alpha = bool(
-            texture_plan and _texture_level_has_transparency(texture_plan.levels[0])
-        )
+    texture_has_alpha = bool(texture_plan and texture_plan.analysis.has_alpha)
+    vertex_has_alpha = _mesh_group_has_vertex_transparency(group)
     return _GltfMaterialKey(
         group.texture,
-        texture_has_alpha or _mesh_group_has_vertex_transparency(group),
+        texture_has_alpha or vertex_has_alpha,
+        masked=(
+            alpha_mask
+            and texture_has_alpha
+            and texture_plan.analysis.binary_alpha
+            and not vertex_has_alpha
+        ),
     )
 
 
 def _mesh_group_has_vertex_transparency(group: _MeshGroup) -> bool:
+    if all(vertex.alpha == 255 for vertex in group.vertices):
+        return False
     vertex_indices = {
         vertex_index
         for triangle in group.triangles
@@ -1653,21 +2710,27 @@ def _mesh_group_has_vertex_transparency(group: _MeshGroup) -> bool:
     )
 
 
-def _gltf_add_material(
-    gltf: dict[str, object],
+def _gltf_material(
     material_key: _GltfMaterialKey,
     texture_plans_by_texture: dict[_TextureKey, _TextureExportPlan],
     texture_indices: dict[_TextureKey, int],
-) -> int:
+    quantize: bool = False,
+) -> dict[str, object]:
     if material_key.texture is None:
-        material = _gltf_vertex_material(blended=material_key.blended)
-    else:
-        material = _gltf_texture_material(
-            texture_plans_by_texture[material_key.texture],
-            texture_indices[material_key.texture],
-            blended=material_key.blended,
-        )
-    return _gltf_append(gltf, "materials", material)
+        return _gltf_vertex_material(blended=material_key.blended)
+    return _gltf_texture_material(
+        texture_plans_by_texture[material_key.texture],
+        texture_indices[material_key.texture],
+        blended=material_key.blended,
+        quantize=quantize,
+        masked=material_key.masked,
+    )
+
+
+def _gltf_material_content(material: dict[str, object]) -> str:
+    return json.dumps(
+        {key: value for key, value in material.items() if key != "name"}, sort_keys=True
+    )
 
 
 def _gltf_vertex_material(blended: bool) -> dict[str, object]:
@@ -1692,30 +2755,60 @@ def _gltf_add_texture_resources(
     texture_plans: tuple[_TextureExportPlan, ...],
     texture_folder: str,
     embedded_images: tuple[TextureImageFile, ...],
+    external_images: tuple[TextureImageFile, ...] = (),
 ) -> dict[_TextureKey, int]:
+    """Add the images, samplers and textures the plans need
+
+    Images with the same PNG data, e.g. palettes that decode to the same
+    colours or keys that only differ by clamping, are stored once, as are
+    identical samplers and image/sampler pairs. External images are
+    matched to their PNG data by URI, and every duplicate points at the
+    URI of the first one.
+
+    Returns:
+        dict[_TextureKey, int]: The glTF texture index for each texture key
+    """
     embedded_images_by_name = {
         pathlib.PurePosixPath(image.filename).name: image for image in embedded_images
     }
+    external_images_by_uri = {image.filename: image for image in external_images}
+    image_indices: dict[tuple[str, bytes | str], int] = {}
+    sampler_indices: dict[tuple[int, int], int] = {}
+    gltf_texture_indices: dict[tuple[int, int], int] = {}
     texture_indices = {}
     for texture_plan in texture_plans:
         texture = texture_plan.texture
-        image_index = _gltf_add_image(
-            gltf,
-            binary,
-            texture,
-            texture_folder,
-            embedded_images_by_name,
-        )
-        sampler_index = _gltf_append(gltf, "samplers", _gltf_sampler(texture))
-        texture_index = _gltf_append(
-            gltf,
-            "textures",
-            {
-                "name": texture.material_name,
-                "source": image_index,
-                "sampler": sampler_index,
-            },
-        )
+        uri = _texture_asset_filename(texture_folder, texture.image_filename)
+        embedded_image = embedded_images_by_name.get(texture.image_filename)
+        image_data = external_images_by_uri.get(uri, embedded_image)
+        if image_data is None:
+            image_key = ("uri", uri)
+        else:
+            image_key = ("png", hashlib.sha1(image_data.data).digest())
+        image_index = image_indices.get(image_key)
+        if image_index is None:
+            image_index = _gltf_add_image(gltf, binary, texture, uri, embedded_image)
+            image_indices[image_key] = image_index
+
+        sampler = _gltf_sampler(texture)
+        sampler_key = (sampler["wrapS"], sampler["wrapT"])
+        sampler_index = sampler_indices.get(sampler_key)
+        if sampler_index is None:
+            sampler_index = _gltf_append(gltf, "samplers", sampler)
+            sampler_indices[sampler_key] = sampler_index
+
+        texture_index = gltf_texture_indices.get((image_index, sampler_index))
+        if texture_index is None:
+            texture_index = _gltf_append(
+                gltf,
+                "textures",
+                {
+                    "name": texture.material_name,
+                    "source": image_index,
+                    "sampler": sampler_index,
+                },
+            )
+            gltf_texture_indices[(image_index, sampler_index)] = texture_index
         texture_indices[texture] = texture_index
     return texture_indices
 
@@ -1724,15 +2817,14 @@ def _gltf_add_image(
     gltf: dict[str, object],
     binary: _GltfBinaryBuilder,
     texture: _TextureKey,
-    texture_folder: str,
-    embedded_images_by_name: dict[str, TextureImageFile],
+    uri: str,
+    embedded_image: TextureImageFile | None,
 ) -> int:
     image = {
         "name": texture.material_name,
     }
-    embedded_image = embedded_images_by_name.get(texture.image_filename)
     if embedded_image is None:
-        image["uri"] = _texture_asset_filename(texture_folder, texture.image_filename)
+        image["uri"] = uri
     else:
         image["bufferView"] = binary.add_view(embedded_image.data)
         image["mimeType"] = "image/png"
@@ -1750,9 +2842,11 @@ def _gltf_texture_material(
     texture_plan: _TextureExportPlan,
     texture_index: int,
     blended: bool,
+    quantize: bool = False,
+    masked: bool = False,
 ) -> dict[str, object]:
     name = texture_plan.texture.material_name
-    if blended and not _texture_level_has_transparency(texture_plan.levels[0]):
+    if blended and not texture_plan.analysis.has_alpha:
         name = f"{name}_vertex_alpha"
     material: dict[str, object] = {
         "name": name,
@@ -1767,7 +2861,18 @@ def _gltf_texture_material(
         },
         "extensions": {"KHR_materials_unlit": {}},
     }
-    if blended:
+    if quantize:
+        # Quantised texture coordinates hold the raw s10.5 values scaled to
+        # [-1, 1], the transform scales them back to texture space
+        material["pbrMetallicRoughness"]["baseColorTexture"]["extensions"] = {
+            "KHR_texture_transform": {
+                "scale": list(_gltf_quantized_texcoord_scale(texture_plan.texture)),
+            }
+        }
+    if masked:
+        material["alphaMode"] = "MASK"
+        material["alphaCutoff"] = _GLTF_ALPHA_CUTOFF
+    elif blended:
         material["alphaMode"] = "BLEND"
     return material
 
@@ -1778,13 +2883,24 @@ def _gltf_add_mesh(
     group: _MeshGroup,
     group_index: int,
     material_index: int,
+    quantize: bool = False,
+    name_prefix: str = "",
 ) -> int:
+    if quantize:
+        add_position_accessor = _gltf_add_quantized_position_accessor
+        add_color_accessor = _gltf_add_quantized_color_accessor
+        add_texcoord_accessor = _gltf_add_quantized_texcoord_accessor
+    else:
+        add_position_accessor = _gltf_add_position_accessor
+        add_color_accessor = _gltf_add_color_accessor
+        add_texcoord_accessor = _gltf_add_texcoord_accessor
+
     attributes = {
-        "POSITION": _gltf_add_position_accessor(gltf, binary, group.vertices),
-        "COLOR_0": _gltf_add_color_accessor(gltf, binary, group.vertices),
+        "POSITION": add_position_accessor(gltf, binary, group.vertices),
+        "COLOR_0": add_color_accessor(gltf, binary, group.vertices),
     }
     if group.texture is not None:
-        attributes["TEXCOORD_0"] = _gltf_add_texcoord_accessor(
+        attributes["TEXCOORD_0"] = add_texcoord_accessor(
             gltf,
             binary,
             group.vertices,
@@ -1792,7 +2908,7 @@ def _gltf_add_mesh(
         )
 
     mesh = {
-        "name": f"mesh_group_{group_index}",
+        "name": f"{name_prefix}mesh_group_{group_index}",
         "primitives": [
             {
                 "attributes": attributes,
@@ -1870,6 +2986,107 @@ def _srgb_byte_to_linear_float(value: int) -> float:
     return ((encoded + 0.055) / 1.055) ** 2.4
 
 
+_SRGB_BYTE_TO_LINEAR_BYTE = bytes(
+    round(_srgb_byte_to_linear_float(value) * 255) for value in range(256)
+)
+
+
+def _gltf_add_quantized_position_accessor(
+    gltf: dict[str, object],
+    binary: _GltfBinaryBuilder,
+    vertices: tuple[Vertex, ...],
+) -> int:
+    # DK64 positions already are 16-bit integers, padded to keep each
+    # attribute 4-byte aligned
+    payload = b"".join(
+        struct.pack("<hhhxx", vertex.x, vertex.y, vertex.z) for vertex in vertices
+    )
+    return _gltf_add_accessor(
+        gltf,
+        binary,
+        payload,
+        count=len(vertices),
+        component_type=_GLTF_SHORT,
+        accessor_type="VEC3",
+        target=_GLTF_ARRAY_BUFFER,
+        minimum=[
+            min(vertex.x for vertex in vertices),
+            min(vertex.y for vertex in vertices),
+            min(vertex.z for vertex in vertices),
+        ],
+        maximum=[
+            max(vertex.x for vertex in vertices),
+            max(vertex.y for vertex in vertices),
+            max(vertex.z for vertex in vertices),
+        ],
+        byte_stride=8,
+    )
+
+
+def _gltf_add_quantized_color_accessor(
+    gltf: dict[str, object],
+    binary: _GltfBinaryBuilder,
+    vertices: tuple[Vertex, ...],
+) -> int:
+    payload = bytes(
+        component
+        for vertex in vertices
+        for component in (
+            _SRGB_BYTE_TO_LINEAR_BYTE[vertex.xr],
+            _SRGB_BYTE_TO_LINEAR_BYTE[vertex.yg],
+            _SRGB_BYTE_TO_LINEAR_BYTE[vertex.zb],
+            vertex.alpha,
+        )
+    )
+    return _gltf_add_accessor(
+        gltf,
+        binary,
+        payload,
+        count=len(vertices),
+        component_type=_GLTF_UNSIGNED_BYTE,
+        accessor_type="VEC4",
+        target=_GLTF_ARRAY_BUFFER,
+        normalized=True,
+    )
+
+
+def _gltf_add_quantized_texcoord_accessor(
+    gltf: dict[str, object],
+    binary: _GltfBinaryBuilder,
+    vertices: tuple[Vertex, ...],
+    texture: _TextureKey,
+) -> int:
+    payload = b"".join(
+        struct.pack("<hh", *_gltf_quantized_uv_for_vertex(vertex, texture))
+        for vertex in vertices
+    )
+    return _gltf_add_accessor(
+        gltf,
+        binary,
+        payload,
+        count=len(vertices),
+        component_type=_GLTF_SHORT,
+        accessor_type="VEC2",
+        target=_GLTF_ARRAY_BUFFER,
+        normalized=True,
+    )
+
+
+def _gltf_quantized_uv_for_vertex(vertex: Vertex, texture: _TextureKey) -> tuple[int, int]:
+    u = _signed_16(vertex.texture_cord_u)
+    v = _signed_16(vertex.texture_cord_v)
+    # Clamping the raw s10.5 value to [0, 32 * size] matches clamping the UV to [0, 1]
+    if texture.clamp_s:
+        u = max(0, min(32 * texture.width, u))
+    if texture.clamp_t:
+        v = max(0, min(32 * texture.height, v))
+    return u, v
+
+
+def _gltf_quantized_texcoord_scale(texture: _TextureKey) -> tuple[float, float]:
+    return 32767 / (32 * texture.width), 32767 / (32 * texture.height)
+
+
 def _gltf_add_texcoord_accessor(
     gltf: dict[str, object],
     binary: _GltfBinaryBuilder,
@@ -1927,14 +3144,18 @@ def _gltf_add_accessor(
     target: int,
     minimum: list[float | int] | None = None,
     maximum: list[float | int] | None = None,
+    normalized: bool = False,
+    byte_stride: int | None = None,
 ) -> int:
     accessor = {
-        "bufferView": binary.add_view(payload, target),
+        "bufferView": binary.add_view(payload, target, byte_stride),
         "byteOffset": 0,
         "componentType": component_type,
         "count": count,
         "type": accessor_type,
     }
+    if normalized:
+        accessor["normalized"] = True
     if minimum is not None:
         accessor["min"] = minimum
     if maximum is not None:
@@ -1952,25 +3173,6 @@ def _gltf_json(gltf: dict[str, object]) -> str:
     return json.dumps(gltf, indent=2) + "\n"
 
 
-def _glb_data(gltf: dict[str, object], binary_data: bytes) -> bytes:
-    json_chunk = _pad_bytes(_gltf_json(gltf).encode("utf-8"), b" ")
-    bin_chunk = _pad_bytes(binary_data, b"\x00")
-    total_length = 12 + 8 + len(json_chunk) + 8 + len(bin_chunk)
-    return b"".join(
-        (
-            struct.pack("<III", 0x46546C67, 2, total_length),
-            struct.pack("<I4s", len(json_chunk), b"JSON"),
-            json_chunk,
-            struct.pack("<I4s", len(bin_chunk), b"BIN\x00"),
-            bin_chunk,
-        )
-    )
-
-
-def _pad_bytearray(data: bytearray) -> None:
-    data.extend(b"\x00" * (-len(data) % 4))
-
-
 def _pad_bytes(data: bytes, padding: bytes) -> bytes:
     return data + (padding * (-len(data) % 4))
 
@@ -3018,30 +4220,16 @@ def _slice_sparse_paired_rows_rgba(
     swap_second_row_group_pixels: int | None = None,
 ) -> bytes:
     output_row_size = output_width * 4
-    source_group_size = source_group_pixels * 4
-    skipped_size = skipped_pixels * 4
-    source_start = start_pixel * 4
-    paired = bytearray()
-
-    for row_pair in range(math.ceil(output_height / 2)):
-        group_start = source_start + (row_pair * source_group_size)
-        first_row = source_rgba[group_start : group_start + output_row_size]
-        second_row_start = group_start + output_row_size + skipped_size
-        second_row = source_rgba[
-            second_row_start : second_row_start + output_row_size
-        ]
-        paired.extend((first_row + b"\x00" * output_row_size)[:output_row_size])
-        if (row_pair * 2) + 1 < output_height:
-            second_row = (second_row + b"\x00" * output_row_size)[:output_row_size]
-            if swap_second_row_group_pixels:
-                second_row = _swap_pixel_group_halves_rgba(
-                    second_row,
-                    swap_second_row_group_pixels,
-                )
-            paired.extend(second_row)
-
-    expected = output_width * output_height * 4
-    return bytes(paired[:expected])
+    output_rows = numpy_arange(output_height)
+    row_starts = (
+        start_pixel * 4
+        + (output_rows // 2) * (source_group_pixels * 4)
+        + (output_rows % 2) * (output_row_size + skipped_pixels * 4)
+    )
+    rows = _gather_rows_rgba(source_rgba, row_starts, output_row_size)
+    if swap_second_row_group_pixels:
+        rows[1::2] = _swap_pixel_group_halves(rows[1::2], swap_second_row_group_pixels)
+    return rows.tobytes()
 
 
 def _slice_segmented_rows_rgba(
@@ -3053,28 +4241,18 @@ def _slice_segmented_rows_rgba(
     swap_group_pixels: int,
 ) -> bytes:
     output_row_size = output_width * 4
-    source_group_size = source_group_pixels * 4
     rows_per_group = max(1, source_group_pixels // output_width)
-    source_start = start_pixel * 4
-    segmented = bytearray()
-
-    for output_row in range(output_height):
-        group_index = output_row // rows_per_group
-        row_in_group = output_row % rows_per_group
-        row_start = (
-            source_start
-            + (group_index * source_group_size)
-            + (row_in_group * output_row_size)
-        )
-        row_rgba = (
-            source_rgba[row_start : row_start + output_row_size]
-            + b"\x00" * output_row_size
-        )[:output_row_size]
-        if row_in_group % 2:
-            row_rgba = _swap_pixel_group_halves_rgba(row_rgba, swap_group_pixels)
-        segmented.extend(row_rgba)
-
-    return bytes(segmented)
+    output_rows = numpy_arange(output_height)
+    rows_in_group = output_rows % rows_per_group
+    row_starts = (
+        start_pixel * 4
+        + (output_rows // rows_per_group) * (source_group_pixels * 4)
+        + rows_in_group * output_row_size
+    )
+    rows = _gather_rows_rgba(source_rgba, row_starts, output_row_size)
+    odd_rows = rows_in_group % 2 == 1
+    rows[odd_rows] = _swap_pixel_group_halves(rows[odd_rows], swap_group_pixels)
+    return rows.tobytes()
 
 
 def _slice_offset_rows_rgba(
@@ -3085,28 +4263,14 @@ def _slice_offset_rows_rgba(
     source_group_pixels: int,
     row_offsets: tuple[int, ...],
 ) -> bytes:
-    output_row_size = output_width * 4
-    source_group_size = source_group_pixels * 4
-    source_start = start_pixel * 4
     rows_per_group = max(1, len(row_offsets))
-    rows = bytearray()
-
-    for output_row in range(output_height):
-        group_index = output_row // rows_per_group
-        row_in_group = output_row % rows_per_group
-        row_start = (
-            source_start
-            + (group_index * source_group_size)
-            + (row_offsets[row_in_group] * 4)
-        )
-        rows.extend(
-            (
-                source_rgba[row_start : row_start + output_row_size]
-                + b"\x00" * output_row_size
-            )[:output_row_size]
-        )
-
-    return bytes(rows)
+    output_rows = numpy_arange(output_height)
+    row_starts = (
+        start_pixel * 4
+        + (output_rows // rows_per_group) * (source_group_pixels * 4)
+        + numpy_array(row_offsets, dtype=numpy_int64)[output_rows % rows_per_group] * 4
+    )
+    return _gather_rows_rgba(source_rgba, row_starts, output_width * 4).tobytes()
 
 
 def _stitch_rows_rgba(
@@ -3116,15 +4280,11 @@ def _stitch_rows_rgba(
     target_height: int,
     start_row: int,
 ) -> bytes:
-    source_row_size = source_width * 4
-    target_row_size = target_width * 4
-    mip_rgba = bytearray()
-    for mip_row in range(target_height):
-        source_row_start = (start_row + (mip_row * 2)) * source_row_size
-        mip_rgba.extend(
-            source_rgba[source_row_start : source_row_start + target_row_size]
-        )
-    return bytes(mip_rgba)
+    # Rows running past the end of the source are cut short, not padded
+    row_starts = (start_row + numpy_arange(target_height) * 2) * (source_width * 4)
+    indices = (row_starts[:, None] + numpy_arange(target_width * 4)).ravel()
+    source = numpy_frombuffer(source_rgba, dtype=numpy_uint8)
+    return source[indices[indices < len(source)]].tobytes()
 
 
 def _stitch_alternating_swapped_rows_rgba(
@@ -3132,19 +4292,11 @@ def _stitch_alternating_swapped_rows_rgba(
     source_width: int,
     target_height: int,
 ) -> bytes:
-    row_size = source_width * 4
-    mip_rgba = bytearray()
-    for mip_row in range(target_height):
-        source_row_start = mip_row * row_size
-        source_row = source_rgba[source_row_start : source_row_start + row_size]
-        if mip_row % 2:
-            source_row = _swap_four_pixel_groups_rgba(source_row)
-        mip_rgba.extend(source_row)
-    return bytes(mip_rgba)
-
-
-def _swap_four_pixel_groups_rgba(row_rgba: bytes) -> bytes:
-    return _swap_pixel_group_halves_rgba(row_rgba, group_pixels=4)
+    return _swap_odd_rows_rgba(
+        source_rgba[: source_width * 4 * target_height],
+        source_width,
+        group_pixels=4,
+    )
 
 
 def _swap_odd_rows_rgba(
@@ -3156,28 +4308,42 @@ def _swap_odd_rows_rgba(
     if row_size <= 0:
         return source_rgba
 
-    swapped = bytearray()
-    for row_start in range(0, len(source_rgba), row_size):
-        row_index = row_start // row_size
-        row_rgba = source_rgba[row_start : row_start + row_size]
-        if row_index % 2:
-            row_rgba = _swap_pixel_group_halves_rgba(row_rgba, group_pixels)
-        swapped.extend(row_rgba)
-    return bytes(swapped)
+    full_rows = len(source_rgba) // row_size
+    rows = numpy_frombuffer(source_rgba, dtype=numpy_uint8, count=full_rows * row_size)
+    rows = rows.reshape(full_rows, row_size).copy()
+    rows[1::2] = _swap_pixel_group_halves(rows[1::2], group_pixels)
+    partial_row = source_rgba[full_rows * row_size :]
+    if partial_row and full_rows % 2:
+        partial_row = _swap_pixel_group_halves_rgba(partial_row, group_pixels)
+    return rows.tobytes() + partial_row
 
 
 def _swap_pixel_group_halves_rgba(row_rgba: bytes, group_pixels: int) -> bytes:
+    row = numpy_frombuffer(row_rgba, dtype=numpy_uint8).reshape(1, -1)
+    return _swap_pixel_group_halves(row, group_pixels).tobytes()
+
+
+def _swap_pixel_group_halves(rows: ndarray, group_pixels: int) -> ndarray:
+    """Swap the halves of each whole group of pixels along every row
+
+    A group cut short by the end of the row is left as it is.
+    """
     group_size = group_pixels * 4
     half_group_size = group_size // 2
-    swapped = bytearray()
-    for offset in range(0, len(row_rgba), group_size):
-        group = row_rgba[offset : offset + group_size]
-        if len(group) == group_size:
-            swapped.extend(group[half_group_size:])
-            swapped.extend(group[:half_group_size])
-        else:
-            swapped.extend(group)
-    return bytes(swapped)
+    full_size = rows.shape[1] // group_size * group_size
+    swapped = rows.copy()
+    groups = rows[:, :full_size].reshape(len(rows), full_size // group_size, group_size)
+    swapped[:, :full_size] = numpy_concatenate(
+        (groups[:, :, half_group_size:], groups[:, :, :half_group_size]), axis=2
+    ).reshape(len(rows), full_size)
+    return swapped
+
+
+def _gather_rows_rgba(source_rgba: bytes, row_starts: ndarray, row_size: int) -> ndarray:
+    """Copy row_size bytes from each row start, zero filled past the end of the source"""
+    source = numpy_frombuffer(source_rgba + b"\x00", dtype=numpy_uint8)
+    indices = numpy_minimum(row_starts[:, None] + numpy_arange(row_size), len(source_rgba))
+    return source[indices]
 
 
 def _vertices_for_command(display_list: object, command: commands.G_VTX) -> list[Vertex]:
@@ -3191,16 +4357,7 @@ def _vertices_for_command(display_list: object, command: commands.G_VTX) -> list
         vertex_buffer_end = vertex_buffer_start + command.vertex_count * 16
         vertex_data = display_list.raw_vertex_data[vertex_buffer_start:vertex_buffer_end]
 
-    return [
-        Vertex.from_bytes(vertex_data[index : index + 16])
-        for index in range(0, len(vertex_data), 16)
-    ]
-
-
-def _tile_dimensions(command: commands.G_SETTILESIZE) -> tuple[int, int]:
-    width = max(1, abs(command.lrs - command.uls) // 4 + 1)
-    height = max(1, abs(command.lrt - command.ult) // 4 + 1)
-    return width, height
+    return Vertex.from_table(vertex_data)
 
 
 def _uv_for_vertex(vertex: Vertex, texture: _TextureKey) -> tuple[float, float]:
@@ -0,0 +1,210 @@
+from dataclasses import dataclass
+
+from dk64_lib.f3dex2 import commands
+
+
+@dataclass(frozen=True, slots=True)
+class _ImageSource:
+    index: int
+    fmt: int
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class _TileDescriptor:
+    fmt: int
+    size: int
+    line: int
+    tmem: int
+    palette: int
+    clamp_s: bool
+    clamp_t: bool
+
+
+@dataclass(frozen=True, slots=True)
+class _TextureKey:
+    image_index: int
+    palette_index: int | None
+    fmt: int
+    size: int
+    width: int
+    height: int
+    clamp_s: bool = False
+    clamp_t: bool = False
+
+    @property
+    def material_name(self) -> str:
+        palette = "none" if self.palette_index is None else str(self.palette_index)
+        name = (
+            f"tex_{self.image_index}_pal_{palette}_"
+            f"f{self.fmt}_s{self.size}_{self.width}x{self.height}"
+        )
+        if self.clamp_s and self.clamp_t:
+            return f"{name}_clamp_st"
+        if self.clamp_s:
+            return f"{name}_clamp_s"
+        if self.clamp_t:
+            return f"{name}_clamp_t"
+        return name
+
+    @property
+    def image_filename(self) -> str:
+        return f"{self.material_name}.png"
+
+
+# Marks an active texture that has to be worked out again
+_STALE = object()
+
+
+class _TextureState:
+    """Tracks the RDP texture state a display list sets up
+
+    The active texture is only rebuilt after a command that can change it.
+    Clones share their tile tables with the original until either side
+    writes to them.
+    """
+
+    __slots__ = (
+        "_pending_image",
+        "_loaded_images",
+        "_tile_descriptors",
+        "_tile_sizes",
+        "_last_loaded_tile",
+        "_last_palette",
+        "_active_tile",
+        "_active_texture",
+        "_shared",
+    )
+
+    def __init__(self):
+        self._pending_image: _ImageSource | None = None
+        self._loaded_images: dict[int, _ImageSource] = {}
+        self._tile_descriptors: dict[int, _TileDescriptor] = {}
+        self._tile_sizes: dict[int, tuple[int, int]] = {}
+        self._last_loaded_tile: int | None = None
+        self._last_palette: _ImageSource | None = None
+        self._active_tile: int | None = None
+        self._active_texture: _TextureKey | None | object = None
+        self._shared = False
+
+    def clone(self) -> "_TextureState":
+        state = _TextureState.__new__(_TextureState)
+        state._pending_image = self._pending_image
+        state._loaded_images = self._loaded_images
+        state._tile_descriptors = self._tile_descriptors
+        state._tile_sizes = self._tile_sizes
+        state._last_loaded_tile = self._last_loaded_tile
+        state._last_palette = self._last_palette
+        state._active_tile = self._active_tile
+        state._active_texture = self._active_texture
+        state._shared = self._shared = True
+        return state
+
+    def _unshare(self) -> None:
+        if self._shared:
+            self._loaded_images = dict(self._loaded_images)
+            self._tile_descriptors = dict(self._tile_descriptors)
+            self._tile_sizes = dict(self._tile_sizes)
+            self._shared = False
+
+    def apply(self, command: commands.DL_Command) -> None:
+        handler = _STATE_COMMANDS.get(command.opcode)
+        if handler is not None:
+            handler(self, command)
+
+    def _set_texture_image(self, command: commands.G_SETTIMG) -> None:
+        self._pending_image = _ImageSource(
+            index=command.address,
+            fmt=command.fmt,
+            size=command.size,
+        )
+
+    def _load_texture(self, command: commands.G_LOADBLOCK | commands.G_LOADTILE) -> None:
+        if self._pending_image is not None:
+            self._unshare()
+            self._loaded_images[command.tile] = self._pending_image
+            self._last_loaded_tile = command.tile
+            self._active_texture = _STALE
+
+    def _load_palette(self, command: commands.G_LOADTLUT) -> None:
+        if self._pending_image is not None:
+            self._last_palette = self._pending_image
+            self._active_texture = _STALE
+
+    def _set_tile(self, command: commands.G_SETTILE) -> None:
+        self._unshare()
+        self._tile_descriptors[command.tile] = _TileDescriptor(
+            fmt=command.fmt,
+            size=command.size,
+            line=command.line,
+            tmem=command.tmem,
+            palette=command.palette,
+            clamp_s=bool(command.cm_s & 0x2),
+            clamp_t=bool(command.cm_t & 0x2),
+        )
+        self._active_texture = _STALE
+
+    def _set_tile_size(self, command: commands.G_SETTILESIZE) -> None:
+        self._unshare()
+        if self._active_tile is None:
+            self._active_tile = command.tile
+        self._tile_sizes[command.tile] = _tile_dimensions(command)
+        self._active_texture = _STALE
+
+    def _set_texture(self, command: commands.G_TEXTURE) -> None:
+        self._active_tile = command.tile if command.on else None
+        self._active_texture = _STALE
+
+    @property
+    def active_texture(self) -> _TextureKey | None:
+        if self._active_texture is _STALE:
+            self._active_texture = self._resolve_active_texture()
+        return self._active_texture
+
+    def _resolve_active_texture(self) -> _TextureKey | None:
+        if self._active_tile is None:
+            return None
+
+        descriptor = self._tile_descriptors.get(self._active_tile)
+        dimensions = self._tile_sizes.get(self._active_tile)
+        if descriptor is None or dimensions is None:
+            return None
+
+        source = self._loaded_images.get(self._active_tile)
+        if source is None and self._last_loaded_tile is not None:
+            source = self._loaded_images.get(self._last_loaded_tile)
+        if source is None:
+            return None
+
+        palette_index = None
+        if descriptor.fmt == 2 and self._last_palette is not None:
+            palette_index = self._last_palette.index
+
+        return _TextureKey(
+            image_index=source.index,
+            palette_index=palette_index,
+            fmt=descriptor.fmt,
+            size=descriptor.size,
+            width=dimensions[0],
+            height=dimensions[1],
+            clamp_s=descriptor.clamp_s,
+            clamp_t=descriptor.clamp_t,
+        )
+
+
+# Texture state changes, indexed by opcode. Every other command leaves the state alone.
+_STATE_COMMANDS = {
+    b"\xFD": _TextureState._set_texture_image,
+    b"\xF3": _TextureState._load_texture,
+    b"\xF4": _TextureState._load_texture,
+    b"\xF0": _TextureState._load_palette,
+    b"\xF5": _TextureState._set_tile,
+    b"\xF2": _TextureState._set_tile_size,
+    b"\xD7": _TextureState._set_texture,
+}
+
+
+def _tile_dimensions(command: commands.G_SETTILESIZE) -> tuple[int, int]:
+    width = max(1, abs(command.lrs - command.uls) // 4 + 1)
+    height = max(1, abs(command.lrt - command.ult) // 4 + 1)
+    return width, height
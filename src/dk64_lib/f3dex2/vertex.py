@@ -1,6 +1,22 @@
 from dataclasses import dataclass
 
-from dk64_lib.binary_reader import BinaryReader
+from dk64_lib.binary_reader import RecordLayout
+
+
+VERTEX_LAYOUT = RecordLayout(
+    (
+        ("x", "h"),
+        ("y", "h"),
+        ("z", "h"),
+        ("unk", "H"),
+        ("texture_cord_u", "H"),
+        ("texture_cord_v", "H"),
+        ("xr", "B"),
+        ("yg", "B"),
+        ("zb", "B"),
+        ("alpha", "B"),
+    )
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,19 +34,24 @@ class Vertex:
 
     @classmethod
     def from_bytes(cls, vertex_data: bytes) -> "Vertex":
-        reader = BinaryReader(vertex_data)
-        return cls(
-            x=reader.read_i16(0),
-            y=reader.read_i16(2),
-            z=reader.read_i16(4),
-            unk=reader.read_u16(6),
-            texture_cord_u=reader.read_u16(8),
-            texture_cord_v=reader.read_u16(10),
-            xr=reader.read_u8(12),
-            yg=reader.read_u8(13),
-            zb=reader.read_u8(14),
-            alpha=reader.read_u8(15),
-        )
+        return cls(*VERTEX_LAYOUT.unpack(vertex_data))
+
+    @classmethod
+    def from_table(cls, vertex_data: bytes, count: int | None = None) -> list["Vertex"]:
+        """Decode consecutive 16 byte vertices
+
+        Args:
+            vertex_data (bytes): Data starting at the first vertex
+            count (int | None, optional): Number of vertices. Defaults to None (all of vertex_data).
+
+        Returns:
+            list[Vertex]: The decoded vertices
+        """
+        if count is None:
+            records = VERTEX_LAYOUT.unpack_all(vertex_data)
+        else:
+            records = VERTEX_LAYOUT.iter_unpack(vertex_data, count)
+        return [cls(*fields) for fields in records]
 
     def __repr__(self):
         return f"{self.__class__.__qualname__}({self.x}, {self.y}, {self.z})"
@@ -0,0 +1,189 @@
+import json
+import mmap
+import os
+import struct
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable
+
+import dk64_lib
+from dk64_lib.f3dex2.texture_export import DecodedMesh, _DecodedMeshGroup
+from dk64_lib.f3dex2.texture_state import _TextureKey
+
+
+MESH_CACHE_FORMAT = 1
+
+# File layout: magic, header length, JSON header, padding to a 16 byte
+# boundary, vertex records, then triangle indices
+_MAGIC = b"DK64MESH"
+_PREFIX = struct.Struct("<8sI")
+_ALIGNMENT = 16
+# Hex digits of the ROM's SHA-1 naming its cache folder
+_SHA1_PREFIX_LENGTH = 16
+
+
+class MeshCache:
+    def __init__(
+        self,
+        directory: str | Path,
+        rom_sha1: str,
+        library_version: str = dk64_lib.__version__,
+    ):
+        """Decoded geometry meshes persisted as memory-mappable files
+
+        Each file holds one geometry's mesh groups. Files are kept in a
+        folder per ROM, named after the start of its SHA-1, so several ROMs
+        can share a directory. A file is only used when it was written for
+        the same ROM data and library version, so a stale file is treated as
+        a miss and rewritten.
+
+        Args:
+            directory (str | Path): Folder holding the cache files
+            rom_sha1 (str): SHA-1 of the ROM the meshes are decoded from
+            library_version (str, optional): Version of dk64_lib that decoded the meshes. Defaults to the installed version.
+        """
+        self.directory = Path(directory)
+        self.rom_sha1 = rom_sha1
+        self.library_version = library_version
+
+    def __repr__(self) -> str:
+        return f"MeshCache({str(self.directory)!r}, {self.rom_sha1=})"
+
+    @property
+    def rom_directory(self) -> Path:
+        """The folder holding this ROM's cache files"""
+        return self.directory / self.rom_sha1[:_SHA1_PREFIX_LENGTH]
+
+    def path_for(self, key: int) -> Path:
+        """The cache file for a geometry, keyed by its pointer table offset"""
+        return self.rom_directory / f"{key:08x}.mesh"
+
+    def get(self, key: int, decode: Callable[[], DecodedMesh]) -> DecodedMesh:
+        """Load a cached mesh, or decode and persist it on a miss
+
+        Args:
+            key (int): The geometry's pointer table offset
+            decode (Callable[[], DecodedMesh]): Decodes the mesh when it is not cached
+
+        Returns:
+            DecodedMesh: The geometry's mesh
+        """
+        decoded_mesh = self.load(key)
+        if decoded_mesh is None:
+            decoded_mesh = decode()
+            self.save(key, decoded_mesh)
+        return decoded_mesh
+
+    def load(self, key: int) -> DecodedMesh | None:
+        """Memory-map a cached mesh
+
+        Call close on the mesh to release the mapping.
+
+        Returns:
+            DecodedMesh | None: The mesh, or None when there is no usable cache file
+        """
+        try:
+            with open(self.path_for(key), "rb") as cache_file:
+                mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            header, data_start = _read_header(mapped)
+        except ValueError:
+            mapped.close()
+            return None
+        index_start = data_start + header.get("vertex_bytes", 0)
+        index_end = index_start + header.get("index_bytes", 0)
+        if (
+            header.get("format") != MESH_CACHE_FORMAT
+            or header.get("rom_sha1") != self.rom_sha1
+            or header.get("library_version") != self.library_version
+            or index_end > len(mapped)
+        ):
+            mapped.close()
+            return None
+
+        data = memoryview(mapped)
+        return DecodedMesh(
+            tuple(
+                _DecodedMeshGroup(
+                    texture=None if texture is None else _TextureKey(**texture),
+                    display_list_offset=display_list_offset,
+                    vertex_count=vertex_count,
+                    triangle_count=triangle_count,
+                )
+                for display_list_offset, vertex_count, triangle_count, texture in header[
+                    "groups"
+                ]
+            ),
+            data[data_start:index_start],
+            data[index_start:index_end],
+            mapped,
+        )
+
+    def save(self, key: int, decoded_mesh: DecodedMesh) -> Path:
+        """Write a mesh to the cache, replacing any older file
+
+        Args:
+            key (int): The geometry's pointer table offset
+            decoded_mesh (DecodedMesh): The mesh to persist
+
+        Returns:
+            Path: The written file
+        """
+        header = json.dumps(
+            {
+                "format": MESH_CACHE_FORMAT,
+                "rom_sha1": self.rom_sha1,
+                "library_version": self.library_version,
+                "vertex_bytes": len(decoded_mesh.vertex_data),
+                "index_bytes": len(decoded_mesh.index_data),
+                "groups": [
+                    [
+                        group.display_list_offset,
+                        group.vertex_count,
+                        group.triangle_count,
+                        None if group.texture is None else asdict(group.texture),
+                    ]
+                    for group in decoded_mesh.group_headers
+                ],
+            },
+            separators=(",", ":"),
+        ).encode()
+        padding = -(_PREFIX.size + len(header)) % _ALIGNMENT
+
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written beside the target and swapped in, so readers never map a partial file
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(_PREFIX.pack(_MAGIC, len(header)))
+            cache_file.write(header + b" " * padding)
+            cache_file.write(decoded_mesh.vertex_data)
+            cache_file.write(decoded_mesh.index_data)
+        os.replace(temporary_path, path)
+        return path
+
+    def clear(self):
+        """Delete this ROM's cache files, other ROMs' files in the directory are kept"""
+        for path in self.rom_directory.glob("*.mesh"):
+            path.unlink(missing_ok=True)
+        try:
+            self.rom_directory.rmdir()
+        except OSError:
+            pass
+
+
+def _read_header(mapped: mmap.mmap) -> tuple[dict, int]:
+    if len(mapped) < _PREFIX.size:
+        raise ValueError("mesh cache file is truncated")
+    magic, header_size = _PREFIX.unpack_from(mapped)
+    if magic != _MAGIC:
+        raise ValueError("not a mesh cache file")
+    header_end = _PREFIX.size + header_size
+    if header_end > len(mapped):
+        raise ValueError("mesh cache file is truncated")
+    header = json.loads(mapped[_PREFIX.size : header_end])
+    return header, header_end + (-header_end % _ALIGNMENT)
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Hashable
+
+
+DEFAULT_PAYLOAD_CACHE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+class PayloadCache:
+    def __init__(self, max_bytes: int = DEFAULT_PAYLOAD_CACHE_BYTES):
+        """A least recently used cache of decompressed table entries, bounded by size
+
+        Args:
+            max_bytes (int, optional): Total payload size to keep. Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self._payloads: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Return a cached payload and mark it as recently used, or None on a miss"""
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._payloads.move_to_end(key)
+            return payload
+
+    def put(self, key: Hashable, payload: bytes):
+        """Cache a payload, evicting the least recently used ones to stay in budget
+
+        Payloads larger than the whole budget are not cached.
+        """
+        with self._lock:
+            previous = self._payloads.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= len(previous)
+            if len(payload) > self.max_bytes:
+                return
+            self._payloads[key] = payload
+            self._current_bytes += len(payload)
+            while self._current_bytes > self.max_bytes:
+                _, evicted = self._payloads.popitem(last=False)
+                self._current_bytes -= len(evicted)
+
+    def clear(self):
+        """Drop every cached payload and reset the hit/miss counters"""
+        with self._lock:
+            self._payloads.clear()
+            self._current_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._payloads),
+                current_bytes=self._current_bytes,
+                max_bytes=self.max_bytes,
+            )
@@ -1,12 +1,13 @@
+import hashlib
 import zlib
 
 from dataclasses import dataclass
 from pathlib import Path
 from tempfile import TemporaryFile
-from functools import cache, cached_property
+from functools import cached_property, wraps
 from re import sub
 
-from typing import Literal, Generator
+from typing import TYPE_CHECKING, Callable, Literal, Generator, Sequence, TypeVar
 
 from dk64_lib.data_types import (
     ActorGeometryData,
@@ -32,17 +33,20 @@ from dk64_lib.data_types import (
     TriggerData,
     UnknownTable19Data,
     UncompressedFileSizeData,
+    WallCollisionData,
 )
 from dk64_lib.data_types.table_stubs import STUB_TABLE_DATA_TYPES
-from dk64_lib.f3dex2.texture_export import (
-    TextureAnimationFrames,
-    TextureImageFile,
-    TexturedObjExporter,
-    decode_texture,
-    rgba_to_png,
-)
 from dk64_lib.constants import MAPS
 from dk64_lib.file_io import get_bytes, get_char, get_long, get_short
+from dk64_lib.payload_cache import CacheInfo, DEFAULT_PAYLOAD_CACHE_BYTES, PayloadCache
+from dk64_lib.rom_verify import RomVerification, verify_rom
+from dk64_lib.text_index import TextIndex
+
+# Exporter modules are imported on first use, see docs/repository-guide.rst
+if TYPE_CHECKING:
+    from dk64_lib.f3dex2.texture_batch import TextureImageJob
+    from dk64_lib.f3dex2.texture_export import TextureAnimationFrames, TextureImageFile
+    from dk64_lib.mesh_cache import MeshCache
 
 
 RAW_EXPORT_TABLES = (
@@ -73,7 +77,8 @@ RAW_EXPORT_TABLES = (
     26,
 )
 GUESSED_TEXTURE_TABLES = (7, 14, 25)
-# Size guesses adapted from dk64-hacking-scripts' texture_size_guesser.py.
+# Size guesses adapted from dk64-hacking-scripts' texture_size_guesser.py, used
+# as priors by the texture classifier.
 TEXTURE_SIZE_GUESSES = {
     0x1000: (32, 64),
     0x800: (32, 32),
@@ -83,6 +88,33 @@ TEXTURE_SIZE_GUESSES = {
 }
 
 
+# Cached properties holding parsed tables, dropped by Rom.clear_caches()
+_TABLE_PROPERTIES = ("text_tables", "text_index", "geometry_tables")
+
+_Method = TypeVar("_Method", bound=Callable)
+
+
+def _instance_cache(method: _Method) -> _Method:
+    """Cache a Rom method's results on the instance rather than the function
+
+    Unlike functools.cache the results die with the Rom and can be dropped
+    with Rom.clear_caches().
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        method_caches = self.__dict__.setdefault("_method_caches", dict())
+        method_cache = method_caches.setdefault(method.__name__, dict())
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        try:
+            return method_cache[key]
+        except KeyError:
+            result = method_cache[key] = method(self, *args, **kwargs)
+            return result
+
+    return wrapper
+
+
 @dataclass(frozen=True)
 class TableEntry:
     index: int
@@ -105,13 +137,22 @@ class Rom:
         0x4A: ("jp", 0x1039C0),
     }
 
-    def __init__(self, rom_path: str):
+    def __init__(
+        self,
+        rom_path: str,
+        payload_cache_bytes: int = DEFAULT_PAYLOAD_CACHE_BYTES,
+        mesh_cache_path: str | Path | None = None,
+    ):
         """Class representation of a DK64 ROM
 
         Args:
             rom_path (str): Path to ROM file
+            payload_cache_bytes (int, optional): Size budget for decompressed table entries. Defaults to 64 MiB.
+            mesh_cache_path (str | Path | None, optional): Folder to persist decoded geometry meshes in. Defaults to None (meshes are only kept in memory).
         """
         self.rom_path = Path(rom_path).resolve()
+        self._payload_cache = PayloadCache(payload_cache_bytes)
+        self.mesh_cache_path = None if mesh_cache_path is None else Path(mesh_cache_path)
 
         # Copy ROM data to a temporary file
         with open(rom_path, "rb") as rom_file:
@@ -196,6 +237,67 @@ class Rom:
         """
         return [text_data for text_data in self.get_text_data()]
 
+    @cached_property
+    def sha1(self) -> str:
+        """SHA-1 of the ROM data, used to match persisted indexes to this ROM"""
+        return hashlib.sha1(self._read_rom_data()).hexdigest()
+
+    @property
+    def text_index_path(self) -> Path:
+        """Where the text index is persisted, next to the ROM file"""
+        return self.rom_path.with_name(f"{self.rom_path.name}.text_index.json")
+
+    @cached_property
+    def text_index(self) -> TextIndex:
+        """A full-text index over every line of every text table
+
+        A saved index next to the ROM is reused when it was built from the
+        same ROM data, otherwise the index is built from the text tables.
+
+        Returns:
+            TextIndex: The game's text index
+        """
+        index_path = self.text_index_path
+        if index_path.is_file():
+            try:
+                text_index = TextIndex.load(index_path)
+            except ValueError:
+                text_index = None
+            if text_index is not None and text_index.rom_sha1 == self.sha1:
+                return text_index
+        return self.build_text_index()
+
+    def build_text_index(self) -> TextIndex:
+        """Build a full-text index over the ROM's text tables in one pass"""
+        return TextIndex.from_text_tables(
+            self.text_tables, region=self.region, rom_sha1=self.sha1
+        )
+
+    def save_text_index(self, path: str | Path | None = None) -> Path:
+        """Persist the text index so later sessions skip parsing the text tables
+
+        Args:
+            path (str | Path | None, optional): Where to write the index. Defaults to text_index_path.
+
+        Returns:
+            Path: The written index file
+        """
+        return self.text_index.save(self.text_index_path if path is None else path)
+
+    @cached_property
+    def mesh_cache(self) -> "MeshCache | None":
+        """The persistent decoded mesh cache, when mesh_cache_path is set
+
+        Returns:
+            MeshCache | None: The cache for this ROM's data and library version
+        """
+        mesh_cache_path = self.__dict__.get("mesh_cache_path")
+        if mesh_cache_path is None:
+            return None
+        from dk64_lib.mesh_cache import MeshCache
+
+        return MeshCache(mesh_cache_path, self.sha1)
+
     @cached_property
     def geometry_tables(self):
         return [geometry_data for geometry_data in self.get_geometry_data()]
@@ -204,14 +306,31 @@ class Rom:
         self,
         folderpath: str | Path = "exports/textures",
         include_guessed: bool = True,
+        processes: int | None = None,
+        max_buffered: int = 64,
     ) -> list[Path]:
-        """Export decoded geometry textures as PNG images."""
+        """Export decoded geometry textures as PNG images.
+
+        Each image is written as soon as it is encoded, so at most
+        max_buffered encoded textures are held in memory.
+
+        Args:
+            folderpath (str | Path, optional): Folder the PNG images are written to. Defaults to "exports/textures".
+            include_guessed (bool, optional): Also export table 7, 14 and 25 entries with guessed dimensions. Defaults to True.
+            processes (int | None, optional): Worker processes used to decode and encode textures. Defaults to None (one per CPU).
+            max_buffered (int, optional): Textures encoded ahead of the writer. Defaults to 64.
+
+        Returns:
+            list[Path]: The written PNG images
+        """
         root = Path(folderpath)
         return [
             self._write_bytes(root / image.filename, image.data)
-            for image in self.create_texture_images(
+            for image in self.generate_texture_images(
                 texture_folder="table_25",
                 include_guessed=include_guessed,
+                processes=processes,
+                max_buffered=max_buffered,
             )
         ]
 
@@ -219,39 +338,100 @@ class Rom:
         self,
         texture_folder: str = "table_25",
         include_guessed: bool = True,
-    ) -> tuple[TextureImageFile, ...]:
-        """Create PNG images for texture entries with known or guessed metadata."""
-        display_lists = tuple(
-            display_list
-            for geometry_data in self.geometry_tables
-            if not geometry_data.is_pointer
-            for display_list in geometry_data.display_lists
-        )
-        exporter = TexturedObjExporter(self.get_geometry_texture_data())
-        referenced_geometry_texture_indices = exporter.texture_image_indices(
-            display_lists
+        processes: int | None = None,
+    ) -> "tuple[TextureImageFile, ...]":
+        """Create PNG images for texture entries with known or guessed metadata.
+
+        Use generate_texture_images to handle each image as it is encoded
+        instead of holding all of them in memory.
+
+        Args:
+            texture_folder (str, optional): Folder geometry textures are placed in. Defaults to "table_25".
+            include_guessed (bool, optional): Also create table 7, 14 and 25 entries with guessed dimensions. Defaults to True.
+            processes (int | None, optional): Worker processes used to decode and encode textures. Defaults to None (one per CPU).
+
+        Returns:
+            tuple[TextureImageFile, ...]: Geometry textures followed by guessed ones
+        """
+        return tuple(
+            self.generate_texture_images(texture_folder, include_guessed, processes)
         )
-        images = list(
-            exporter.export_texture_images(
-                display_lists,
-                texture_folder=texture_folder,
+
+    def generate_texture_images(
+        self,
+        texture_folder: str = "table_25",
+        include_guessed: bool = True,
+        processes: int | None = None,
+        max_buffered: int = 64,
+    ) -> "Generator[TextureImageFile, None, None]":
+        """Generate PNG images for texture entries with known or guessed metadata.
+
+        Textures are decoded and PNG encoded across a process pool whose
+        workers read the raw texture bytes from shared memory. Workers stay
+        at most max_buffered textures ahead of the consumer.
+
+        Args:
+            texture_folder (str, optional): Folder geometry textures are placed in. Defaults to "table_25".
+            include_guessed (bool, optional): Also create table 7, 14 and 25 entries with guessed dimensions. Defaults to True.
+            processes (int | None, optional): Worker processes used to decode and encode textures. Defaults to None (one per CPU).
+            max_buffered (int, optional): Textures encoded ahead of the consumer. Defaults to 64.
+
+        Yields:
+            Generator[TextureImageFile, None, None]: Geometry textures followed by guessed ones
+        """
+        from dk64_lib.f3dex2.texture_batch import TextureBatch
+
+        textures = dict()
+        for geometry_data in self.geometry_tables:
+            if geometry_data.is_pointer:
+                continue
+            # Maps parsed only to read their textures are dropped again, so
+            # the whole ROM's geometry is not kept for the rest of the export
+            was_parsed = any(
+                name in geometry_data.__dict__ for name in ("display_lists", "decoded_mesh")
             )
-        )
+            textures.update(dict.fromkeys(geometry_data.decoded_mesh.texture_keys))
+            if not was_parsed:
+                geometry_data.clear_parse_cache()
+        textures = tuple(textures)
+        geometry_texture_data = self.get_geometry_texture_data()
+        raw_textures = [
+            getattr(texture, "raw_data", None) for texture in geometry_texture_data
+        ]
+        guessed_jobs = list()
         if include_guessed:
-            images.extend(
-                self._guessed_texture_images(
-                    referenced_geometry_texture_indices=set(
-                        referenced_geometry_texture_indices
-                    ),
-                )
+            guessed_jobs = self._guessed_texture_jobs(
+                raw_textures,
+                referenced_geometry_texture_indices={
+                    index
+                    for texture in textures
+                    for index in (texture.image_index, texture.palette_index)
+                    if index is not None
+                },
             )
-        return tuple(images)
 
-    def _guessed_texture_images(
+        batch = TextureBatch(raw_textures, processes)
+        # The batch keeps the guessed payloads, and drops them once shared
+        del raw_textures
+        with batch:
+            yield from batch.iter_texture_images(textures, texture_folder, max_buffered)
+            yield from batch.iter_images(guessed_jobs, max_buffered)
+
+    def _guessed_texture_jobs(
         self,
+        raw_textures: "list[bytes | None]",
         referenced_geometry_texture_indices: set[int],
-    ) -> tuple[TextureImageFile, ...]:
-        images = list()
+    ) -> "list[TextureImageJob]":
+        """Plan guessed texture images, appending their raw bytes to raw_textures
+
+        The classifier proposes a format and dimensions for each entry, with
+        TEXTURE_SIZE_GUESSES kept for the sizes it covers unless the data
+        clearly disagrees.
+        """
+        from dk64_lib.f3dex2.texture_batch import TextureImageJob
+        from dk64_lib.f3dex2.texture_classify import classify_texture
+
+        jobs = list()
         for table_id in GUESSED_TEXTURE_TABLES:
             table_folder = f"table_{table_id:02d}"
             for texture_index, table_data in enumerate(
@@ -263,30 +443,30 @@ class Rom:
                 ):
                     continue
                 raw_data = table_data["raw_data"]
-                dimensions = TEXTURE_SIZE_GUESSES.get(len(raw_data))
-                if dimensions is None:
+                guess = classify_texture(
+                    raw_data, prior=TEXTURE_SIZE_GUESSES.get(len(raw_data))
+                )
+                if guess is None:
                     continue
 
-                width, height = dimensions
-                rgba = decode_texture(
-                    raw_data,
-                    fmt=0,
-                    size=2,
-                    width=width,
-                    height=height,
-                )
-                images.append(
-                    TextureImageFile(
+                jobs.append(
+                    TextureImageJob(
                         filename=(
                             f"{table_folder}/"
                             f"{texture_index:06d}_"
                             f"offset_{table_data['offset']:08x}_"
-                            f"guess_f0_s2_{width}x{height}.png"
+                            f"guess_f{guess.fmt}_s{guess.size}_"
+                            f"{guess.width}x{guess.height}.png"
                         ),
-                        data=rgba_to_png(width, height, rgba),
+                        raw_index=len(raw_textures),
+                        fmt=guess.fmt,
+                        size=guess.size,
+                        width=guess.width,
+                        height=guess.height,
                     )
                 )
-        return tuple(images)
+                raw_textures.append(raw_data)
+        return jobs
 
     def export_text(self, folderpath: str | Path = "exports/text") -> list[Path]:
         """Export parsed text tables as UTF-8 text files."""
@@ -323,10 +503,36 @@ class Rom:
         folderpath: str | Path = "exports/geometries",
         include_textures: bool = True,
         geometry_format: Literal["obj", "dae", "gltf", "glb"] = "glb",
-        animated_texture_frames: TextureAnimationFrames | None = None,
+        animated_texture_frames: "TextureAnimationFrames | None" = None,
         animation_frame_duration: int = 4,
+        clear_parse_cache: bool = False,
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        lod_ratios: Sequence[float] = (),
+        lod_files: bool = False,
+        tile_size: int | None = None,
+        alpha_mask: bool = False,
     ) -> list[Path]:
-        """Export geometry tables as GLB, OBJ, DAE, or glTF files."""
+        """Export geometry tables as GLB, OBJ, DAE, or glTF files.
+
+        Each map's parsed display lists and decoded mesh are cached on its
+        GeometryData, so exporting again in another format does not parse it
+        again. Pass ``clear_parse_cache=True`` to drop them after each map is
+        written. With ``mesh_cache_path`` set on the Rom, decoded meshes are
+        also persisted and later sessions skip parsing entirely.
+
+        Pass ``quantize=True`` to write GLB and glTF vertex attributes as
+        integers with ``KHR_mesh_quantization``, it has no effect on OBJ or DAE.
+        Pass ``optimize_meshes=True`` to merge each map's mesh groups per
+        material, drop unused and duplicate vertices and reorder triangles for
+        the vertex cache. GLB and glTF exports get a simplified level of detail
+        per ``lod_ratios`` entry, keeping that fraction of the triangles, linked
+        with ``MSFT_lod`` or written as ``_lod<N>`` files when ``lod_files`` is set.
+        With ``tile_size`` set, each GLB map is split into a grid of tiles that
+        wide, written to a folder beside a ``.json`` manifest of their bounds.
+        Pass ``alpha_mask=True`` to give GLB and glTF textures with only fully
+        opaque or fully transparent pixels ``alphaMode`` ``MASK``.
+        """
         geometry_saver_names = {
             "obj": "save_to_obj",
             "dae": "save_to_dae",
@@ -337,6 +543,12 @@ class Rom:
             save_geometry_name = geometry_saver_names[geometry_format]
         except KeyError:
             raise ValueError("geometry_format must be 'obj', 'dae', 'gltf', or 'glb'")
+        if tile_size is not None:
+            if geometry_format != "glb":
+                raise ValueError("tile_size is only supported for glb exports")
+            if lod_ratios:
+                raise ValueError("tile_size cannot be combined with lod_ratios")
+            save_geometry_name = "save_to_tiled_glb"
 
         exported_paths = list()
         root = Path(folderpath)
@@ -354,6 +566,8 @@ class Rom:
                 continue
 
             geometry_path = root / f"{filename_stem}.{geometry_format}"
+            if tile_size is not None:
+                geometry_path = root / f"{filename_stem}.json"
             save_geometry = getattr(geometry_data, save_geometry_name)
             save_kwargs = {"include_textures": include_textures}
             if geometry_format == "dae" and animated_texture_frames is not None:
@@ -363,12 +577,24 @@ class Rom:
                         "animation_frame_duration": animation_frame_duration,
                     }
                 )
+            if geometry_format in ("gltf", "glb") and quantize:
+                save_kwargs["quantize"] = True
+            if geometry_format in ("gltf", "glb") and alpha_mask:
+                save_kwargs["alpha_mask"] = True
+            if geometry_format in ("gltf", "glb") and lod_ratios:
+                save_kwargs.update({"lod_ratios": lod_ratios, "lod_files": lod_files})
+            if optimize_meshes:
+                save_kwargs["optimize_meshes"] = True
+            if tile_size is not None:
+                save_kwargs["tile_size"] = tile_size
             written_paths = save_geometry(
                 geometry_path.name,
                 str(root),
                 **save_kwargs,
             )
             exported_paths.extend(written_paths)
+            if clear_parse_cache:
+                geometry_data.clear_parse_cache()
 
         return exported_paths
 
@@ -408,8 +634,11 @@ class Rom:
         include_textures: bool = True,
         include_assets: bool = True,
         geometry_format: Literal["obj", "dae", "gltf", "glb"] = "glb",
-        animated_texture_frames: TextureAnimationFrames | None = None,
+        animated_texture_frames: "TextureAnimationFrames | None" = None,
         animation_frame_duration: int = 4,
+        quantize: bool = False,
+        optimize_meshes: bool = False,
+        alpha_mask: bool = False,
     ) -> dict[str, list[Path]]:
         """Export all currently supported ROM data to organized folders."""
         root = Path(folderpath)
@@ -417,6 +646,12 @@ class Rom:
             "include_textures": include_textures,
             "geometry_format": geometry_format,
         }
+        if quantize:
+            geometry_kwargs["quantize"] = True
+        if optimize_meshes:
+            geometry_kwargs["optimize_meshes"] = True
+        if alpha_mask:
+            geometry_kwargs["alpha_mask"] = True
         if animated_texture_frames is not None:
             geometry_kwargs.update(
                 {
@@ -437,7 +672,7 @@ class Rom:
             exported["assets"] = self.export_assets(root / "assets")
         return exported
 
-    @cache
+    @_instance_cache
     def _read_table_entries(self, start: int, size: int) -> tuple[TableEntry, ...]:
         """Read all pointer entries for a table."""
         entries = list()
@@ -466,9 +701,7 @@ class Rom:
             if entry.is_empty:
                 continue
             indic = get_short(self.rom_fh, entry.start)
-            table_data = get_bytes(self.rom_fh, entry.size, entry.start)
-            if indic == 0x1F8B:
-                table_data = zlib.decompress(table_data, (15 + 32))
+            table_data = self.load_entry_data(entry)
             if not table_data:
                 continue
             yield dict(
@@ -477,8 +710,54 @@ class Rom:
                 size=entry.size,
                 was_compressed=True if indic == 0x1F8B else False,
                 rom=self,
+                entry=entry,
             )
 
+    @property
+    def payload_cache(self) -> PayloadCache:
+        """The bounded cache decompressed table entries are loaded through"""
+        payload_cache = self.__dict__.get("_payload_cache")
+        if payload_cache is None:
+            payload_cache = self._payload_cache = PayloadCache()
+        return payload_cache
+
+    def load_entry_data(self, entry: TableEntry) -> bytes:
+        """Read and decompress a table entry, going through the payload cache
+
+        Args:
+            entry (TableEntry): The pointer table entry to load
+
+        Returns:
+            bytes: The entry's decompressed data
+        """
+        key = (entry.start, entry.finish)
+        table_data = self.payload_cache.get(key)
+        if table_data is None:
+            table_data = get_bytes(self.rom_fh, entry.size, entry.start)
+            if table_data[:2] == b"\x1f\x8b":
+                table_data = zlib.decompress(table_data, (15 + 32))
+            self.payload_cache.put(key, table_data)
+        return table_data
+
+    def cache_info(self) -> dict[str, CacheInfo | int]:
+        """Report what the ROM is holding on to
+
+        Returns:
+            dict[str, CacheInfo | int]: Payload cache statistics under "payloads",
+                                        and the number of cached results per table method
+        """
+        info = {"payloads": self.payload_cache.info()}
+        for name, method_cache in self.__dict__.get("_method_caches", {}).items():
+            info[name] = len(method_cache)
+        return info
+
+    def clear_caches(self):
+        """Drop cached payloads and parsed tables so their memory can be reclaimed"""
+        self.payload_cache.clear()
+        self.__dict__.pop("_method_caches", None)
+        for name in _TABLE_PROPERTIES:
+            self.__dict__.pop(name, None)
+
     def generate_rom_table_data(self, tables: list[int]) -> Generator[dict, None, None]:
         """A generator that iterates through the various table data in the ROM
 
@@ -488,19 +767,51 @@ class Rom:
         Yields:
             Generator[dict, None, None]: The table data in bytes
         """
-        for table_offset in tables:
-            if self.release_or_kiosk == "kiosk":
-                table_offset -= 1
-            table_size = get_long(
-                self.rom_fh, self.pointer_table_offset + (32 * 4) + (table_offset * 4)
-            )
-            table_start = self.pointer_table_offset + get_long(
-                self.rom_fh, self.pointer_table_offset + (table_offset * 4)
-            )
+        for table_id in tables:
+            table_start, table_size = self._table_location(table_id)
             for data in self._extract_table_data(table_start, table_size):
                 yield data
 
-    @cache
+    def _table_location(self, table_id: int) -> tuple[int, int]:
+        """Read where a table's pointer entries start and how many there are"""
+        table_offset = table_id
+        if self.release_or_kiosk == "kiosk":
+            table_offset -= 1
+        table_size = get_long(
+            self.rom_fh, self.pointer_table_offset + (32 * 4) + (table_offset * 4)
+        )
+        table_start = self.pointer_table_offset + get_long(
+            self.rom_fh, self.pointer_table_offset + (table_offset * 4)
+        )
+        return table_start, table_size
+
+    def verify(
+        self,
+        tables: tuple[int, ...] = RAW_EXPORT_TABLES,
+        processes: int | None = None,
+    ) -> RomVerification:
+        """Verify the header checksum and pointer table entries of the ROM
+
+        Args:
+            tables (tuple[int, ...], optional): Pointer tables to check. Defaults to RAW_EXPORT_TABLES.
+            processes (int | None, optional): Worker processes used to check gzip entries. Defaults to None (one per CPU).
+
+        Returns:
+            RomVerification: Header CRC results and any corrupt or truncated entries
+        """
+        entries = [
+            (table_id, entry.index, entry.start, entry.finish)
+            for table_id in tables
+            for entry in self._read_table_entries(*self._table_location(table_id))
+            if not entry.is_empty
+        ]
+        return verify_rom(self._read_rom_data(), entries, processes)
+
+    def _read_rom_data(self) -> bytes:
+        """Read the whole ROM into memory"""
+        return get_bytes(self.rom_fh, -1, 0, keep_last_pos=True)
+
+    @_instance_cache
     def get_texture_data(self) -> list[TextureData]:
         """A function for fetching the texture data
 
@@ -512,7 +823,7 @@ class Rom:
             texture_data.append(TextureData(**table_data))
         return texture_data
 
-    @cache
+    @_instance_cache
     def get_stub_table_data(self, table_id: int) -> list[StubTableData]:
         """Fetch provisional raw data wrappers for a named but unparsed table."""
         try:
@@ -581,7 +892,7 @@ class Rom:
     def get_uncompressed_file_size_data(self) -> list[UncompressedFileSizeData]:
         return self.get_stub_table_data(26)
 
-    @cache
+    @_instance_cache
     def get_geometry_texture_data(self) -> list[TextureData]:
         """Fetch texture data referenced by map geometry display lists."""
         return [
@@ -589,7 +900,7 @@ class Rom:
             for table_data in self.generate_rom_table_data([25])
         ]
 
-    @cache
+    @_instance_cache
     def get_text_data(self) -> list[TextData]:
         """A function for fetching the text data
 
@@ -601,7 +912,7 @@ class Rom:
             text_data.append(TextData(**table_data, release_or_kiosk=self.release_or_kiosk))
         return text_data
 
-    @cache
+    @_instance_cache
     def get_cutscene_data(self) -> list[CutsceneData]:
         """A function for fetching the cutscene data
 
@@ -613,7 +924,7 @@ class Rom:
             cutscene_data.append(CutsceneData(**table_data))
         return cutscene_data
 
-    @cache
+    @_instance_cache
     def get_geometry_data(self) -> list[GeometryData]:
         """A function for fetching the cutscene data
 
@@ -0,0 +1,264 @@
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable
+
+
+# The N64 boot code checksums the first megabyte of game data after the
+# 0x1000 byte header/boot code area.
+CRC_START = 0x1000
+CRC_LENGTH = 0x100000
+CRC1_OFFSET = 0x10
+CRC2_OFFSET = 0x14
+
+BOOT_CODE_START = 0x40
+BOOT_CODE_END = 0x1000
+
+# CIC chip identified by the CRC32 of the boot code, and the seed it uses.
+CIC_BOOT_CODE_CRC32 = {
+    0x6170A4A1: 6101,
+    0x90BB6CB5: 6102,
+    0x0B050EE0: 6103,
+    0x98BC2C86: 6105,
+    0xACC8580A: 6106,
+}
+CIC_SEEDS = {
+    6101: 0xF8CA4DDC,
+    6102: 0xF8CA4DDC,
+    6103: 0xA3886759,
+    6105: 0xDF26F436,
+    6106: 0x1FEA617A,
+}
+# DK64 ships with a CIC-NUS-6105, so unidentified boot code is checked as one.
+DEFAULT_CIC = 6105
+
+# CIC-6105 mixes each data word with a word from this 256 byte boot code window
+_CIC_6105_TABLE_OFFSET = 0x0750
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_MASK_32 = 0xFFFFFFFF
+
+
+@dataclass(frozen=True, slots=True)
+class TableEntryIssue:
+    table_id: int
+    index: int
+    start: int
+    finish: int
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class RomVerification:
+    cic: int | None
+    header_crc: tuple[int, int] | None
+    computed_crc: tuple[int, int] | None
+    checked_entries: int
+    entry_issues: tuple[TableEntryIssue, ...]
+
+    @property
+    def header_crc_ok(self) -> bool:
+        return self.header_crc is not None and self.header_crc == self.computed_crc
+
+    @property
+    def ok(self) -> bool:
+        return self.header_crc_ok and not self.entry_issues
+
+
+def identify_cic(rom_data: bytes) -> int | None:
+    """Identify the CIC chip a ROM was built for from its boot code
+
+    Args:
+        rom_data (bytes): Big endian ROM data
+
+    Returns:
+        int | None: The CIC number, or None if the boot code is unknown
+    """
+    boot_code = rom_data[BOOT_CODE_START:BOOT_CODE_END]
+    return CIC_BOOT_CODE_CRC32.get(zlib.crc32(boot_code) & _MASK_32)
+
+
+def header_crcs(rom_data: bytes) -> tuple[int, int]:
+    """Read the CRC1/CRC2 pair stored in the ROM header"""
+    return (
+        int.from_bytes(rom_data[CRC1_OFFSET : CRC1_OFFSET + 4], "big"),
+        int.from_bytes(rom_data[CRC2_OFFSET : CRC2_OFFSET + 4], "big"),
+    )
+
+
+def compute_header_crcs(rom_data: bytes, cic: int = DEFAULT_CIC) -> tuple[int, int]:
+    """Compute the N64 header CRC1/CRC2 pair
+
+    Every accumulator except t2 is an order-independent sum or xor of
+    per-word terms, so those are computed with NumPy reductions. t2 depends
+    on its own previous value and is the only part walked word by word.
+
+    Args:
+        rom_data (bytes): Big endian ROM data
+        cic (int, optional): CIC chip to compute the checksum for. Defaults to 6105.
+
+    Raises:
+        ValueError: Raised when the ROM is too small or the CIC is unsupported
+
+    Returns:
+        tuple[int, int]: CRC1 and CRC2
+    """
+    if len(rom_data) < CRC_START + CRC_LENGTH:
+        raise ValueError("ROM is too small to contain the checksummed region")
+    try:
+        seed = CIC_SEEDS[cic]
+    except KeyError:
+        raise ValueError(f"CIC {cic} is not supported")
+
+    import numpy
+
+    words = numpy.frombuffer(
+        rom_data, dtype=">u4", count=CRC_LENGTH // 4, offset=CRC_START
+    ).astype(numpy.uint64)
+
+    # t6 is a running 32-bit sum and t4 counts how often that sum wraps
+    running_sum = seed + numpy.cumsum(words)
+    t6_steps = running_sum & _MASK_32
+    t6 = int(t6_steps[-1])
+    t4 = (seed + int(running_sum[-1] >> 32)) & _MASK_32
+    t3 = seed ^ int(numpy.bitwise_xor.reduce(words))
+
+    shifts = words & 0x1F
+    rotated = ((words << shifts) | (words >> (32 - shifts))) & _MASK_32
+    t5_steps = (seed + numpy.cumsum(rotated)) & _MASK_32
+    t5 = int(t5_steps[-1])
+
+    if cic == 6105:
+        table = numpy.frombuffer(
+            rom_data, dtype=">u4", count=64, offset=_CIC_6105_TABLE_OFFSET
+        ).astype(numpy.uint64)
+        t1_terms = numpy.resize(table, words.shape) ^ words
+    else:
+        t1_terms = t5_steps ^ words
+    t1 = (seed + int(t1_terms.sum())) & _MASK_32
+
+    t2 = seed
+    for word, rotated_word, t6_mix in zip(
+        words.tolist(), rotated.tolist(), (t6_steps ^ words).tolist()
+    ):
+        t2 ^= rotated_word if t2 > word else t6_mix
+
+    if cic == 6103:
+        return ((t6 ^ t4) + t3) & _MASK_32, ((t5 ^ t2) + t1) & _MASK_32
+    if cic == 6106:
+        return ((t6 * t4) + t3) & _MASK_32, ((t5 * t2) + t1) & _MASK_32
+    return t6 ^ t4 ^ t3, t5 ^ t2 ^ t1
+
+
+def check_gzip_payload(payload: bytes) -> str | None:
+    """Check a gzip compressed table entry against its CRC32/ISIZE trailer
+
+    Args:
+        payload (bytes): Raw entry bytes, starting with the gzip header
+
+    Returns:
+        str | None: A description of the problem, or None if the entry is intact
+    """
+    decompressor = zlib.decompressobj(15 + 32)
+    try:
+        decompressor.decompress(payload)
+    except zlib.error as exc:
+        if "data check" in str(exc):
+            return "gzip CRC32 does not match the decompressed data"
+        if "length check" in str(exc):
+            return "gzip ISIZE does not match the decompressed length"
+        return f"corrupt gzip stream ({exc})"
+    if not decompressor.eof:
+        return "truncated gzip stream"
+    return None
+
+
+def check_table_entries(
+    rom_data: bytes,
+    entries: Iterable[tuple[int, int, int, int]],
+    processes: int | None = None,
+) -> tuple[int, tuple[TableEntryIssue, ...]]:
+    """Check pointer table entries for truncation and gzip corruption
+
+    Bounds are checked in process, gzip members are inflated and verified
+    across a process pool.
+
+    Args:
+        rom_data (bytes): Big endian ROM data
+        entries (Iterable[tuple[int, int, int, int]]): (table_id, index, start, finish) tuples
+        processes (int | None, optional): Worker processes for gzip checks. Defaults to None (one per CPU).
+
+    Returns:
+        tuple[int, tuple[TableEntryIssue, ...]]: Number of entries checked and any issues found
+    """
+    issues = list()
+    compressed = list()
+    checked = 0
+    for table_id, index, start, finish in entries:
+        checked += 1
+        if finish < start:
+            reason = "entry ends before it starts"
+        elif finish > len(rom_data):
+            reason = "entry extends past the end of the ROM"
+        else:
+            reason = None
+            if rom_data[start : start + 2] == _GZIP_MAGIC:
+                compressed.append((table_id, index, start, finish))
+        if reason:
+            issues.append(TableEntryIssue(table_id, index, start, finish, reason))
+
+    payloads = (rom_data[start:finish] for _, _, start, finish in compressed)
+    if processes == 1 or not compressed:
+        results = map(check_gzip_payload, payloads)
+        issues.extend(_gzip_issues(compressed, results))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = executor.map(check_gzip_payload, payloads, chunksize=32)
+            issues.extend(_gzip_issues(compressed, results))
+
+    return checked, tuple(
+        sorted(issues, key=lambda issue: (issue.table_id, issue.index))
+    )
+
+
+def _gzip_issues(
+    compressed: list[tuple[int, int, int, int]],
+    results: Iterable[str | None],
+) -> list[TableEntryIssue]:
+    return [
+        TableEntryIssue(table_id, index, start, finish, reason)
+        for (table_id, index, start, finish), reason in zip(compressed, results)
+        if reason
+    ]
+
+
+def verify_rom(
+    rom_data: bytes,
+    entries: Iterable[tuple[int, int, int, int]],
+    processes: int | None = None,
+) -> RomVerification:
+    """Verify the header checksum and pointer table entries of a ROM
+
+    Args:
+        rom_data (bytes): Big endian ROM data
+        entries (Iterable[tuple[int, int, int, int]]): (table_id, index, start, finish) tuples
+        processes (int | None, optional): Worker processes for gzip checks. Defaults to None (one per CPU).
+
+    Returns:
+        RomVerification: The verification report
+    """
+    cic = identify_cic(rom_data)
+    stored_crc = None
+    computed_crc = None
+    if len(rom_data) >= CRC_START + CRC_LENGTH:
+        stored_crc = header_crcs(rom_data)
+        computed_crc = compute_header_crcs(rom_data, cic or DEFAULT_CIC)
+    checked, issues = check_table_entries(rom_data, entries, processes)
+    return RomVerification(
+        cic=cic,
+        header_crc=stored_crc,
+        computed_crc=computed_crc,
+        checked_entries=checked,
+        entry_issues=issues,
+    )
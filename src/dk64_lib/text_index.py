@@ -0,0 +1,236 @@
+import json
+import re
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from dk64_lib.data_types.text import TextData
+
+
+TEXT_INDEX_FORMAT = 1
+
+# Sprite placeholders such as ``a_button`` are kept as single tokens
+_TOKEN_PATTERN = re.compile(r"[\w']+")
+
+
+@dataclass(frozen=True, slots=True)
+class TextHit:
+    region: str | None
+    table: int
+    line: int
+    text: str
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into the lowercase tokens the index is keyed on
+
+    Args:
+        text (str): Line text, including any sprite placeholders
+
+    Returns:
+        list[str]: The line's tokens in order
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class TextIndex:
+    def __init__(self, rom_sha1: str | None = None):
+        """An inverted index over the lines of one or more text table sets
+
+        Args:
+            rom_sha1 (str | None, optional): SHA-1 of the ROM the index was built from. Defaults to None.
+        """
+        self.rom_sha1 = rom_sha1
+        self._lines: list[TextHit] = list()
+        self._postings: dict[str, dict[int, tuple[int, ...]]] = dict()
+        self._vocabulary: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __repr__(self) -> str:
+        return f"TextIndex(# of lines={len(self._lines)}, # of tokens={len(self._postings)})"
+
+    @classmethod
+    def from_text_tables(
+        cls,
+        text_tables: Iterable[TextData],
+        region: str | None = None,
+        rom_sha1: str | None = None,
+    ) -> "TextIndex":
+        """Build an index from parsed text tables in one pass
+
+        Args:
+            text_tables (Iterable[TextData]): The tables to index, in table order
+            region (str | None, optional): Region the tables belong to. Defaults to None.
+            rom_sha1 (str | None, optional): SHA-1 of the source ROM. Defaults to None.
+
+        Returns:
+            TextIndex: The built index
+        """
+        index = cls(rom_sha1=rom_sha1)
+        for table_index, text_data in enumerate(text_tables):
+            index.add_table(table_index, text_data, region)
+        return index
+
+    def add_table(self, table_index: int, text_data: TextData, region: str | None = None):
+        """Add every line of a text table to the index
+
+        Args:
+            table_index (int): Position of the table in the ROM's text tables
+            text_data (TextData): The parsed table
+            region (str | None, optional): Region the table belongs to. Defaults to None.
+        """
+        for line_index, text_line in enumerate(text_data.text_lines):
+            self.add_line(table_index, line_index, text_line.text, region)
+
+    def add_line(self, table_index: int, line_index: int, text: str, region: str | None = None):
+        """Add a single line of text to the index"""
+        line_id = len(self._lines)
+        self._lines.append(TextHit(region, table_index, line_index, text))
+        positions: dict[str, list[int]] = dict()
+        for position, token in enumerate(tokenize(text)):
+            positions.setdefault(token, list()).append(position)
+        for token, token_positions in positions.items():
+            self._postings.setdefault(token, dict())[line_id] = tuple(token_positions)
+        self._vocabulary = None
+
+    @property
+    def regions(self) -> tuple[str | None, ...]:
+        """Regions present in the index, in the order they were added"""
+        return tuple(dict.fromkeys(line.region for line in self._lines))
+
+    def search(
+        self, query: str, region: str | None = None, prefix: bool = False
+    ) -> tuple[TextHit, ...]:
+        """Find lines containing every token of a query, in any order
+
+        Args:
+            query (str): Words or sprite names to look for
+            region (str | None, optional): Only return lines from this region. Defaults to None (all regions).
+            prefix (bool, optional): Match each query token as a prefix. Defaults to False.
+
+        Returns:
+            tuple[TextHit, ...]: Matching lines in table/line order
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return tuple()
+        line_ids = None
+        for token in tokens:
+            matches = self._prefix_lines(token) if prefix else self._postings.get(token, {}).keys()
+            line_ids = set(matches) if line_ids is None else line_ids.intersection(matches)
+            if not line_ids:
+                return tuple()
+        return self._hits(line_ids, region)
+
+    def search_phrase(self, phrase: str, region: str | None = None) -> tuple[TextHit, ...]:
+        """Find lines containing the tokens of a phrase next to each other
+
+        Args:
+            phrase (str): The phrase to look for
+            region (str | None, optional): Only return lines from this region. Defaults to None (all regions).
+
+        Returns:
+            tuple[TextHit, ...]: Matching lines in table/line order
+        """
+        tokens = tokenize(phrase)
+        if not tokens:
+            return tuple()
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return tuple()
+
+        # Walk candidates from the rarest token and line up the others around it
+        rarest = min(range(len(tokens)), key=lambda token_index: len(postings[token_index]))
+        line_ids = set()
+        for line_id, anchor_positions in postings[rarest].items():
+            line_postings = [token_postings.get(line_id) for token_postings in postings]
+            if not all(line_postings):
+                continue
+            for anchor in anchor_positions:
+                start = anchor - rarest
+                if all(
+                    start + token_index in line_postings[token_index]
+                    for token_index in range(len(tokens))
+                ):
+                    line_ids.add(line_id)
+                    break
+        return self._hits(line_ids, region)
+
+    def _prefix_lines(self, prefix: str) -> set[int]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        line_ids = set()
+        for vocabulary_index in range(
+            bisect_left(self._vocabulary, prefix), len(self._vocabulary)
+        ):
+            token = self._vocabulary[vocabulary_index]
+            if not token.startswith(prefix):
+                break
+            line_ids.update(self._postings[token])
+        return line_ids
+
+    def _hits(self, line_ids: Iterable[int], region: str | None) -> tuple[TextHit, ...]:
+        return tuple(
+            self._lines[line_id]
+            for line_id in sorted(line_ids)
+            if region is None or self._lines[line_id].region == region
+        )
+
+    def to_dict(self) -> dict:
+        """Serialise the index to JSON compatible data"""
+        return {
+            "format": TEXT_INDEX_FORMAT,
+            "rom_sha1": self.rom_sha1,
+            "lines": [
+                [line.region, line.table, line.line, line.text] for line in self._lines
+            ],
+            "postings": {
+                token: [[line_id, list(positions)] for line_id, positions in lines.items()]
+                for token, lines in self._postings.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TextIndex":
+        """Restore an index serialised with :meth:`to_dict`
+
+        Raises:
+            ValueError: Raised when the data was written in an unknown format or is malformed
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Text index data is not a JSON object")
+        if data.get("format") != TEXT_INDEX_FORMAT:
+            raise ValueError(f"Unsupported text index format {data.get('format')}")
+        index = cls(rom_sha1=data.get("rom_sha1"))
+        try:
+            index._lines = [TextHit(*line) for line in data["lines"]]
+            index._postings = {
+                token: {line_id: tuple(positions) for line_id, positions in lines}
+                for token, lines in data["postings"].items()
+            }
+        except (AttributeError, KeyError, TypeError) as error:
+            raise ValueError(f"Malformed text index: {error!r}") from error
+        return index
+
+    def save(self, path: str | Path) -> Path:
+        """Write the index to a JSON file
+
+        Args:
+            path (str | Path): Where to write the index
+
+        Returns:
+            Path: The written file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), separators=(",", ":")))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TextIndex":
+        """Read an index written with :meth:`save`"""
+        return cls.from_dict(json.loads(Path(path).read_text()))
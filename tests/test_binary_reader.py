@@ -1,6 +1,6 @@
 import unittest
 
-from dk64_lib.binary_reader import BinaryReader
+from dk64_lib.binary_reader import BinaryReader, RecordLayout
 
 
 class BinaryReaderTest(unittest.TestCase):
@@ -30,5 +30,48 @@ class BinaryReaderTest(unittest.TestCase):
             self.reader.read_at(7, 2)
 
 
+class RecordLayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.layout = RecordLayout((("signed", "h"), ("flag", "B"), ("tag", "2s"), ("word", "I")))
+        self.data = (
+            b"\xff\xfe\x01ab\x10\x20\x30\x40"
+            + b"\x00\x02\x00cd\x00\x00\x00\x01"
+        )
+
+    def test_unpack_record(self):
+        self.assertEqual(self.layout.size, 9)
+        self.assertEqual(self.layout.names, ("signed", "flag", "tag", "word"))
+        self.assertEqual(self.layout.unpack(self.data), (-2, 1, b"ab", 0x10203040))
+        self.assertEqual(self.layout.unpack(self.data, 9), (2, 0, b"cd", 1))
+        self.assertEqual(
+            BinaryReader(self.data).read_record(self.layout, 9),
+            (2, 0, b"cd", 1),
+        )
+
+    def test_iter_unpack_and_unpack_all(self):
+        expected = [(-2, 1, b"ab", 0x10203040), (2, 0, b"cd", 1)]
+
+        self.assertEqual(list(self.layout.iter_unpack(self.data, 2)), expected)
+        self.assertEqual(list(self.layout.iter_unpack(b"\x00" + self.data, 1, 1)), expected[:1])
+        self.assertEqual(list(self.layout.unpack_all(self.data)), expected)
+
+    def test_unpack_array(self):
+        records = self.layout.unpack_array(self.data, 2)
+
+        self.assertEqual(records["signed"].tolist(), [-2, 2])
+        self.assertEqual(records["tag"].tolist(), [b"ab", b"cd"])
+        self.assertEqual(records["word"].tolist(), [0x10203040, 1])
+
+    def test_rejects_records_past_end(self):
+        with self.assertRaises(ValueError):
+            self.layout.unpack(self.data, 10)
+        with self.assertRaises(ValueError):
+            self.layout.iter_unpack(self.data, 3)
+        with self.assertRaises(ValueError):
+            self.layout.unpack_all(self.data[:-1])
+        with self.assertRaises(ValueError):
+            self.layout.unpack_array(self.data, 3)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,12 @@
 import unittest
 from dataclasses import FrozenInstanceError
 
-from dk64_lib.f3dex2.display_list import DisplayListChunkData, DisplayListExpansion
+from dk64_lib.f3dex2.commands import G_DL, G_ENDDL, G_TRI1
+from dk64_lib.f3dex2.display_list import (
+    DisplayList,
+    DisplayListChunkData,
+    DisplayListExpansion,
+)
 
 
 def u32(value: int) -> bytes:
@@ -103,5 +108,102 @@ class DisplayListChunkDataTest(unittest.TestCase):
             chunk.vertex_size = 1
 
 
+def _branched_display_list() -> DisplayList:
+    tri1 = b"\x05\x00\x02\x04\x00\x00\x00\x00"
+    end = b"\xdf" + bytes(7)
+    branch = DisplayList(
+        raw_data=tri1 + end,
+        raw_vertex_data=b"",
+        vertex_pointer=0,
+        offset=0x18,
+        branched=True,
+    )
+    other_branch = DisplayList(
+        raw_data=end,
+        raw_vertex_data=b"",
+        vertex_pointer=0,
+        offset=0x28,
+        branched=True,
+    )
+    return DisplayList(
+        raw_data=b"\xde\x00\x00\x00" + u32(0x18) + b"\xde\x00\x00\x00" + u32(0x99) + end,
+        raw_vertex_data=b"",
+        vertex_pointer=0,
+        offset=0,
+        branches=[other_branch, branch],
+    )
+
+
+class DisplayListBranchTest(unittest.TestCase):
+    def test_get_branch_by_offset(self):
+        display_list = _branched_display_list()
+
+        self.assertEqual(display_list.get_branch_by_offset(0x18).offset, 0x18)
+        self.assertEqual(display_list.get_branch_by_offset(0x28).offset, 0x28)
+        self.assertIsNone(display_list.get_branch_by_offset(0x99))
+
+        late_branch = DisplayList(b"", b"", 0, 0x99, branched=True)
+        display_list.branches.append(late_branch)
+        self.assertIs(display_list.get_branch_by_offset(0x99), late_branch)
+
+    def test_equality_with_offsets_and_display_lists(self):
+        display_list = _branched_display_list()
+
+        self.assertEqual(display_list, 0)
+        self.assertNotEqual(display_list, 0x18)
+        self.assertEqual(display_list, display_list)
+        self.assertNotEqual(display_list, _branched_display_list())
+        self.assertNotEqual(display_list, "display list")
+
+    def test_commands_are_parsed_once(self):
+        display_list = _branched_display_list()
+
+        self.assertIs(display_list.commands, display_list.commands)
+
+    def test_flattened_commands_inline_branches(self):
+        display_list = _branched_display_list()
+        branch = display_list.get_branch_by_offset(0x18)
+
+        flattened = display_list.flattened_commands
+
+        self.assertEqual(
+            [(type(item.command), item.display_list, item.depth) for item in flattened],
+            [
+                (G_DL, display_list, 0),
+                (G_TRI1, branch, 1),
+                (G_ENDDL, branch, 1),
+                (G_DL, display_list, 0),
+                (G_ENDDL, display_list, 0),
+            ],
+        )
+
+    def test_vertex_groups_include_branches_where_they_are_called(self):
+        tri1 = b"\x05\x00\x02\x04\x00\x00\x00\x00"
+        end = b"\xdf" + bytes(7)
+
+        def vtx(address: int) -> bytes:
+            return b"\x01\x00\x30\x06" + u32(address)
+
+        raw_vertex_data = b"".join(bytes((index,)) * 16 for index in range(6))
+        branch = DisplayList(vtx(48) + tri1 + end, raw_vertex_data, 0, 0x40, branched=True)
+        display_list = DisplayList(
+            tri1 + vtx(0) + tri1 + b"\xde\x00\x00\x00" + u32(0x40) + tri1 + end,
+            raw_vertex_data,
+            0,
+            0,
+            branches=[branch],
+        )
+
+        vertex_groups = display_list.vertex_groups()
+
+        self.assertEqual(list(zip(display_list.verticies, display_list.triangles)), vertex_groups)
+        # The caller's triangle after the branch joins the group loaded before it
+        self.assertEqual([len(triangles) for _, triangles in vertex_groups], [2, 1])
+        self.assertEqual(
+            [[vertex.alpha for vertex in vertices] for vertices, _ in vertex_groups],
+            [[0, 1, 2], [3, 4, 5]],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from dataclasses import FrozenInstanceError
 
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2.display_list import DisplayListChunkData, DisplayListExpansion
 from dk64_lib.f3dex2.triangle import Triangle
 from dk64_lib.f3dex2.vertex import Vertex
 from dk64_lib.f3dex2.commands import G_TRI1, G_TRI2
@@ -77,5 +79,92 @@ class TriangleTest(unittest.TestCase):
             triangle.v1 = 4
 
 
+def _u32(value: int) -> bytes:
+    return value.to_bytes(4, "big")
+
+
+def _geometry_file() -> bytes:
+    """A map with one display list drawing one triangle, one chunk and one expansion"""
+    display_list = (
+        b"\x01\x00\x30\x06\x00\x00\x00\x00"
+        + b"\x05\x00\x02\x04\x00\x00\x00\x00"
+        + b"\xdf\x00\x00\x00\x00\x00\x00\x00"
+    )
+    vertices = b"".join(
+        position.to_bytes(2, "big", signed=True) * 3 + bytes(6) + bytes((255, 255, 255, 255))
+        for position in (0, 1, 2)
+    )
+    chunk = bytes((1, 2, 3, 4)) + b"\x24\x00\x00\x00" + _u32(5) + b"".join(
+        _u32(value) for value in (0, 24, 0, 0, 0, 0, 0, 0, 0, 48)
+    )
+    expansions = _u32(1) + b"".join(_u32(value) for value in (6, 7, 0x50, 8))
+
+    dl_start = 0x80
+    vert_start = dl_start + len(display_list)
+    chunk_start = vert_start + len(vertices)
+    expansion_start = chunk_start + len(chunk)
+
+    header = bytearray(dl_start)
+    header[0x34:0x38] = _u32(dl_start)
+    header[0x38:0x3C] = _u32(vert_start)
+    header[0x40:0x44] = _u32(chunk_start)
+    header[0x68:0x6C] = _u32(chunk_start)
+    header[0x6C:0x70] = _u32(expansion_start)
+    header[0x70:0x74] = _u32(expansion_start)
+    return bytes(header) + display_list + vertices + chunk + expansions
+
+
+class GeometryDataTest(unittest.TestCase):
+    def setUp(self):
+        raw_data = _geometry_file()
+        self.geometry = GeometryData(
+            raw_data=raw_data,
+            offset=0,
+            size=len(raw_data),
+            was_compressed=False,
+            rom=None,
+        )
+
+    def test_chunk_and_expansion_tables(self):
+        raw_data = _geometry_file()
+        chunk_start = self.geometry.vert_chunk_start
+
+        self.assertEqual(
+            self.geometry.vertex_chunk_data,
+            [DisplayListChunkData.from_bytes(raw_data[chunk_start : chunk_start + 52])],
+        )
+        self.assertEqual(self.geometry.vertex_chunk_data[0].mips_instruction, b"\x24\x00\x00\x00")
+        self.assertEqual(self.geometry.dl_expansions, [DisplayListExpansion(6, 7, 0x50, 8)])
+
+    def test_from_table_rejects_truncated_tables(self):
+        with self.assertRaisesRegex(ValueError, "exceeds"):
+            DisplayListExpansion.from_table(bytes(20), 2)
+
+    def test_display_lists_are_parsed_once(self):
+        display_lists = self.geometry.display_lists
+
+        self.assertIs(self.geometry.display_lists, display_lists)
+        self.assertEqual(len(display_lists), 1)
+        self.assertIn("f 1 2 3", self.geometry.create_obj())
+        self.assertIs(self.geometry.display_lists, display_lists)
+
+    def test_display_list_index(self):
+        (display_list,) = self.geometry.display_lists
+
+        self.assertEqual(self.geometry.display_list_index, {0: display_list})
+        self.assertIs(self.geometry.get_display_list(0), display_list)
+        self.assertIsNone(self.geometry.get_display_list(8))
+
+    def test_clear_parse_cache_reparses_on_next_access(self):
+        display_lists = self.geometry.display_lists
+        chunk_data = self.geometry.vertex_chunk_data
+
+        self.geometry.clear_parse_cache()
+
+        self.assertIsNot(self.geometry.display_lists, display_lists)
+        self.assertIsNot(self.geometry.vertex_chunk_data, chunk_data)
+        self.assertEqual(self.geometry.vertex_chunk_data, chunk_data)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+
+# Importing dk64_lib.rom took about 0.35s while it loaded NumPy and pycollada,
+# and about 0.15s without them
+IMPORT_BUDGET_SECONDS = 0.25
+HEAVY_MODULES = (
+    "numpy",
+    "collada",
+    "lxml",
+    "dk64_lib.f3dex2.texture_export",
+    "dk64_lib.mesh_cache",
+)
+IMPORT_SCRIPT = f"""
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import dk64_lib.rom
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def _import_rom() -> dict:
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        env=environment,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_rom_import_skips_exporter_dependencies(self):
+        self.assertEqual(_import_rom()["loaded"], [])
+
+    def test_rom_import_within_budget(self):
+        # Best of a few runs so a busy machine does not fail the budget
+        elapsed = min(_import_rom()["elapsed"] for _ in range(3))
+
+        self.assertLess(elapsed, IMPORT_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
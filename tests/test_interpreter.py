@@ -0,0 +1,123 @@
+import unittest
+
+from dk64_lib.f3dex2.commands import get_command
+from dk64_lib.f3dex2.display_list import DisplayList
+from dk64_lib.f3dex2.interpreter import DisplayListHandler, DisplayListInterpreter
+from dk64_lib.f3dex2.texture_state import _TextureKey, _TextureState
+
+
+END = b"\xdf" + bytes(7)
+TRI1 = b"\x05\x00\x02\x04\x00\x00\x00\x00"
+TEXTURE_ON = b"\xd7\x00\x00\x01\xff\xff\xff\xff"
+SETTIMG = b"\xfd\x10\x00\x00\x00\x00\x00\x07"
+LOADBLOCK = b"\xf3\x00\x00\x00\x07\x00\x00\x00"
+SETTILE = b"\xf5\x10\x00\x00\x00\x00\x00\x00"
+SETTILESIZE = b"\xf2\x00\x00\x00\x00\x07\xc0\x7c"
+
+
+def _display_list(raw_data: bytes, offset: int = 0, branches=None, branched=False) -> DisplayList:
+    return DisplayList(
+        raw_data=raw_data,
+        raw_vertex_data=b"",
+        vertex_pointer=0,
+        offset=offset,
+        branches=branches,
+        branched=branched,
+    )
+
+
+def _textured_state() -> _TextureState:
+    state = _TextureState()
+    for command in (TEXTURE_ON, SETTIMG, SETTILE, LOADBLOCK, SETTILESIZE):
+        state.apply(get_command(command))
+    return state
+
+
+class _Recorder(DisplayListHandler):
+    opcodes = frozenset((b"\x05",))
+
+    def __init__(self):
+        self.events = []
+
+    def enter_display_list(self, display_list, state):
+        self.events.append(("enter", display_list.offset))
+
+    def exit_display_list(self, display_list, state):
+        self.events.append(("exit", display_list.offset))
+
+    def handle_command(self, command, display_list, state):
+        self.events.append(("tri", display_list.offset, state.active_texture is not None))
+
+
+class DisplayListInterpreterTest(unittest.TestCase):
+    def test_handlers_see_registered_opcodes_in_branch_order(self):
+        branch = _display_list(TRI1 + END, offset=0x20, branched=True)
+        parent = _display_list(
+            TEXTURE_ON + SETTIMG + SETTILE + LOADBLOCK + SETTILESIZE
+            + b"\xde\x00\x00\x00\x00\x00\x00\x20" + TRI1 + END,
+            branches=[branch],
+        )
+        recorder = _Recorder()
+
+        DisplayListInterpreter((recorder,)).run((parent, branch))
+
+        self.assertEqual(
+            recorder.events,
+            [
+                ("enter", 0),
+                ("enter", 0x20),
+                ("tri", 0x20, True),
+                ("exit", 0x20),
+                ("tri", 0, True),
+                ("exit", 0),
+            ],
+        )
+
+    def test_handlers_for_every_opcode(self):
+        class _Counter(DisplayListHandler):
+            opcodes = None
+            count = 0
+
+            def handle_command(self, command, display_list, state):
+                self.count += 1
+
+        counter = _Counter()
+        DisplayListInterpreter((counter,)).run((_display_list(TRI1 + TRI1 + END),))
+
+        self.assertEqual(counter.count, 3)
+
+
+class TextureStateTest(unittest.TestCase):
+    def test_active_texture(self):
+        state = _textured_state()
+
+        self.assertEqual(
+            state.active_texture,
+            _TextureKey(image_index=7, palette_index=None, fmt=0, size=2, width=32, height=32),
+        )
+        self.assertIs(state.active_texture, state.active_texture)
+
+    def test_active_texture_changes_only_with_state_commands(self):
+        state = _textured_state()
+        texture = state.active_texture
+
+        state.apply(get_command(TRI1))
+        self.assertIs(state.active_texture, texture)
+
+        state.apply(get_command(b"\xd7\x00\x00\x00\xff\xff\xff\xff"))
+        self.assertIsNone(state.active_texture)
+
+    def test_clone_is_copy_on_write(self):
+        state = _textured_state()
+        clone = state.clone()
+        self.assertIs(clone._tile_sizes, state._tile_sizes)
+
+        clone.apply(get_command(b"\xf2\x00\x00\x00\x00\x03\xc0\x3c"))
+
+        self.assertEqual(clone.active_texture.width, 16)
+        self.assertEqual(state.active_texture.width, 32)
+        self.assertIsNot(clone._tile_sizes, state._tile_sizes)
+
+
+if __name__ == "__main__":
+    unittest.main()
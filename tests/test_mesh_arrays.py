@@ -0,0 +1,129 @@
+import unittest
+
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy
+
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2.display_list import DisplayList
+from dk64_lib.f3dex2.interpreter import DisplayListInterpreter
+from dk64_lib.f3dex2.mesh_arrays import mesh_arrays
+from dk64_lib.f3dex2.texture_export import DecodedMesh, TexturedObjExporter
+
+
+END = b"\xdf" + bytes(7)
+TRI1 = b"\x05\x00\x02\x04\x00\x00\x00\x00"
+TEXTURE_SETUP = (
+    b"\xd7\x00\x00\x01\xff\xff\xff\xff"
+    + b"\xfd\x10\x00\x00\x00\x00\x00\x07"
+    + b"\xf5\x10\x00\x00\x00\x00\x00\x00"
+    + b"\xf3\x00\x00\x00\x07\x00\x00\x00"
+    + b"\xf2\x00\x00\x00\x00\x07\xc0\x7c"
+)
+
+
+def _vtx(address: int) -> bytes:
+    return b"\x01\x00\x30\x06" + address.to_bytes(4, "big")
+
+
+def _vertex(x: int, u: int, v: int, alpha: int = 255) -> bytes:
+    return (
+        x.to_bytes(2, "big", signed=True)
+        + (-x).to_bytes(2, "big", signed=True)
+        + (2 * x).to_bytes(2, "big", signed=True)
+        + b"\x00\x00"
+        + u.to_bytes(2, "big", signed=True)
+        + v.to_bytes(2, "big", signed=True)
+        + bytes((10, 20, 30, alpha))
+    )
+
+
+def _display_list() -> DisplayList:
+    return DisplayList(
+        raw_data=_vtx(0) + TRI1 + TEXTURE_SETUP + _vtx(48) + TRI1 + END,
+        raw_vertex_data=b"".join(
+            (
+                _vertex(1, 0, 0),
+                _vertex(2, 0, 0),
+                _vertex(3, 0, 0, alpha=128),
+                _vertex(4, 0, 0),
+                _vertex(5, 32 * 32, 0),
+                _vertex(6, -16, 32 * 16),
+            )
+        ),
+        vertex_pointer=0,
+        offset=0x40,
+    )
+
+
+class MeshArraysTest(unittest.TestCase):
+    def setUp(self):
+        self.arrays = mesh_arrays((_display_list(),))
+
+    def test_vertex_arrays(self):
+        self.assertEqual(self.arrays.vertex_count, 6)
+        self.assertEqual(self.arrays.positions.dtype, numpy.float32)
+        self.assertEqual(self.arrays.positions[2].tolist(), [3.0, -3.0, 6.0])
+        self.assertEqual(self.arrays.colors[2].tolist(), [10, 20, 30, 128])
+        self.assertEqual(self.arrays.uvs_raw[5].tolist(), [-16, 512])
+        self.assertTrue(self.arrays.positions.flags["C_CONTIGUOUS"])
+
+    def test_normalised_uvs(self):
+        self.assertEqual(self.arrays.uvs[:3].tolist(), [[0.0, 0.0]] * 3)
+        self.assertEqual(self.arrays.uvs[4].tolist(), [1.0, 0.0])
+        self.assertEqual(self.arrays.uvs[5].tolist(), [-1 / 64, 0.5])
+
+    def test_triangles_and_per_triangle_data(self):
+        self.assertEqual(self.arrays.triangles.tolist(), [[0, 1, 2], [3, 4, 5]])
+        self.assertEqual(self.arrays.triangle_texture_ids.tolist(), [-1, 0])
+        self.assertEqual(self.arrays.triangle_display_list_offsets.tolist(), [0x40, 0x40])
+        self.assertEqual(len(self.arrays.textures), 1)
+        self.assertEqual(self.arrays.textures[0].image_index, 7)
+
+    def test_matches_exporter_mesh_groups(self):
+        groups = TexturedObjExporter(())._iter_mesh_groups((_display_list(),))
+
+        self.assertEqual(
+            self.arrays.positions.tolist(),
+            [
+                [vertex.x, vertex.y, vertex.z]
+                for group in groups
+                for vertex in group.vertices
+            ],
+        )
+        self.assertEqual(
+            [self.arrays.textures[texture_id] if texture_id >= 0 else None
+             for texture_id in self.arrays.triangle_texture_ids],
+            [group.texture for group in groups],
+        )
+
+    def test_decoded_geometry_walks_display_lists_once(self):
+        geometry = GeometryData(bytes(0x80), 0x10, 0x80, False, SimpleNamespace())
+        geometry.__dict__["display_lists"] = [_display_list()]
+        run = DisplayListInterpreter.run
+
+        with mock.patch.object(
+            DisplayListInterpreter, "run", autospec=True, side_effect=run
+        ) as walk:
+            mesh = geometry.decoded_mesh
+            arrays = geometry.to_arrays()
+            geometry.spatial_index
+
+        self.assertEqual(walk.call_count, 1)
+        self.assertEqual(mesh.groups, DecodedMesh.from_display_lists((_display_list(),)).groups)
+        self.assertEqual(arrays.triangles.tolist(), self.arrays.triangles.tolist())
+        self.assertEqual(geometry.decoded_geometry.texture_keys, self.arrays.textures)
+        self.assertFalse(arrays.positions.flags.writeable)
+
+    def test_empty(self):
+        arrays = mesh_arrays(())
+
+        self.assertEqual(arrays.positions.shape, (0, 3))
+        self.assertEqual(arrays.triangles.shape, (0, 3))
+        self.assertEqual(arrays.uvs.shape, (0, 2))
+        self.assertEqual(arrays.textures, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import tempfile
+import unittest
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2.display_list import DisplayList
+from dk64_lib.f3dex2.texture_export import DecodedMesh, TexturedObjExporter
+from dk64_lib.mesh_cache import MeshCache
+
+
+END = b"\xdf" + bytes(7)
+TRI1 = b"\x05\x00\x02\x04\x00\x00\x00\x00"
+TRI2 = b"\x06\x00\x02\x04\x00\x02\x04\x06"
+TEXTURE_SETUP = (
+    b"\xd7\x00\x00\x01\xff\xff\xff\xff"
+    + b"\xfd\x10\x00\x00\x00\x00\x00\x07"
+    + b"\xf5\x10\x00\x00\x00\x00\x00\x00"
+    + b"\xf3\x00\x00\x00\x07\x00\x00\x00"
+    + b"\xf2\x00\x00\x00\x00\x07\xc0\x7c"
+)
+
+
+def _vtx(address: int, count: int) -> bytes:
+    return (
+        b"\x01"
+        + (count << 4).to_bytes(2, "big")
+        + bytes((count * 2,))
+        + address.to_bytes(4, "big")
+    )
+
+
+def _display_list() -> DisplayList:
+    return DisplayList(
+        raw_data=_vtx(0, 4) + TRI2 + TEXTURE_SETUP + _vtx(64, 3) + TRI1 + END,
+        raw_vertex_data=b"".join(
+            index.to_bytes(2, "big") * 3
+            + bytes(2)
+            + (index * 32).to_bytes(2, "big") * 2
+            + bytes((index, 2, 3, 255))
+            for index in range(7)
+        ),
+        vertex_pointer=0,
+        offset=0x40,
+    )
+
+
+class MeshCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = MeshCache(self.tmpdir.name, "abc123", library_version="1.0")
+        self.mesh = DecodedMesh.from_display_lists((_display_list(),))
+
+    def test_round_trip(self):
+        self.cache.save(0x1234, self.mesh)
+        loaded = self.cache.load(0x1234)
+
+        self.assertEqual(
+            self.cache.path_for(0x1234).relative_to(self.tmpdir.name),
+            Path("abc123", "00001234.mesh"),
+        )
+        self.assertEqual(loaded.group_headers, self.mesh.group_headers)
+        self.assertEqual(loaded.groups, self.mesh.groups)
+        self.assertEqual(len(loaded.groups), 2)
+        self.assertIsNotNone(loaded.groups[1].texture)
+
+    def test_exports_match_display_lists(self):
+        self.cache.save(0, self.mesh)
+        exporter = TexturedObjExporter(())
+
+        self.assertEqual(
+            exporter.export(self.cache.load(0), "geometry.mtl"),
+            exporter.export((_display_list(),), "geometry.mtl"),
+        )
+
+    def test_roms_sharing_a_directory_keep_their_own_files(self):
+        other = MeshCache(self.tmpdir.name, "def456", library_version="1.0")
+        other_mesh = DecodedMesh.from_groups(self.mesh.groups[:1])
+        self.cache.save(0, self.mesh)
+        other.save(0, other_mesh)
+
+        self.assertEqual(self.cache.load(0).groups, self.mesh.groups)
+        self.assertEqual(other.load(0).groups, other_mesh.groups)
+
+        other.clear()
+        self.assertIsNone(other.load(0))
+        self.assertIsNotNone(self.cache.load(0))
+
+    def test_close_releases_mapped_file(self):
+        self.cache.save(0, self.mesh)
+        loaded = self.cache.load(0)
+        mapped_file = loaded._mapped_file
+
+        with loaded:
+            groups = loaded.groups
+
+        self.assertTrue(mapped_file.closed)
+        self.assertEqual(loaded.groups, groups)
+        with self.assertRaises(ValueError):
+            bytes(loaded.vertex_data)
+        loaded.close()
+        self.mesh.close()
+
+    def test_clear_parse_cache_closes_cached_mesh(self):
+        rom = SimpleNamespace(mesh_cache=self.cache, get_geometry_texture_data=tuple)
+        self.cache.save(0x10, self.mesh)
+        geometry = GeometryData(bytes(0x80), 0x10, 0x80, False, rom)
+        mapped_file = geometry.decoded_mesh._mapped_file
+
+        geometry.clear_parse_cache()
+
+        self.assertTrue(mapped_file.closed)
+        self.assertNotIn("decoded_mesh", geometry.__dict__)
+
+    def test_stale_or_unreadable_files_are_misses(self):
+        self.cache.save(0, self.mesh)
+
+        self.assertIsNone(MeshCache(self.tmpdir.name, "other").load(0))
+        self.assertIsNone(
+            MeshCache(self.tmpdir.name, "abc123", library_version="2.0").load(0)
+        )
+        self.assertIsNone(self.cache.load(1))
+
+        self.cache.path_for(1).write_bytes(b"DK64MESH\xff")
+        self.assertIsNone(self.cache.load(1))
+        self.cache.path_for(2).write_bytes(b"")
+        self.assertIsNone(self.cache.load(2))
+
+    def test_get_decodes_once(self):
+        decodes = []
+
+        def decode():
+            decodes.append(True)
+            return self.mesh
+
+        self.cache.get(0, decode)
+        self.assertEqual(self.cache.get(0, decode).groups, self.mesh.groups)
+        self.assertEqual(len(decodes), 1)
+
+        self.cache.clear()
+        self.assertEqual(list(Path(self.tmpdir.name).iterdir()), [])
+
+    def test_geometry_skips_parsing_when_cached(self):
+        rom = SimpleNamespace(mesh_cache=self.cache, get_geometry_texture_data=tuple)
+        first = GeometryData(bytes(0x80), 0x10, 0x80, False, rom)
+        first.__dict__["display_lists"] = [_display_list()]
+        obj_data = first.create_textured_obj().obj_data
+
+        second = GeometryData(bytes(0x80), 0x10, 0x80, False, rom)
+        second.__dict__["display_lists"] = None
+
+        self.assertEqual(second.create_textured_obj().obj_data, obj_data)
+        self.assertTrue(self.cache.path_for(0x10).is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import random
+import unittest
+
+from dk64_lib.f3dex2.mesh_optimize import (
+    average_cache_miss_ratio,
+    optimize_vertex_cache,
+    weld_vertices,
+)
+from dk64_lib.f3dex2.texture_export import (
+    DecodedMesh,
+    TexturedObjExporter,
+    _MeshGroup,
+    _optimize_mesh_groups,
+)
+from dk64_lib.f3dex2.texture_state import _TextureKey
+from dk64_lib.f3dex2.triangle import Triangle
+from dk64_lib.f3dex2.vertex import Vertex
+
+
+def _grid_triangles(size: int) -> list[tuple[int, int, int]]:
+    triangles = []
+    for row in range(size):
+        for column in range(size):
+            corner = row * (size + 1) + column
+            triangles.append((corner, corner + 1, corner + size + 1))
+            triangles.append((corner + 1, corner + size + 2, corner + size + 1))
+    return triangles
+
+
+def _vertex(x: int, alpha: int = 255) -> Vertex:
+    return Vertex(x, 0, 0, 0, 0, 0, 255, 255, 255, alpha)
+
+
+class WeldVerticesTest(unittest.TestCase):
+    def test_drops_unused_and_merges_duplicates(self):
+        kept, triangles = weld_vertices(
+            ["a", "unused", "b", "c", "a"],
+            [(4, 2, 3), (0, 3, 2)],
+        )
+
+        self.assertEqual(kept, [4, 2, 3])
+        self.assertEqual(triangles, [(0, 1, 2), (0, 2, 1)])
+
+    def test_drops_collapsed_and_out_of_range_triangles(self):
+        kept, triangles = weld_vertices(["a", "b", "a"], [(0, 1, 2), (0, 1, 5)])
+
+        self.assertEqual(kept, [])
+        self.assertEqual(triangles, [])
+
+
+class VertexCacheTest(unittest.TestCase):
+    def test_reorders_for_cache_locality(self):
+        triangles = _grid_triangles(16)
+        random.Random(64).shuffle(triangles)
+
+        optimized = optimize_vertex_cache(triangles, 17 * 17)
+
+        self.assertEqual(sorted(optimized), sorted(triangles))
+        self.assertLess(
+            average_cache_miss_ratio(optimized),
+            average_cache_miss_ratio(triangles) / 2,
+        )
+
+    def test_empty(self):
+        self.assertEqual(optimize_vertex_cache([], 0), [])
+        self.assertEqual(average_cache_miss_ratio([]), 0.0)
+
+
+class OptimizeMeshGroupsTest(unittest.TestCase):
+    def test_merges_groups_per_material(self):
+        groups = (
+            _MeshGroup(
+                (_vertex(0), _vertex(1), _vertex(2), _vertex(9)), (Triangle(0, 1, 2),), None, 0x10
+            ),
+            _MeshGroup(
+                (_vertex(2), _vertex(1), _vertex(3)), (Triangle(1, 0, 2),), None, 0x20
+            ),
+            _MeshGroup(
+                (_vertex(0, alpha=128), _vertex(1), _vertex(2)), (Triangle(0, 1, 2),), None, 0x30
+            ),
+        )
+
+        optimized = _optimize_mesh_groups(groups)
+
+        self.assertEqual([group.display_list_offset for group in optimized], [0x10, 0x30])
+        self.assertEqual([vertex.x for vertex in optimized[0].vertices], [0, 1, 2, 3])
+        self.assertEqual(
+            {
+                tuple(optimized[0].vertices[index].x for index in (tri.v1, tri.v2, tri.v3))
+                for tri in optimized[0].triangles
+            },
+            {(0, 1, 2), (1, 2, 3)},
+        )
+        self.assertEqual(len(optimized[1].vertices), 3)
+
+    def test_keeps_blended_group_order(self):
+        def blended(x: int, offset: int, texture: _TextureKey) -> _MeshGroup:
+            vertices = (_vertex(x, alpha=128), _vertex(x + 1), _vertex(x + 2))
+            return _MeshGroup(vertices, (Triangle(0, 1, 2),), texture, offset)
+
+        water = _TextureKey(1, None, 0, 2, 32, 32)
+        glass = _TextureKey(2, None, 0, 2, 32, 32)
+        groups = (
+            blended(0, 0x10, water),
+            blended(3, 0x20, water),
+            blended(6, 0x30, glass),
+            blended(9, 0x40, water),
+        )
+
+        optimized = _optimize_mesh_groups(groups)
+
+        self.assertEqual(
+            [(group.display_list_offset, group.texture) for group in optimized],
+            [(0x10, water), (0x30, glass), (0x40, water)],
+        )
+        self.assertEqual(len(optimized[0].triangles), 2)
+
+    def test_exporter_flag(self):
+        groups = (
+            _MeshGroup((_vertex(0), _vertex(1), _vertex(2)), (Triangle(0, 1, 2),), None, 0),
+            _MeshGroup((_vertex(0), _vertex(1), _vertex(2)), (Triangle(0, 1, 2),), None, 0),
+        )
+        mesh = DecodedMesh.from_groups(groups)
+
+        plain = TexturedObjExporter(()).export(mesh, "map.mtl").obj_data
+        optimized = TexturedObjExporter((), optimize_meshes=True).export(mesh, "map.mtl").obj_data
+
+        self.assertEqual(plain.count("\nv "), 6)
+        self.assertEqual(optimized.count("\nv "), 3)
+        # Overlapping faces stay, drawing a blended face once would change its look
+        self.assertEqual(optimized.count("\nf "), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import json
+import struct
+import tempfile
+import unittest
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2.mesh_simplify import simplify_triangles
+from dk64_lib.f3dex2.texture_export import (
+    DecodedMesh,
+    TexturedGltfExporter,
+    _lod_mesh_groups,
+    _MeshGroup,
+    _TextureKey,
+)
+from dk64_lib.f3dex2.triangle import Triangle
+from dk64_lib.f3dex2.vertex import Vertex
+
+
+GRID_SIZE = 12
+
+
+def _grid() -> tuple[list[tuple[float, float, float]], list[tuple[int, int, int]]]:
+    positions = [
+        (column * 10.0, row * 10.0, 0.0)
+        for row in range(GRID_SIZE + 1)
+        for column in range(GRID_SIZE + 1)
+    ]
+    triangles = []
+    for row in range(GRID_SIZE):
+        for column in range(GRID_SIZE):
+            corner = row * (GRID_SIZE + 1) + column
+            triangles.append((corner, corner + 1, corner + GRID_SIZE + 1))
+            triangles.append((corner + 1, corner + GRID_SIZE + 2, corner + GRID_SIZE + 1))
+    return positions, triangles
+
+
+def _grid_group(texture: _TextureKey | None = None) -> _MeshGroup:
+    positions, triangles = _grid()
+    return _MeshGroup(
+        vertices=tuple(
+            Vertex(int(x), int(y), int(z), 0, 0, 0, 255, 255, 255, 255)
+            for x, y, z in positions
+        ),
+        triangles=tuple(Triangle(*triangle) for triangle in triangles),
+        texture=texture,
+        display_list_offset=0,
+    )
+
+
+def _glb_json(path: Path) -> dict:
+    data = path.read_bytes()
+    (json_length,) = struct.unpack_from("<I", data, 12)
+    return json.loads(data[20 : 20 + json_length])
+
+
+def _node_triangle_count(gltf: dict, node_index: int) -> int:
+    node = gltf["nodes"][node_index]
+    count = sum(
+        gltf["accessors"][primitive["indices"]]["count"] // 3
+        for primitive in gltf["meshes"][node["mesh"]]["primitives"]
+    ) if "mesh" in node else 0
+    return count + sum(
+        _node_triangle_count(gltf, child) for child in node.get("children", ())
+    )
+
+
+def _is_border(position: tuple[float, float, float]) -> bool:
+    return any(value in (0.0, GRID_SIZE * 10.0) for value in position[:2])
+
+
+class SimplifyTrianglesTest(unittest.TestCase):
+    def test_reduces_flat_grid_and_keeps_border(self):
+        positions, triangles = _grid()
+
+        simplified = simplify_triangles(positions, triangles, len(triangles) // 4)
+
+        self.assertLessEqual(len(simplified), len(triangles) // 4)
+        used = {index for triangle in simplified for index in triangle}
+        border = {index for index, position in enumerate(positions) if _is_border(position)}
+        self.assertTrue(border <= used)
+        for triangle in simplified:
+            p0, p1, p2 = (positions[index] for index in triangle)
+            normal_z = (p1[0] - p0[0]) * (p2[1] - p0[1]) - (p1[1] - p0[1]) * (p2[0] - p0[0])
+            self.assertGreater(normal_z, 0)
+
+    def test_locked_vertices_stay(self):
+        positions, triangles = _grid()
+        locked = {GRID_SIZE + 2, 5 * (GRID_SIZE + 1) + 5}
+
+        simplified = simplify_triangles(positions, triangles, 0, locked_vertices=locked)
+
+        self.assertTrue(locked <= {index for triangle in simplified for index in triangle})
+
+    def test_target_above_count_keeps_triangles(self):
+        positions, triangles = _grid()
+
+        self.assertEqual(simplify_triangles(positions, triangles, len(triangles)), triangles)
+
+
+class LodExportTest(unittest.TestCase):
+    def test_lod_groups_shrink_per_level(self):
+        (lod1,), (lod2,) = _lod_mesh_groups((_grid_group(),), (0.5, 0.2))
+
+        self.assertLessEqual(len(lod1.triangles), GRID_SIZE * GRID_SIZE)
+        self.assertLess(len(lod2.triangles), len(lod1.triangles))
+        self.assertLess(len(lod2.vertices), len(lod1.vertices))
+        with self.assertRaises(ValueError):
+            _lod_mesh_groups((_grid_group(),), (1.5,))
+
+    def test_gltf_links_levels_with_msft_lod(self):
+        export = TexturedGltfExporter(()).export(
+            DecodedMesh.from_groups((_grid_group(),)), lod_ratios=(0.5, 0.25)
+        )
+        gltf = json.loads(export.gltf_data)
+
+        self.assertIn("MSFT_lod", gltf["extensionsUsed"])
+        (root_index,) = gltf["scenes"][0]["nodes"]
+        root = gltf["nodes"][root_index]
+        self.assertEqual(root["name"], "lod0")
+        lod_ids = root["extensions"]["MSFT_lod"]["ids"]
+        self.assertEqual([gltf["nodes"][index]["name"] for index in lod_ids], ["lod1", "lod2"])
+        index_counts = [
+            gltf["accessors"][
+                gltf["meshes"][gltf["nodes"][gltf["nodes"][index]["children"][0]]["mesh"]][
+                    "primitives"
+                ][0]["indices"]
+            ]["count"]
+            for index in (root_index, *lod_ids)
+        ]
+        self.assertEqual(index_counts, sorted(index_counts, reverse=True))
+        self.assertLess(index_counts[2], index_counts[0])
+
+    def test_geometry_writes_separate_lod_files(self):
+        geometry = GeometryData(
+            bytes(0x80), 0, 0x80, False, SimpleNamespace(get_geometry_texture_data=tuple)
+        )
+        geometry.__dict__["decoded_mesh"] = DecodedMesh.from_groups((_grid_group(),))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = geometry.save_to_glb("map.glb", tmpdir, lod_ratios=(0.5,), lod_files=True)
+
+            self.assertEqual(
+                paths, [Path(tmpdir, "map.glb"), Path(tmpdir, "map_lod1.glb")]
+            )
+            self.assertLess(paths[1].stat().st_size, paths[0].stat().st_size)
+
+    def test_lod_files_match_msft_lod_levels(self):
+        # Untextured copies of textured triangles are dropped before simplifying
+        rom = SimpleNamespace(
+            get_geometry_texture_data=lambda: [SimpleNamespace(raw_data=b"\xff\xff" * 4)]
+        )
+        untextured = _grid_group()
+        untextured = _MeshGroup(
+            untextured.vertices,
+            untextured.triangles[: len(untextured.triangles) // 2],
+            None,
+            0x10,
+        )
+        geometry = GeometryData(bytes(0x80), 0, 0x80, False, rom)
+        geometry.__dict__["decoded_mesh"] = DecodedMesh.from_groups(
+            (_grid_group(_TextureKey(0, None, 0, 2, 2, 2)), untextured)
+        )
+        lod_ratios = (0.5, 0.25)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (linked_path,) = geometry.save_to_glb("linked.glb", tmpdir, lod_ratios=lod_ratios)
+            split_paths = geometry.save_to_glb(
+                "split.glb", tmpdir, lod_ratios=lod_ratios, lod_files=True
+            )
+            linked = _glb_json(linked_path)
+            split = [_glb_json(path) for path in split_paths]
+
+        (root_index,) = linked["scenes"][0]["nodes"]
+        lod_ids = linked["nodes"][root_index]["extensions"]["MSFT_lod"]["ids"]
+        self.assertEqual(
+            [_node_triangle_count(linked, index) for index in (root_index, *lod_ids)],
+            [
+                sum(_node_triangle_count(level, index) for index in level["scenes"][0]["nodes"])
+                for level in split
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import json
+import struct
+import tempfile
+import unittest
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2 import texture_export
+from dk64_lib.f3dex2.texture_export import (
+    DecodedMesh,
+    TexturedGltfExporter,
+    _MeshGroup,
+    _tile_mesh_groups,
+    save_textured_glb_tile_stream,
+    save_textured_glb_tiles,
+)
+from dk64_lib.f3dex2.triangle import Triangle
+from dk64_lib.f3dex2.vertex import Vertex
+
+
+def _quad_group(x: int, z: int, size: int = 100, offset: int = 0) -> _MeshGroup:
+    corners = ((x, z), (x + size, z), (x, z + size), (x + size, z + size))
+    return _MeshGroup(
+        vertices=tuple(
+            Vertex(corner_x, 5, corner_z, 0, 0, 0, 255, 255, 255, 255)
+            for corner_x, corner_z in corners
+        ),
+        triangles=(Triangle(0, 1, 2), Triangle(1, 3, 2)),
+        texture=None,
+        display_list_offset=offset,
+    )
+
+
+def _glb_json(data: bytes) -> dict:
+    (json_length,) = struct.unpack_from("<I", data, 12)
+    return json.loads(data[20 : 20 + json_length])
+
+
+class TileMeshGroupsTest(unittest.TestCase):
+    def test_splits_triangles_by_centroid(self):
+        groups = (_quad_group(0, 0), _quad_group(1000, 0, offset=0x20), _quad_group(-200, 1500))
+
+        tiles = _tile_mesh_groups(groups, 1000)
+
+        self.assertEqual(set(tiles), {(0, 0), (1, 0), (-1, 1)})
+        (tile,) = tiles[(1, 0)]
+        self.assertEqual(tile.display_list_offset, 0x20)
+        self.assertEqual(len(tile.triangles), 2)
+        self.assertEqual(len(tile.vertices), 4)
+
+    def test_straddling_group_keeps_only_used_vertices(self):
+        tiles = _tile_mesh_groups((_quad_group(0, 0, size=150),), 100)
+
+        self.assertEqual(set(tiles), {(0, 0), (1, 1)})
+        for (group,) in tiles.values():
+            self.assertEqual(len(group.triangles), 1)
+            self.assertEqual(len(group.vertices), 3)
+
+        with self.assertRaises(ValueError):
+            _tile_mesh_groups((), 0)
+
+
+class TiledGlbExportTest(unittest.TestCase):
+    def test_tiles_are_valid_glbs_with_bounds(self):
+        mesh = DecodedMesh.from_groups((_quad_group(0, 0), _quad_group(2500, 500)))
+
+        tile_set = TexturedGltfExporter(()).export_glb_tiles(mesh, 1000)
+
+        self.assertEqual([(tile.column, tile.row) for tile in tile_set.tiles], [(0, 0), (2, 0)])
+        self.assertEqual(tile_set.tiles[1].bounds_min, (2500, 5, 500))
+        self.assertEqual(tile_set.tiles[1].bounds_max, (2600, 5, 600))
+        for tile in tile_set.tiles:
+            self.assertEqual(tile.export.data[:4], b"glTF")
+            self.assertEqual(_glb_json(tile.export.data)["accessors"][0]["count"], 4)
+        tile_set.close()
+        self.assertTrue(all(tile.export.binary.spool.closed for tile in tile_set.tiles))
+
+    def test_stream_builds_each_tile_after_closing_the_last(self):
+        mesh = DecodedMesh.from_groups(
+            tuple(_quad_group(column * 1000, 0) for column in range(4))
+        )
+        written = []
+
+        def tiles():
+            for tile in TexturedGltfExporter(()).iter_glb_tiles(mesh, 1000):
+                self.assertTrue(all(tile.export.binary.spool.closed for tile in written))
+                written.append(tile)
+                yield tile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = save_textured_glb_tile_stream(tiles(), 1000, "map.json", tmpdir)
+            manifest = json.loads(Path(tmpdir, "map.json").read_text())
+
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(len(manifest["tiles"]), 4)
+        self.assertEqual(manifest["max"], [3100, 5, 100])
+        self.assertTrue(all(tile.export.binary.spool.closed for tile in written))
+
+    def test_failed_write_closes_every_tile(self):
+        mesh = DecodedMesh.from_groups((_quad_group(0, 0), _quad_group(2500, 500)))
+        tile_set = TexturedGltfExporter(()).export_glb_tiles(mesh, 1000)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # A file where the tile folder should go stops the first write
+            Path(tmpdir, "map").write_bytes(b"")
+            with self.assertRaises(OSError):
+                save_textured_glb_tiles(tile_set, "map.json", tmpdir)
+
+        self.assertTrue(all(tile.export.binary.spool.closed for tile in tile_set.tiles))
+
+    def test_failed_build_closes_built_tiles(self):
+        mesh = DecodedMesh.from_groups((_quad_group(0, 0), _quad_group(2500, 500)))
+        built = []
+        build_tile = texture_export._gltf_mesh
+
+        def gltf_mesh(*args, **kwargs):
+            if built:
+                raise RuntimeError("tile failed")
+            built.append(build_tile(*args, **kwargs))
+            return built[-1]
+
+        with mock.patch.object(texture_export, "_gltf_mesh", side_effect=gltf_mesh):
+            with self.assertRaises(RuntimeError):
+                TexturedGltfExporter(()).export_glb_tiles(mesh, 1000)
+
+        ((_, binary),) = built
+        self.assertTrue(binary.spool.closed)
+
+    def test_geometry_writes_manifest(self):
+        geometry = GeometryData(
+            bytes(0x80), 0, 0x80, False, SimpleNamespace(get_geometry_texture_data=tuple)
+        )
+        geometry.__dict__["decoded_mesh"] = DecodedMesh.from_groups(
+            (_quad_group(0, 0), _quad_group(-500, 300))
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = geometry.save_to_tiled_glb("map.json", tmpdir, tile_size=400)
+            manifest = json.loads(Path(tmpdir, "map.json").read_text())
+
+            self.assertEqual(
+                paths,
+                [
+                    Path(tmpdir, "map.json"),
+                    Path(tmpdir, "map", "tile_-2_0.glb"),
+                    Path(tmpdir, "map", "tile_0_0.glb"),
+                ],
+            )
+            self.assertTrue(all(path.is_file() for path in paths))
+            self.assertEqual(manifest["tile_size"], 400)
+            self.assertEqual(manifest["min"], [-500, 5, 0])
+            self.assertEqual(manifest["max"], [100, 5, 400])
+            self.assertEqual(
+                [tile["uri"] for tile in manifest["tiles"]],
+                ["map/tile_-2_0.glb", "map/tile_0_0.glb"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
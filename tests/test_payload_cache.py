@@ -0,0 +1,103 @@
+import gc
+import gzip
+import io
+import unittest
+import weakref
+
+from dk64_lib.data_types import MidiMusicData
+from dk64_lib.payload_cache import PayloadCache
+from dk64_lib.rom import Rom
+
+
+def _table_rom(*payloads: bytes) -> Rom:
+    """A ROM whose pointer table 0 points at the given payloads"""
+    data = bytearray(0x300)
+    data[32 * 4 : 32 * 4 + 4] = len(payloads).to_bytes(4, "big")
+    data[0:4] = (0x200).to_bytes(4, "big")
+    position = 0x300
+    for entry_index, payload in enumerate(payloads + (b"",)):
+        pointer = 0x200 + entry_index * 4
+        data[pointer : pointer + 4] = position.to_bytes(4, "big")
+        position += len(payload)
+    for payload in payloads:
+        data += payload
+
+    rom = Rom.__new__(Rom)
+    rom.rom_fh = io.BytesIO(bytes(data))
+    rom.release_or_kiosk = "release"
+    rom.pointer_table_offset = 0
+    return rom
+
+
+class PayloadCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used_payloads_over_budget(self):
+        payload_cache = PayloadCache(max_bytes=10)
+        payload_cache.put("a", b"aaaa")
+        payload_cache.put("b", b"bbbb")
+        self.assertEqual(payload_cache.get("a"), b"aaaa")
+
+        payload_cache.put("c", b"cccc")
+
+        self.assertIsNone(payload_cache.get("b"))
+        self.assertEqual(payload_cache.get("a"), b"aaaa")
+        info = payload_cache.info()
+        self.assertEqual((info.entries, info.current_bytes), (2, 8))
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_payloads_larger_than_the_budget_are_not_cached(self):
+        payload_cache = PayloadCache(max_bytes=2)
+        payload_cache.put("a", b"aaaa")
+        self.assertEqual(len(payload_cache), 0)
+
+
+class RomPayloadTest(unittest.TestCase):
+    def setUp(self):
+        self.compressed = b"music" * 20
+        self.rom = _table_rom(gzip.compress(self.compressed), b"stub")
+
+    def test_entries_reload_payloads_through_the_cache(self):
+        entries = self.rom.get_midi_music_data()
+
+        self.assertIsInstance(entries[0], MidiMusicData)
+        self.assertIsNone(entries[0]._raw_data)
+        self.assertTrue(entries[0].was_compressed)
+        self.assertEqual(entries[0].raw_data, self.compressed)
+        self.assertEqual(entries[1].raw_data, b"stub")
+
+        self.rom.payload_cache.clear()
+        self.assertEqual(entries[0].raw_data, self.compressed)
+        self.assertEqual(self.rom.cache_info()["payloads"].misses, 1)
+
+    def test_cache_info_and_clear_caches(self):
+        entries = self.rom.get_midi_music_data()
+        self.assertIs(self.rom.get_midi_music_data(), entries)
+
+        info = self.rom.cache_info()
+        self.assertEqual(info["get_stub_table_data"], 1)
+        self.assertEqual(info["payloads"].entries, 2)
+
+        self.rom.clear_caches()
+
+        info = self.rom.cache_info()
+        self.assertNotIn("get_stub_table_data", info)
+        self.assertEqual(info["payloads"].entries, 0)
+        self.assertIsNot(self.rom.get_midi_music_data(), entries)
+
+    def test_cached_methods_accept_keyword_arguments(self):
+        entries = self.rom.get_stub_table_data(table_id=0)
+
+        self.assertIs(self.rom.get_stub_table_data(table_id=0), entries)
+        self.assertEqual([entry.raw_data for entry in entries], [self.compressed, b"stub"])
+
+    def test_cached_tables_do_not_keep_the_rom_alive(self):
+        self.rom.get_midi_music_data()
+        rom_ref = weakref.ref(self.rom)
+
+        del self.rom
+        gc.collect()
+
+        self.assertIsNone(rom_ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
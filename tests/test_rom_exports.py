@@ -1,12 +1,14 @@
 import tempfile
 import unittest
 
+from functools import cached_property
 from inspect import signature
 from pathlib import Path
 from types import SimpleNamespace
 
 from dk64_lib.data_types.geometry import GeometryData
 from dk64_lib.f3dex2.display_list import DisplayList
+from dk64_lib.f3dex2.texture_export import DecodedMesh
 from dk64_lib.rom import Rom
 
 
@@ -72,6 +74,10 @@ class _FakeGeometry:
 
     def __init__(self):
         self.save_call = None
+        self.parse_cache_cleared = False
+
+    def clear_parse_cache(self):
+        self.parse_cache_cleared = True
 
     def save_to_obj(
         self,
@@ -247,6 +253,18 @@ class RomExportTest(unittest.TestCase):
             self.assertTrue(glb_path.exists())
             self.assertEqual(pointer_path.read_text(), "points_to=0\n")
 
+    def test_export_geometries_keeps_parse_cache_unless_asked(self):
+        rom = _fake_rom()
+        geometry = _FakeGeometry()
+        rom.geometry_tables = [geometry]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            Rom.export_geometries(rom, tmpdir)
+            self.assertFalse(geometry.parse_cache_cleared)
+
+            Rom.export_geometries(rom, tmpdir, clear_parse_cache=True)
+            self.assertTrue(geometry.parse_cache_cleared)
+
     def test_export_geometries_can_skip_textures(self):
         rom = _fake_rom()
         geometry = _FakeGeometry()
@@ -368,12 +386,39 @@ class RomExportTest(unittest.TestCase):
             self.assertEqual(paths, [cutscene_path])
             self.assertEqual(cutscene_path.read_bytes(), b"cutscene")
 
+    def test_texture_images_drop_geometry_parsed_for_them(self):
+        class _LazyGeometry(GeometryData):
+            @cached_property
+            def display_lists(self) -> list[DisplayList]:
+                return [_textured_triangle_display_list()]
+
+        rom = _fake_rom()
+        parsed, unparsed = (
+            _LazyGeometry(bytes(0x80), offset, 0x80, False, rom) for offset in (0x10, 0x90)
+        )
+        parsed.decoded_mesh
+        rom.geometry_tables = [parsed, unparsed]
+        rom.get_geometry_texture_data = lambda: [
+            SimpleNamespace(raw_data=_rgba16(255, 0, 0) * 4)
+        ]
+
+        images = Rom.create_texture_images(rom, include_guessed=False, processes=1)
+
+        self.assertEqual(
+            [image.filename for image in images], ["table_25/tex_0_pal_none_f0_s2_2x2.png"]
+        )
+        self.assertIn("decoded_mesh", parsed.__dict__)
+        self.assertNotIn("decoded_mesh", unparsed.__dict__)
+        self.assertNotIn("display_lists", unparsed.__dict__)
+
     def test_export_textures_writes_geometry_pngs(self):
         rom = _fake_rom()
         rom.geometry_tables = [
             SimpleNamespace(
                 is_pointer=False,
-                display_lists=[_textured_triangle_display_list()],
+                decoded_mesh=DecodedMesh.from_display_lists(
+                    [_textured_triangle_display_list()]
+                ),
             )
         ]
         rom.get_geometry_texture_data = lambda: [
@@ -0,0 +1,156 @@
+import gzip
+import random
+import unittest
+
+from types import SimpleNamespace
+
+from dk64_lib.rom import Rom, TableEntry
+from dk64_lib.rom_verify import (
+    CIC_SEEDS,
+    CRC_LENGTH,
+    CRC_START,
+    check_gzip_payload,
+    check_table_entries,
+    compute_header_crcs,
+    verify_rom,
+)
+
+
+def _reference_crcs(rom_data: bytes, cic: int) -> tuple[int, int]:
+    """Straight port of the word-by-word checksum loop used by n64crc"""
+    mask = 0xFFFFFFFF
+    seed = CIC_SEEDS[cic]
+    t1 = t2 = t3 = t4 = t5 = t6 = seed
+    for offset in range(CRC_START, CRC_START + CRC_LENGTH, 4):
+        word = int.from_bytes(rom_data[offset : offset + 4], "big")
+        if (t6 + word) & mask < t6:
+            t4 = (t4 + 1) & mask
+        t6 = (t6 + word) & mask
+        t3 ^= word
+        shift = word & 0x1F
+        rotated = ((word << shift) | (word >> (32 - shift))) & mask
+        t5 = (t5 + rotated) & mask
+        if t2 > word:
+            t2 ^= rotated
+        else:
+            t2 ^= t6 ^ word
+        if cic == 6105:
+            table_offset = 0x0750 + (offset & 0xFF)
+            table_word = int.from_bytes(rom_data[table_offset : table_offset + 4], "big")
+            t1 = (t1 + (table_word ^ word)) & mask
+        else:
+            t1 = (t1 + (t5 ^ word)) & mask
+    if cic == 6103:
+        return ((t6 ^ t4) + t3) & mask, ((t5 ^ t2) + t1) & mask
+    if cic == 6106:
+        return ((t6 * t4) + t3) & mask, ((t5 * t2) + t1) & mask
+    return t6 ^ t4 ^ t3, t5 ^ t2 ^ t1
+
+
+def _random_rom(size: int = CRC_START + CRC_LENGTH + 0x100) -> bytearray:
+    return bytearray(random.Random(64).randbytes(size))
+
+
+class HeaderCrcTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rom_data = bytes(_random_rom())
+
+    def test_vectorised_crc_matches_reference_for_each_cic(self):
+        for cic in (6102, 6103, 6105, 6106):
+            with self.subTest(cic=cic):
+                self.assertEqual(
+                    compute_header_crcs(self.rom_data, cic),
+                    _reference_crcs(self.rom_data, cic),
+                )
+
+    def test_rejects_short_roms(self):
+        with self.assertRaises(ValueError):
+            compute_header_crcs(b"\x80" * 0x2000)
+
+    def test_verify_reports_header_crc(self):
+        rom_data = bytearray(self.rom_data)
+        crc1, crc2 = compute_header_crcs(self.rom_data)
+        rom_data[0x10:0x18] = crc1.to_bytes(4, "big") + crc2.to_bytes(4, "big")
+
+        report = verify_rom(bytes(rom_data), [], processes=1)
+        self.assertTrue(report.header_crc_ok)
+        self.assertTrue(report.ok)
+
+        rom_data[0x2000] ^= 0xFF
+        report = verify_rom(bytes(rom_data), [], processes=1)
+        self.assertFalse(report.header_crc_ok)
+        self.assertFalse(report.ok)
+
+
+class TableEntryCheckTest(unittest.TestCase):
+    def setUp(self):
+        self.good = gzip.compress(b"table entry" * 64)
+        bad_crc = bytearray(self.good)
+        bad_crc[-8] ^= 0xFF
+        self.bad_crc = bytes(bad_crc)
+        bad_size = bytearray(self.good)
+        bad_size[-4] ^= 0xFF
+        self.bad_size = bytes(bad_size)
+        self.truncated = self.good[:-12]
+
+    def test_gzip_payload_checks_trailer(self):
+        self.assertIsNone(check_gzip_payload(self.good))
+        self.assertIsNone(check_gzip_payload(self.good + b"\x00" * 6))
+        self.assertIn("CRC32", check_gzip_payload(self.bad_crc))
+        self.assertIn("ISIZE", check_gzip_payload(self.bad_size))
+        self.assertIn("truncated", check_gzip_payload(self.truncated))
+
+    def test_reports_corrupt_and_truncated_entries(self):
+        rom_data = b"".join(
+            (self.good, self.bad_crc, self.truncated, b"uncompressed")
+        )
+        starts = (
+            0,
+            len(self.good),
+            len(self.good) + len(self.bad_crc),
+            len(self.good) + len(self.bad_crc) + len(self.truncated),
+        )
+        entries = [
+            (1, 0, starts[0], starts[1]),
+            (1, 1, starts[1], starts[2]),
+            (1, 2, starts[2], starts[3]),
+            (7, 0, starts[3], len(rom_data)),
+            (7, 1, 40, 20),
+            (7, 2, len(rom_data) - 4, len(rom_data) + 16),
+        ]
+
+        for processes in (1, 2):
+            with self.subTest(processes=processes):
+                checked, issues = check_table_entries(rom_data, entries, processes)
+                self.assertEqual(checked, 6)
+                self.assertEqual(
+                    [(issue.table_id, issue.index) for issue in issues],
+                    [(1, 1), (1, 2), (7, 1), (7, 2)],
+                )
+
+    def test_rom_verify_checks_requested_tables(self):
+        rom = Rom.__new__(Rom)
+        rom.rom_fh = SimpleNamespace(close=lambda: None)
+        rom_data = self.good + self.bad_crc
+        rom._read_rom_data = lambda: rom_data
+        rom._table_location = lambda table_id: (table_id, 2)
+        rom._read_table_entries = lambda start, size: (
+            TableEntry(0, 0, len(self.good)),
+            TableEntry(1, len(self.good), len(rom_data)),
+            TableEntry(2, len(rom_data), len(rom_data)),
+        )
+
+        report = rom.verify(tables=(1,), processes=1)
+
+        self.assertIsNone(report.header_crc)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.checked_entries, 2)
+        self.assertEqual(
+            [(issue.table_id, issue.index) for issue in report.entry_issues],
+            [(1, 1)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
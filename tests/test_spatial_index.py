@@ -0,0 +1,150 @@
+import math
+import random
+import unittest
+
+from types import SimpleNamespace
+
+import numpy
+
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2.spatial_index import (
+    SpatialIndex,
+    _closest_points_on_triangles,
+    _ray_triangle_distances,
+)
+
+
+GRID_SIZE = 20
+
+
+def _terrain() -> tuple[numpy.ndarray, numpy.ndarray]:
+    """A bumpy grid of 50 unit squares with a floating platform above it"""
+    rng = random.Random(40)
+    positions = [
+        (column * 50.0, rng.uniform(-20, 20), row * 50.0)
+        for row in range(GRID_SIZE + 1)
+        for column in range(GRID_SIZE + 1)
+    ]
+    triangles = []
+    for row in range(GRID_SIZE):
+        for column in range(GRID_SIZE):
+            corner = row * (GRID_SIZE + 1) + column
+            triangles.append((corner, corner + GRID_SIZE + 1, corner + 1))
+            triangles.append((corner + 1, corner + GRID_SIZE + 1, corner + GRID_SIZE + 2))
+
+    platform = len(positions)
+    positions.extend(((200, 300, 200), (400, 300, 200), (200, 300, 400), (400, 300, 400)))
+    triangles.extend(
+        ((platform, platform + 2, platform + 1), (platform + 1, platform + 2, platform + 3))
+    )
+    return numpy.array(positions, dtype=numpy.float32), numpy.array(triangles, dtype=numpy.uint32)
+
+
+class SpatialIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.positions, self.triangles = _terrain()
+        self.index = SpatialIndex(self.positions, self.triangles)
+        self.corners = self.positions[self.triangles].astype(numpy.float64)
+        self.rng = random.Random(64)
+
+    def test_raycast_matches_brute_force(self):
+        for _ in range(200):
+            origin = numpy.array(
+                [
+                    self.rng.uniform(-200, 1200),
+                    self.rng.uniform(-100, 500),
+                    self.rng.uniform(-200, 1200),
+                ]
+            )
+            direction = numpy.array([self.rng.uniform(-1, 1) for _ in range(3)])
+            distances = _ray_triangle_distances(
+                origin, direction / numpy.linalg.norm(direction), self.corners
+            )
+
+            hit = self.index.raycast(origin, direction)
+
+            if math.isinf(distances.min()):
+                self.assertIsNone(hit)
+            else:
+                self.assertAlmostEqual(hit.distance, distances.min(), places=6)
+
+    def test_vertical_ray_hits_platform_first(self):
+        hit = self.index.raycast((300, 1000, 300), (0, -5, 0))
+
+        self.assertEqual(hit.triangle, 2 * GRID_SIZE * GRID_SIZE)
+        self.assertAlmostEqual(hit.distance, 700)
+        self.assertEqual(hit.point, (300.0, 300.0, 300.0))
+        self.assertIsNone(self.index.raycast((300, 1000, 300), (0, -1, 0), max_distance=500))
+        self.assertIsNone(self.index.raycast((300, 1000, 300), (0, 1, 0)))
+
+    def test_nearest_matches_brute_force(self):
+        for _ in range(100):
+            point = numpy.array(
+                [
+                    self.rng.uniform(-300, 1300),
+                    self.rng.uniform(-100, 400),
+                    self.rng.uniform(-300, 1300),
+                ]
+            )
+            closest = _closest_points_on_triangles(point, self.corners)
+            distances = numpy.linalg.norm(closest - point, axis=1)
+
+            hit = self.index.nearest(point)
+
+            self.assertAlmostEqual(hit.distance, distances.min(), places=6)
+        self.assertIsNone(self.index.nearest((5000, 0, 5000), max_distance=100))
+
+    def test_closest_point_on_triangle(self):
+        corners = numpy.array([[[0, 0, 0], [10, 0, 0], [0, 0, 10]]], dtype=numpy.float64)
+
+        for point, expected in (
+            ((2, 5, 2), (2, 0, 2)),
+            ((-3, 1, -4), (0, 0, 0)),
+            ((5, 0, -2), (5, 0, 0)),
+            ((10, 0, 10), (5, 0, 5)),
+        ):
+            numpy.testing.assert_allclose(
+                _closest_points_on_triangles(numpy.array(point, dtype=numpy.float64), corners)[0],
+                expected,
+            )
+
+    def test_overlapping_matches_brute_force(self):
+        minimum = numpy.array((120.0, -5.0, 80.0))
+        maximum = numpy.array((260.0, 10.0, 310.0))
+        triangle_min = self.corners.min(axis=1)
+        triangle_max = self.corners.max(axis=1)
+        expected = numpy.flatnonzero(
+            numpy.all((triangle_min <= maximum) & (triangle_max >= minimum), axis=1)
+        )
+
+        numpy.testing.assert_array_equal(self.index.overlapping(minimum, maximum), expected)
+        self.assertEqual(len(self.index.overlapping((2000, 0, 2000), (3000, 10, 3000))), 0)
+
+    def test_height_at(self):
+        floor = self.index.height_at(300, 300, below=200)
+        hit = self.index.raycast((300, 200, 300), (0, -1, 0))
+
+        self.assertAlmostEqual(floor, hit.point[1])
+        self.assertAlmostEqual(self.index.height_at(300, 300), 300)
+        self.assertIsNone(self.index.height_at(5000, 5000))
+
+    def test_skips_out_of_range_triangles(self):
+        index = SpatialIndex(self.positions, numpy.array([[0, 1, 99999], [0, 21, 1]]))
+
+        hit = index.raycast((10, 100, 10), (0, -1, 0))
+
+        self.assertEqual(hit.triangle, 1)
+        self.assertEqual(index.triangle_count, 2)
+
+    def test_geometry_caches_index(self):
+        geometry = GeometryData(bytes(0x80), 0, 0x80, False, SimpleNamespace())
+        geometry.__dict__["display_lists"] = []
+
+        self.assertIs(geometry.spatial_index, geometry.spatial_index)
+        self.assertIsNone(geometry.spatial_index.raycast((0, 0, 0), (0, -1, 0)))
+        geometry.clear_parse_cache()
+        self.assertNotIn("spatial_index", geometry.__dict__)
+
+
+if __name__ == "__main__":
+    unittest.main()
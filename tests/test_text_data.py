@@ -4,7 +4,13 @@ import unittest
 from dataclasses import FrozenInstanceError
 from pathlib import Path
 
-from dk64_lib.data_types.text import _Text, _TextLine, _TextLineFragment
+from dk64_lib.data_types.text import (
+    TextData,
+    _Sprite,
+    _Text,
+    _TextLine,
+    _TextLineFragment,
+)
 from dk64_lib.rom import Rom
 
 
@@ -44,5 +50,49 @@ class TextDataTest(unittest.TestCase):
             text.text = "changed"
 
 
+def _text_table() -> bytes:
+    """One line made of a text fragment ("PRESS") and a sprite fragment (a_button)"""
+    raw = bytearray(28)
+    raw[0] = 1  # line count
+    raw[1] = 2  # fragment count
+    raw[2] = 0x01  # text fragment
+    raw[3] = 1  # one text item
+    raw[8:10] = (5).to_bytes(2, "big")  # text size, starting at offset 0
+    raw[16] = 0x02  # sprite fragment
+    raw[17:21] = bytes((1, 0, 110, 0))  # one sprite item, sprite 110
+    return bytes(raw) + b"PRESS"
+
+
+class TextParsingTest(unittest.TestCase):
+    def setUp(self):
+        self.text_data = TextData(
+            raw_data=_text_table(),
+            offset=0,
+            size=33,
+            was_compressed=False,
+            rom=None,
+            release_or_kiosk="release",
+        )
+
+    def test_parses_text_and_sprite_fragments(self):
+        (text_line,) = self.text_data.text_lines
+
+        self.assertEqual(text_line.text, "PRESS a_button")
+        self.assertEqual(text_line.section1count, 2)
+        self.assertEqual(text_line.data_start, "0x1")
+        self.assertEqual(text_line.arr, _text_table()[1:25])
+
+        text_fragment, sprite_fragment = text_line.sentence_fragments
+        self.assertEqual(text_fragment.text, (_Text(start=0, size=5, text="PRESS"),))
+        self.assertEqual(sprite_fragment.text[0].sprite, "a_button")
+        self.assertIsInstance(sprite_fragment.text[0], _Sprite)
+
+    def test_line_text_is_decoded_once(self):
+        (text_line,) = self.text_data.text_lines
+
+        fragments = text_line.sentence_fragments
+        self.assertIs(text_line.sentence_fragments, fragments)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,140 @@
+import json
+import tempfile
+import unittest
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from dk64_lib.rom import Rom
+from dk64_lib.text_index import TEXT_INDEX_FORMAT, TextHit, TextIndex, tokenize
+
+
+def _table(*lines: str) -> SimpleNamespace:
+    return SimpleNamespace(text_lines=[SimpleNamespace(text=line) for line in lines])
+
+
+def _tables() -> list[SimpleNamespace]:
+    return [
+        _table("PRESS a_button TO JUMP.", "Hey, it's DK!"),
+        _table("PRESS b_button TO PUNCH.", "JUMP onto the barrel and PRESS a_button"),
+    ]
+
+
+class TextIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = TextIndex.from_text_tables(_tables(), region="us")
+
+    def test_tokenize_keeps_sprite_names_whole(self):
+        self.assertEqual(tokenize("PRESS a_button, it's DK!"), ["press", "a_button", "it's", "dk"])
+
+    def test_search_matches_all_tokens_in_any_order(self):
+        hits = self.index.search("a_button press")
+
+        self.assertEqual(
+            hits,
+            (
+                TextHit("us", 0, 0, "PRESS a_button TO JUMP."),
+                TextHit("us", 1, 1, "JUMP onto the barrel and PRESS a_button"),
+            ),
+        )
+        self.assertEqual(self.index.search("a_button punch"), ())
+
+    def test_prefix_search(self):
+        hits = self.index.search("pun", prefix=True)
+        self.assertEqual([(hit.table, hit.line) for hit in hits], [(1, 0)])
+
+        hits = self.index.search("_button", prefix=True)
+        self.assertEqual(hits, ())
+
+        hits = self.index.search("press b", prefix=True)
+        self.assertEqual([(hit.table, hit.line) for hit in hits], [(1, 0), (1, 1)])
+
+    def test_phrase_search_requires_adjacent_tokens(self):
+        hits = self.index.search_phrase("press a_button")
+        self.assertEqual([(hit.table, hit.line) for hit in hits], [(0, 0), (1, 1)])
+
+        hits = self.index.search_phrase("to jump")
+        self.assertEqual([(hit.table, hit.line) for hit in hits], [(0, 0)])
+
+        self.assertEqual(self.index.search_phrase("jump to"), ())
+
+    def test_region_filter(self):
+        for table_index, table in enumerate(_tables()):
+            self.index.add_table(table_index, table, region="pal")
+
+        self.assertEqual(self.index.regions, ("us", "pal"))
+        self.assertEqual(len(self.index.search("jump")), 4)
+        self.assertEqual(
+            [hit.region for hit in self.index.search("jump", region="pal")],
+            ["pal", "pal"],
+        )
+
+    def test_save_and_load_round_trip(self):
+        self.index.rom_sha1 = "abc"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = self.index.save(Path(tmpdir) / "index.json")
+            loaded = TextIndex.load(path)
+
+        self.assertEqual(loaded.rom_sha1, "abc")
+        self.assertEqual(len(loaded), 4)
+        self.assertEqual(loaded.search_phrase("press a_button"), self.index.search_phrase("press a_button"))
+        self.assertEqual(loaded.search("ba", prefix=True), self.index.search("ba", prefix=True))
+
+    def test_malformed_data_raises_value_error(self):
+        data = self.index.to_dict()
+        for broken in (
+            [],
+            {"format": data["format"]},
+            {**data, "lines": [["us", 0]]},
+            {**data, "postings": {"jump": [7]}},
+            {**data, "postings": []},
+        ):
+            with self.subTest(broken=broken), self.assertRaises(ValueError):
+                TextIndex.from_dict(broken)
+
+
+class RomTextIndexTest(unittest.TestCase):
+    def _fake_rom(self, tmpdir: str) -> Rom:
+        rom = Rom.__new__(Rom)
+        rom.rom_fh = SimpleNamespace(close=lambda: None)
+        rom.rom_path = Path(tmpdir) / "dk64.z64"
+        rom.text_tables = _tables()
+        rom.region = "us"
+        rom.sha1 = "abc"
+        return rom
+
+    def test_text_index_is_built_saved_and_reused(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rom = self._fake_rom(tmpdir)
+            self.assertEqual(len(rom.text_index.search("jump")), 2)
+
+            path = rom.save_text_index()
+            self.assertEqual(path, Path(tmpdir) / "dk64.z64.text_index.json")
+
+            reloaded = self._fake_rom(tmpdir)
+            reloaded.text_tables = []
+            self.assertEqual(len(reloaded.text_index.search("jump")), 2)
+
+    def test_saved_index_from_another_rom_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rom = self._fake_rom(tmpdir)
+            rom.save_text_index()
+
+            other = self._fake_rom(tmpdir)
+            other.sha1 = "def"
+            other.text_tables = [_table("DIDDY")]
+            self.assertEqual(len(other.text_index), 1)
+            self.assertEqual(other.text_index.rom_sha1, "def")
+
+    def test_malformed_saved_index_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rom = self._fake_rom(tmpdir)
+            rom.text_index_path.write_text(
+                json.dumps({"format": TEXT_INDEX_FORMAT, "rom_sha1": "abc"})
+            )
+
+            self.assertEqual(len(rom.text_index.search("jump")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from types import SimpleNamespace
+
+from dk64_lib.f3dex2.texture_batch import TextureBatch, TextureImageJob
+from dk64_lib.f3dex2.texture_export import TexturedObjExporter
+from dk64_lib.f3dex2.texture_state import _TextureKey
+
+
+def _raw_textures() -> list[bytes | None]:
+    rng = random.Random(48)
+    return [
+        bytes(rng.randrange(256) for _ in range(length))
+        for length in (0x20, 0x800, 0x200, 0x80)
+    ] + [None]
+
+
+TEXTURES = (
+    _TextureKey(0, None, 0, 2, 4, 4),
+    _TextureKey(1, None, 0, 2, 32, 32, clamp_s=True),
+    _TextureKey(2, 3, 2, 0, 16, 16),
+    _TextureKey(4, None, 0, 2, 2, 2),
+)
+
+
+class TextureBatchTest(unittest.TestCase):
+    def test_matches_serial_exporter(self):
+        raw_textures = _raw_textures()
+        exporter = TexturedObjExporter(SimpleNamespace(raw_data=raw) for raw in raw_textures)
+        expected = tuple(
+            image
+            for texture in TEXTURES
+            for image in exporter._texture_key_images(texture, "textures")
+        )
+
+        for processes in (1, 2):
+            with TextureBatch(raw_textures, processes) as batch:
+                self.assertEqual(batch.texture_images(TEXTURES, "textures"), expected)
+
+    def test_jobs_keep_order_and_release_shared_memory(self):
+        raw_textures = _raw_textures()
+        jobs = [
+            TextureImageJob(f"{index}.png", index, 0, 2, 8, 2) for index in range(3)
+        ]
+
+        with TextureBatch(raw_textures, processes=1) as batch:
+            expected = batch.images(jobs)
+        batch = TextureBatch(raw_textures, processes=2)
+        images = batch.images(jobs)
+        memory = batch._memory
+        batch.close()
+
+        self.assertEqual(images, expected)
+        self.assertEqual([image.filename for image in images], ["0.png", "1.png", "2.png"])
+        self.assertIsNotNone(memory)
+        self.assertIsNone(batch._memory)
+        with self.assertRaises(FileNotFoundError):
+            type(memory)(name=memory.name)
+
+    def test_streaming_stays_within_buffer(self):
+        raw_textures = [bytes([index]) * 0x20 for index in range(40)]
+        jobs = [
+            TextureImageJob(f"{index}.png", index, 0, 2, 4, 4)
+            for index in range(len(raw_textures))
+        ]
+        pulled = list()
+
+        def job_stream():
+            for job in jobs:
+                pulled.append(job)
+                yield job
+
+        with TextureBatch(raw_textures, processes=1) as batch:
+            expected = batch.images(jobs)
+        with TextureBatch(raw_textures, processes=2) as batch:
+            stream = batch.iter_images(job_stream(), max_buffered=4)
+            first = next(stream)
+            pulled_before_first = len(pulled)
+            images = (first, *stream)
+            with self.assertRaises(ValueError):
+                batch.iter_images(jobs, max_buffered=0)
+
+        self.assertLessEqual(pulled_before_first, 4)
+        self.assertEqual(images, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import unittest
+
+from dk64_lib.f3dex2.texture_classify import classify_texture
+
+
+def _shade(x: int, y: int) -> float:
+    return (math.sin(x * 0.3 + y * 0.1) + math.cos(x * 0.05 - y * 0.4) + 2) / 4
+
+
+def _rgba16(width: int, height: int) -> bytes:
+    data = bytearray()
+    for y in range(height):
+        for x in range(width):
+            shade = _shade(x, y)
+            red, green, blue = int(shade * 31), int((1 - shade) * 31), int(shade * 15)
+            data += ((red << 11) | (green << 6) | (blue << 1) | 1).to_bytes(2, "big")
+    return bytes(data)
+
+
+def _i8(width: int, height: int) -> bytes:
+    return bytes(int(_shade(x, y) * 255) for y in range(height) for x in range(width))
+
+
+def _ia16(width: int, height: int) -> bytes:
+    return b"".join(
+        bytes((int(_shade(x, y) * 255), 0xFF)) for y in range(height) for x in range(width)
+    )
+
+
+class ClassifyTextureTest(unittest.TestCase):
+    def test_finds_format_and_dimensions(self):
+        for raw_data, expected in (
+            (_rgba16(64, 32), (0, 2, 64, 32)),
+            (_rgba16(24, 48), (0, 2, 24, 48)),
+            (_i8(32, 32), (4, 1, 32, 32)),
+            (_ia16(16, 32), (3, 2, 16, 32)),
+        ):
+            guess = classify_texture(raw_data)
+
+            self.assertEqual((guess.fmt, guess.size, guess.width, guess.height), expected)
+
+    def test_prior_is_kept_unless_clearly_beaten(self):
+        flat = classify_texture(bytes(0xAA0), prior=(32, 44))
+        beaten = classify_texture(_rgba16(64, 16), prior=(32, 32))
+
+        self.assertEqual((flat.fmt, flat.size, flat.width, flat.height), (0, 2, 32, 44))
+        self.assertEqual((beaten.width, beaten.height), (64, 16))
+
+    def test_palettes_and_unusable_entries(self):
+        palette = classify_texture(_rgba16(16, 16))
+
+        self.assertEqual((palette.fmt, palette.size, palette.width, palette.height), (0, 2, 16, 16))
+        self.assertEqual((classify_texture(_rgba16(16, 1)).width), 16)
+        self.assertIsNone(classify_texture(b"\x01\x02\x03"))
+        self.assertIsNone(classify_texture(b""))
+
+
+if __name__ == "__main__":
+    unittest.main()
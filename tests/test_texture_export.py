@@ -1,4 +1,6 @@
 import json
+import random
+import re
 import struct
 import tempfile
 import unittest
@@ -6,9 +8,14 @@ import zlib
 
 from pathlib import Path
 from types import SimpleNamespace
+from unittest import mock
 
+from dk64_lib.data_types.geometry import GeometryData
+from dk64_lib.f3dex2 import texture_export
 from dk64_lib.f3dex2.display_list import DisplayList
 from dk64_lib.f3dex2.texture_export import (
+    DaeDocument,
+    DecodedMesh,
     TexturedDaeExporter,
     TexturedGltfExporter,
     TexturedObjExport,
@@ -21,7 +28,20 @@ from dk64_lib.f3dex2.texture_export import (
     save_textured_gltf_export,
     save_textured_obj_export,
     test_mipmap_export as export_test_mipmap,
+    TextureImageFile,
+    _gltf_mesh,
+    _gltf_quantized_uv_for_vertex,
+    _slice_sparse_paired_rows_rgba,
+    _swap_odd_rows_rgba,
+    _DecodedTextureLevel,
+    _drop_untextured_duplicate_triangles,
+    _MeshGroup,
+    _TextureExportPlan,
+    _TextureKey,
+    _uv_for_vertex,
 )
+from dk64_lib.f3dex2.triangle import Triangle
+from dk64_lib.f3dex2.vertex import Vertex
 
 
 def _words(word0: int, word1: int) -> bytes:
@@ -585,6 +605,80 @@ class TextureExportTest(unittest.TestCase):
             )
             self.assertTrue((Path(tmpdir) / "animated_textures.blender.py").exists())
 
+    def test_dae_edits_are_saved(self):
+        texture_data = [SimpleNamespace(raw_data=_rgba16(255, 0, 0) * 4)]
+        export = TexturedDaeExporter(texture_data).export(
+            [_textured_triangle_display_list(0, 0, 2, 2, 2)]
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_textured_dae_export(export, "streamed.dae", tmpdir)
+            streamed = Path(tmpdir, "streamed.dae").read_text()
+            self.assertIs(export.dae, export.dae)
+            export.dae.geometries[0].name = "edited"
+            save_textured_dae_export(export, "edited.dae", tmpdir)
+            edited = Path(tmpdir, "edited.dae").read_text()
+
+        self.assertNotIn('name="edited"', streamed)
+        self.assertIn('name="edited"', edited)
+
+    def test_dae_document_streams_group_arrays(self):
+        rng = random.Random(41)
+        texture = _TextureKey(0, None, 0, 2, 16, 8, clamp_s=True)
+        vertices = tuple(
+            Vertex(
+                rng.randint(-32768, 32767),
+                rng.randint(-32768, 32767),
+                rng.randint(-32768, 32767),
+                0,
+                rng.randint(0, 0xFFFF),
+                rng.randint(0, 0xFFFF),
+                rng.randint(0, 255),
+                rng.randint(0, 255),
+                rng.randint(0, 255),
+                rng.randint(0, 255),
+            )
+            for _ in range(1500)
+        )
+        triangles = tuple(Triangle(index, index + 1, index + 2) for index in range(1498))
+        document = DaeDocument(
+            (_MeshGroup(vertices, triangles, texture, 0),),
+            (_TextureExportPlan(texture, (_DecodedTextureLevel(0, 1, 1, b"\xff" * 4),)),),
+        )
+
+        dae = document.to_collada()
+
+        (geometry,) = dae.geometries
+
+        def source_values(source_id):
+            return geometry.sourceById[source_id].data.ravel().tolist()
+
+        self.assertEqual(
+            source_values("geometry0-vertices"),
+            [value for vertex in vertices for value in (vertex.x, vertex.y, vertex.z)],
+        )
+        expected_uvs = [
+            value for vertex in vertices for value in _uv_for_vertex(vertex, texture)
+        ]
+        for actual, expected in zip(source_values("geometry0-texcoords"), expected_uvs):
+            self.assertAlmostEqual(actual, expected, delta=abs(expected) * 1e-6 + 1e-12)
+        self.assertEqual(len(source_values("geometry0-colors")), 4 * len(vertices))
+        self.assertEqual(len(geometry.primitives[0]), len(triangles))
+        self.assertEqual(
+            [image.path for image in dae.images],
+            ["textures/tex_0_pal_none_f0_s2_16x8_clamp_s.png"],
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dae_path = Path(tmpdir) / "model.dae"
+            document.write(dae_path)
+            written = dae_path.read_bytes()
+
+        timestamps = re.compile(rb"<(created|modified)>[^<]*<")
+        self.assertEqual(
+            timestamps.sub(b"", written), timestamps.sub(b"", document.to_bytes())
+        )
+
     def test_gltf_exporter_writes_textured_materials_and_alpha(self):
         texture_data = [
             SimpleNamespace(
@@ -693,6 +787,325 @@ class TextureExportTest(unittest.TestCase):
         self.assertEqual(color_values[8:11], (0.0, 0.0, 0.0))
         self.assertAlmostEqual(color_values[11], 128 / 255)
 
+    def test_gltf_exporter_quantizes_vertex_attributes(self):
+        texture_data = [SimpleNamespace(raw_data=_rgba16(255, 255, 255) * 16)]
+        display_list = _textured_triangle_display_list(
+            texture_index=0,
+            fmt=0,
+            size=2,
+            width=4,
+            height=4,
+            cm_t=2,
+            vertex_colors=(
+                (128, 64, 32, 255),
+                (255, 255, 255, 255),
+                (0, 0, 0, 128),
+            ),
+        )
+        exporter = TexturedGltfExporter(texture_data)
+
+        export = exporter.export([display_list], quantize=True)
+        gltf = json.loads(export.gltf_data)
+        primitive = gltf["meshes"][0]["primitives"][0]
+        accessors = {
+            name: gltf["accessors"][index]
+            for name, index in primitive["attributes"].items()
+        }
+
+        self.assertEqual(
+            gltf["extensionsRequired"],
+            ["KHR_mesh_quantization", "KHR_texture_transform"],
+        )
+        self.assertTrue(set(gltf["extensionsRequired"]) <= set(gltf["extensionsUsed"]))
+
+        position = accessors["POSITION"]
+        position_view = gltf["bufferViews"][position["bufferView"]]
+        self.assertEqual(position["componentType"], 5122)
+        self.assertEqual((position["min"], position["max"]), ([0, 0, 0], [1, 1, 0]))
+        self.assertEqual(position_view["byteStride"], 8)
+        self.assertEqual(
+            struct.unpack_from("<hhhxxhhhxx", export.binary_data, position_view["byteOffset"]),
+            (0, 0, 0, 1, 0, 0),
+        )
+
+        color = accessors["COLOR_0"]
+        self.assertEqual((color["componentType"], color["normalized"]), (5121, True))
+        color_view = gltf["bufferViews"][color["bufferView"]]
+        self.assertEqual(
+            export.binary_data[color_view["byteOffset"] : color_view["byteOffset"] + 12],
+            bytes((55, 13, 4, 255, 255, 255, 255, 255, 0, 0, 0, 128)),
+        )
+
+        texcoord = accessors["TEXCOORD_0"]
+        self.assertEqual((texcoord["componentType"], texcoord["normalized"]), (5122, True))
+        texcoord_view = gltf["bufferViews"][texcoord["bufferView"]]
+        raw_uvs = struct.unpack_from("<6h", export.binary_data, texcoord_view["byteOffset"])
+        self.assertEqual(raw_uvs, (0, 0, 128, 0, 0, 128))
+        scale = gltf["materials"][1]["pbrMetallicRoughness"]["baseColorTexture"][
+            "extensions"
+        ]["KHR_texture_transform"]["scale"]
+        unquantized_export = exporter.export([display_list])
+        unquantized = json.loads(unquantized_export.gltf_data)
+        self.assertEqual(
+            tuple(
+                round(raw_uv / 32767 * scale[index % 2], 6)
+                for index, raw_uv in enumerate(raw_uvs)
+            ),
+            _gltf_accessor_floats(
+                unquantized,
+                unquantized_export.binary_data,
+                unquantized["meshes"][0]["primitives"][0]["attributes"]["TEXCOORD_0"],
+            ),
+        )
+        self.assertLess(len(export.binary_data), len(unquantized_export.binary_data))
+
+    def test_quantized_gltf_clamps_raw_texcoords(self):
+        vertex = Vertex(0, 0, 0, 0, 0x7FFF, 0xFFE0, 255, 255, 255, 255)
+        texture = _TextureKey(0, None, 0, 2, 1, 1, clamp_s=True)
+
+        self.assertEqual(_gltf_quantized_uv_for_vertex(vertex, texture), (32, -32))
+
+    def test_glb_exporter_quantized_without_textures(self):
+        display_list = _textured_triangle_display_list(
+            texture_index=0, fmt=0, size=2, width=2, height=2
+        )
+
+        export = TexturedGltfExporter(()).export_glb(
+            [display_list], include_textures=False, quantize=True
+        )
+        gltf, _ = _glb_chunks(export.data)
+
+        self.assertEqual(gltf["extensionsRequired"], ["KHR_mesh_quantization"])
+        self.assertNotIn("TEXCOORD_0", gltf["meshes"][0]["primitives"][0]["attributes"])
+
+    def test_glb_export_spools_binary_chunk(self):
+        display_list = _textured_triangle_display_list(
+            texture_index=0, fmt=0, size=2, width=2, height=2
+        )
+
+        # A tiny spool threshold makes the buffer roll over to a temporary file
+        with mock.patch("dk64_lib.f3dex2.texture_export._GLTF_SPOOL_MEMORY_BYTES", 16):
+            export = TexturedGltfExporter(()).export_glb([display_list])
+        gltf, bin_chunk = _glb_chunks(export.data)
+
+        self.assertEqual(len(bin_chunk), gltf["buffers"][0]["byteLength"])
+        self.assertTrue(all(view["byteOffset"] % 4 == 0 for view in gltf["bufferViews"]))
+        data = export.data
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (glb_path,) = save_textured_glb_export(export, "geometry.glb", tmpdir)
+
+            self.assertEqual(glb_path.read_bytes(), data)
+        self.assertTrue(export.binary.spool.closed)
+
+    def test_drops_untextured_triangles_covered_by_textured_ones(self):
+        def vertex(x: int, y: int, z: int) -> Vertex:
+            return Vertex(x, y, z, 0, 0, 0, 255, 255, 255, 255)
+
+        textured = _MeshGroup(
+            (vertex(0, 0, 0), vertex(10, 0, 0), vertex(0, 0, -10)),
+            (Triangle(0, 1, 2), Triangle(0, 1, 7)),
+            _TextureKey(0, None, 0, 2, 2, 2),
+            0,
+        )
+        untextured = _MeshGroup(
+            (vertex(-5, 3, 0), vertex(0, 0, -10), vertex(0, 0, 0), vertex(10, 0, 0)),
+            (
+                Triangle(3, 2, 1),
+                Triangle(0, 2, 3),
+                Triangle(2, 3, 9),
+                Triangle(2, 3, -1),
+                Triangle(2, 9, 9),
+            ),
+            None,
+            8,
+        )
+        untouched = _MeshGroup((vertex(1, 1, 1),) * 3, (Triangle(0, 1, 2),), None, 16)
+
+        filtered = _drop_untextured_duplicate_triangles(
+            (untextured, textured, _MeshGroup((), (), None, 24), untouched)
+        )
+
+        self.assertEqual(len(filtered), 3)
+        self.assertEqual(
+            filtered[0].triangles, (Triangle(0, 2, 3), Triangle(2, 9, 9))
+        )
+        self.assertIs(filtered[1], textured)
+        self.assertEqual(filtered[2], untouched)
+        self.assertIs(_drop_untextured_duplicate_triangles((untouched,))[0], untouched)
+
+    def test_row_helpers_keep_partial_rows_and_zero_fill(self):
+        pixels = bytes(range(4 * 10))
+
+        swapped = _swap_odd_rows_rgba(pixels, source_width=4, group_pixels=2)
+
+        self.assertEqual(swapped[:16], pixels[:16])
+        self.assertEqual(
+            swapped[16:32], pixels[20:24] + pixels[16:20] + pixels[28:32] + pixels[24:28]
+        )
+        self.assertEqual(swapped[32:], pixels[32:])
+        self.assertEqual(
+            _slice_sparse_paired_rows_rgba(
+                pixels,
+                start_pixel=8,
+                output_width=2,
+                output_height=3,
+                source_group_pixels=4,
+                skipped_pixels=1,
+                swap_second_row_group_pixels=2,
+            ),
+            pixels[32:40] + bytes(8) + bytes(8),
+        )
+
+    def test_texture_plan_analysis(self):
+        cutout = bytes((255, 0, 0, 255, 255, 0, 0, 0, 0, 0, 255, 255, 0, 0, 255, 255))
+        plan = _TextureExportPlan(
+            _TextureKey(0, 1, 2, 0, 2, 2), (_DecodedTextureLevel(None, 2, 2, cutout),)
+        )
+        soft = _TextureExportPlan(
+            _TextureKey(0, None, 0, 2, 2, 1),
+            (_DecodedTextureLevel(None, 2, 1, bytes((9, 9, 9, 128)) * 2),),
+        )
+
+        with mock.patch.object(
+            texture_export, "numpy_unique", wraps=texture_export.numpy_unique
+        ) as unique:
+            self.assertIs(plan.analysis, plan.analysis)
+            self.assertTrue(plan.analysis.has_alpha)
+            unique.assert_not_called()
+            self.assertEqual(plan.analysis.unique_colors, 3)
+            self.assertEqual(plan.analysis.unique_colors, 3)
+            unique.assert_called_once()
+        self.assertTrue(plan.analysis.binary_alpha)
+        self.assertEqual(plan.analysis.unique_colors, 3)
+        self.assertEqual(plan.analysis.palette_size, 16)
+        self.assertTrue(soft.analysis.has_alpha)
+        self.assertFalse(soft.analysis.binary_alpha)
+        self.assertEqual(soft.analysis.unique_colors, 1)
+        self.assertIsNone(soft.analysis.palette_size)
+
+    def test_gltf_alpha_mask_is_opt_in(self):
+        cutout = bytes((255, 0, 0, 255, 255, 0, 0, 0)) * 2
+        plans = (
+            _TextureExportPlan(
+                _TextureKey(0, None, 0, 2, 2, 2), (_DecodedTextureLevel(None, 2, 2, cutout),)
+            ),
+            _TextureExportPlan(
+                _TextureKey(1, None, 0, 2, 2, 2),
+                (_DecodedTextureLevel(None, 2, 2, bytes((0, 0, 0, 100)) * 4),),
+            ),
+        )
+        groups = tuple(
+            _MeshGroup(
+                tuple(Vertex(x, 0, x, 0, 0, 0, 255, 255, 255, 255) for x in range(3)),
+                (Triangle(0, 1, 2),),
+                plan.texture,
+                index * 8,
+            )
+            for index, plan in enumerate(plans)
+        )
+
+        blended, _ = _gltf_mesh(groups, plans, None, "", ())
+        masked, _ = _gltf_mesh(groups, plans, None, "", (), alpha_mask=True)
+
+        self.assertEqual(
+            [material.get("alphaMode") for material in blended["materials"]],
+            [None, "BLEND", "BLEND"],
+        )
+        self.assertEqual(
+            [material.get("alphaMode") for material in masked["materials"]],
+            [None, "MASK", "BLEND"],
+        )
+        self.assertEqual(masked["materials"][1]["alphaCutoff"], 0.5)
+
+    def test_geometry_passes_alpha_mask_to_glb(self):
+        texture = _TextureKey(0, None, 0, 2, 2, 2)
+        rom = SimpleNamespace(
+            get_geometry_texture_data=lambda: [
+                SimpleNamespace(raw_data=(_rgba16(255, 0, 0) + _rgba16(0, 0, 0, 0)) * 2)
+            ]
+        )
+        geometry = GeometryData(bytes(0x80), 0, 0x80, False, rom)
+        geometry.__dict__["decoded_mesh"] = DecodedMesh.from_groups(
+            (
+                _MeshGroup(
+                    tuple(Vertex(x, 0, x, 0, 0, 0, 255, 255, 255, 255) for x in range(3)),
+                    (Triangle(0, 1, 2),),
+                    texture,
+                    0,
+                ),
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (blended_path,) = geometry.save_to_glb("blended.glb", tmpdir)
+            (masked_path,) = geometry.save_to_glb("masked.glb", tmpdir, alpha_mask=True)
+            blended, _ = _glb_chunks(blended_path.read_bytes())
+            masked, _ = _glb_chunks(masked_path.read_bytes())
+
+        self.assertEqual(blended["materials"][-1]["alphaMode"], "BLEND")
+        self.assertEqual(masked["materials"][-1]["alphaMode"], "MASK")
+
+    def test_gltf_mesh_shares_identical_texture_resources(self):
+        rgba = bytes((255, 0, 0, 255)) * 4
+        textures = (
+            _TextureKey(0, 0, 2, 0, 2, 2),
+            _TextureKey(0, 1, 2, 0, 2, 2),
+            _TextureKey(0, 0, 2, 0, 2, 2, clamp_s=True),
+        )
+        plans = tuple(
+            _TextureExportPlan(texture, (_DecodedTextureLevel(None, 2, 2, rgba),))
+            for texture in textures
+        )
+        vertices = tuple(
+            Vertex(x, 0, z, 0, 0, 0, 255, 255, 255, 255) for x, z in ((0, 0), (1, 0), (0, 1))
+        )
+        groups = tuple(
+            _MeshGroup(vertices, (Triangle(0, 1, 2),), texture, index * 8)
+            for index, texture in enumerate(textures)
+        )
+        embedded_images = tuple(
+            TextureImageFile(texture.image_filename, rgba_to_png(2, 2, rgba))
+            for texture in textures
+        )
+
+        gltf, binary = _gltf_mesh(groups, plans, None, "", embedded_images)
+
+        self.assertEqual(len(gltf["images"]), 1)
+        self.assertEqual(len(gltf["samplers"]), 2)
+        self.assertEqual(len(gltf["textures"]), 2)
+        materials = [mesh["primitives"][0]["material"] for mesh in gltf["meshes"]]
+        self.assertEqual(materials[0], materials[1])
+        self.assertNotEqual(materials[0], materials[2])
+        self.assertEqual(len(gltf["materials"]), 3)
+        self.assertEqual(len(binary.to_bytes()), gltf["buffers"][0]["byteLength"])
+
+    def test_gltf_export_writes_identical_images_once(self):
+        texture_data = [SimpleNamespace(raw_data=_rgba16(255, 0, 0) * 4)]
+        textures = (
+            _TextureKey(0, None, 0, 2, 2, 2),
+            _TextureKey(0, None, 0, 2, 2, 2, clamp_s=True),
+        )
+        vertices = tuple(
+            Vertex(x, 0, z, 0, 0, 0, 255, 255, 255, 255) for x, z in ((0, 0), (1, 0), (0, 1))
+        )
+        mesh = DecodedMesh.from_groups(
+            _MeshGroup(vertices, (Triangle(0, 1, 2),), texture, index * 8)
+            for index, texture in enumerate(textures)
+        )
+
+        export = TexturedGltfExporter(texture_data).export(mesh)
+        gltf = json.loads(export.gltf_data)
+
+        self.assertEqual(
+            [image.filename for image in export.images],
+            [f"textures/{textures[0].image_filename}"],
+        )
+        self.assertEqual(
+            gltf["images"],
+            [{"name": textures[0].material_name, "uri": export.images[0].filename}],
+        )
+        self.assertEqual(len(gltf["textures"]), 2)
+
     def test_glb_exporter_embeds_texture_and_alpha_material(self):
         texture_data = [
             SimpleNamespace(